@@ -0,0 +1,5 @@
+"""
+Benchmarks for the server's hot paths. Run from the server directory, with a config.yaml in place, for example:
+
+    python -m benchmarks.fuzzy
+"""
@@ -0,0 +1,74 @@
+"""
+Benchmarks typo tolerant searches over a large catalog with the TrigramIndex.
+
+    python -m benchmarks.fuzzy [--titles 500000] [--queries 1000]
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from random import Random
+from sys import exit
+from time import perf_counter
+from typing import Dict, List
+
+# Local Imports
+from benchmarks.timing import makeGames, measure, report
+from internals.catalog.fuzzy import TrigramIndex
+from tests.fixtures import MemoryStore, buildIndex
+
+# Constants
+TARGET_MS: float = 10.0
+
+
+def misspell(
+        title: str,
+        random: Random
+) -> str:
+    """
+    Swaps two neighbouring letters of a title, as a fast typist would.
+
+    Args:
+        title (str): The title.
+        random (Random): The random source.
+
+    Returns:
+        str: The misspelt title.
+    """
+    if len(title) < 4:
+        return title
+
+    position: int = random.randrange(1, len(title) - 2)
+    return f"{title[:position]}{title[position + 1]}{title[position]}{title[position + 2:]}"
+
+
+def run() -> bool:
+    """
+    Builds the index over the titles and times misspelt searches for them.
+
+    Returns:
+        bool: Whether the searches met the target.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=500_000, help="The number of titles to index.")
+    parser.add_argument("--queries", type=int, default=1000, help="The number of searches to time.")
+    arguments: Namespace = parser.parse_args()
+
+    games: List[Dict] = makeGames(arguments.titles)
+    store: MemoryStore = MemoryStore()
+    store.addGames(games)
+
+    start: float = perf_counter()
+    index: TrigramIndex = buildIndex(TrigramIndex, store)
+    print(f"Built the index over {len(games)} titles in {perf_counter() - start:.2f}s")
+
+    random: Random = Random(7)
+    queries: List[str] = [misspell(random.choice(games)["name"], random) for _ in range(arguments.queries)]
+
+    # Warm up numpy and the caches before timing
+    measure(index.search, queries[:20])
+
+    return report("TrigramIndex.search", measure(index.search, queries), TARGET_MS)
+
+
+if __name__ == "__main__":
+    exit(0 if run() else 1)
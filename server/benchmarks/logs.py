@@ -0,0 +1,93 @@
+"""
+Benchmarks log calls through the SuppressedLoggerAdapter, checking that a call below the logger's level does no
+formatting work.
+
+    python -m benchmarks.logs [--batches 2000] [--calls 1000]
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from io import StringIO
+from logging import DEBUG, Formatter, INFO, StreamHandler, WARNING, getLogger
+from sys import exit
+from typing import Callable, Dict
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from benchmarks.timing import measure, report
+from internals.clogging import Deferred, SuppressedLoggerAdapter
+
+# Constants
+TARGET_MS: float = 5.0  # Per batch, so a filtered call takes under 5 microseconds, a tenth of emitting one
+
+
+class Expensive:
+    """
+    A log argument that counts how many times it was formatted.
+    """
+    __slots__ = ("formatted",)
+
+    def __init__(self) -> None:
+        """
+        Initializes the Expensive argument.
+        """
+        self.formatted: int = 0
+
+    def __str__(self) -> str:
+        self.formatted += 1
+        return ", ".join(str(number) for number in range(100))
+
+
+def run() -> bool:
+    """
+    Times batches of debug calls on a logger set to warning, with %-style arguments, callables and Deferred values,
+    and an enabled call for comparison. Fails if a filtered call formats its arguments or misses the target.
+
+    Returns:
+        bool: Whether the filtered calls met the target without formatting anything.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, default=2000, help="The number of batches to time.")
+    parser.add_argument("--calls", type=int, default=1000, help="The number of log calls per batch.")
+    arguments: Namespace = parser.parse_args()
+
+    handler: StreamHandler = StreamHandler(StringIO())
+    handler.setFormatter(Formatter("[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s"))
+    logger = getLogger("benchmarks.logs")
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(WARNING)
+    adapter: SuppressedLoggerAdapter = SuppressedLoggerAdapter(logger)
+
+    expensive: Expensive = Expensive()
+    calls: range = range(arguments.calls)
+    cases: Dict[str, Callable[[int], None]] = {
+        "filtered %-style": lambda _: [adapter.debug("Request %s with %s", 1, expensive) for _ in calls],
+        "filtered callable": lambda _: [adapter.debug(lambda: f"Request with {expensive}") for _ in calls],
+        "filtered Deferred": lambda _: [adapter.debug("Request with %s", Deferred(expensive.__str__)) for _ in calls]
+    }
+
+    passed: bool = True
+
+    for name, case in cases.items():
+        measure(case, range(10))  # Warm up before timing
+        passed = report(f"{name} ({arguments.calls} calls)", measure(case, range(arguments.batches)), TARGET_MS) and passed
+
+    if expensive.formatted:
+        print(f"Filtered calls formatted their arguments {expensive.formatted} times")
+        passed = False
+
+    # For comparison, the same call when it is emitted
+    logger.setLevel(DEBUG)
+    enabled: Callable[[int], None] = lambda _: [adapter.log(INFO, "Request %s with %s", 1, expensive) for _ in calls]
+    measure(enabled, range(10))
+    timings: np.ndarray = measure(enabled, range(max(arguments.batches // 20, 1)))
+    print(f"emitted %-style ({arguments.calls} calls): p50 {np.median(timings):.3f} ms, for comparison")
+
+    return passed
+
+
+if __name__ == "__main__":
+    exit(0 if run() else 1)
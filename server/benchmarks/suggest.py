@@ -0,0 +1,56 @@
+"""
+Benchmarks search-as-you-type suggestions over a large catalog with the PrefixIndex.
+
+    python -m benchmarks.suggest [--titles 500000] [--queries 10000]
+"""
+
+# Standard Library Imports
+from argparse import ArgumentParser, Namespace
+from random import Random
+from sys import exit
+from time import perf_counter
+from typing import Dict, List
+
+# Local Imports
+from benchmarks.timing import makeGames, measure, report
+from internals.catalog.suggest import PrefixIndex
+from tests.fixtures import MemoryStore, buildIndex
+
+# Constants
+TARGET_MS: float = 1.0
+
+
+def run() -> bool:
+    """
+    Builds the index over the titles and times lookups of prefixes of them, one to twelve characters long, as they
+    are typed.
+
+    Returns:
+        bool: Whether the lookups met the target.
+    """
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=500_000, help="The number of titles to index.")
+    parser.add_argument("--queries", type=int, default=10_000, help="The number of lookups to time.")
+    arguments: Namespace = parser.parse_args()
+
+    games: List[Dict] = makeGames(arguments.titles)
+    store: MemoryStore = MemoryStore()
+    store.addGames(games)
+
+    start: float = perf_counter()
+    index: PrefixIndex = buildIndex(PrefixIndex, store)
+    print(f"Built the index over {len(games)} titles in {perf_counter() - start:.2f}s")
+
+    random: Random = Random(7)
+    queries: List[str] = [
+        random.choice(games)["name"][:random.randint(1, 12)] for _ in range(arguments.queries)
+    ]
+
+    # Warm up before timing
+    measure(index.suggest, queries[:100])
+
+    return report("PrefixIndex.suggest", measure(index.suggest, queries), TARGET_MS)
+
+
+if __name__ == "__main__":
+    exit(0 if run() else 1)
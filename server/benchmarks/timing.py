@@ -0,0 +1,106 @@
+"""
+Contains helpers shared by the benchmarks.
+"""
+
+# Standard Library Imports
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List
+
+# Third Party Imports
+import numpy as np
+
+# Constants
+WORDS: tuple[str, ...] = (
+    "the", "of", "dark", "legend", "space", "witcher", "portal", "souls", "hunt", "wild", "city", "night", "dragon",
+    "knight", "galaxy", "war", "craft", "quest", "shadow", "empire", "kingdom", "racing", "simulator", "tactics",
+    "chronicles", "origins", "rising", "fall", "edge", "storm", "iron", "blood", "star", "ocean", "forest", "zombie",
+    "puzzle", "tower", "dungeon", "pixel", "neon", "ghost", "heart", "sky", "island", "station", "frontier", "odyssey"
+)
+
+
+def makeGames(
+        count: int,
+        seed: int = 42
+) -> List[Dict]:
+    """
+    Makes games with random titles built from common title words, so the indexes see realistic overlap.
+
+    Args:
+        count (int): The number of games.
+        seed (int): The random seed.
+
+    Returns:
+        List[Dict]: The games, with an id, slug, name and popularity.
+    """
+    random: Random = Random(seed)
+    games: List[Dict] = []
+
+    for id in range(1, count + 1):
+        name: str = " ".join(random.choice(WORDS) for _ in range(random.randint(1, 4))).title()
+
+        # Most titles are made unique by a number, as sequels and remasters are
+        if random.random() < 0.8:
+            name = f"{name} {random.randint(1, 999)}"
+
+        games.append(
+            {
+                "id": id,
+                "slug": f"{name.lower().replace(" ", "-")}-{id}",
+                "name": name,
+                "added": int(random.paretovariate(1.2)),
+                "ratings_count": random.randint(0, 50)
+            }
+        )
+
+    return games
+
+
+def measure(
+        function: Callable[[str], object],
+        queries: Iterable[str]
+) -> np.ndarray:
+    """
+    Times a function once per query.
+
+    Args:
+        function (Callable[[str], object]): The function to time.
+        queries (Iterable[str]): The queries.
+
+    Returns:
+        np.ndarray: The time each call took, in milliseconds.
+    """
+    timings: List[float] = []
+
+    for query in queries:
+        start: float = perf_counter()
+        function(query)
+        timings.append((perf_counter() - start) * 1000)
+
+    return np.asarray(timings)
+
+
+def report(
+        name: str,
+        timings: np.ndarray,
+        targetMs: float
+) -> bool:
+    """
+    Prints the percentiles of a benchmark and whether it met its target.
+
+    Args:
+        name (str): The name of what was measured.
+        timings (np.ndarray): The time of each call, in milliseconds.
+        targetMs (float): The most the 99th percentile may take.
+
+    Returns:
+        bool: Whether the 99th percentile was under the target.
+    """
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    passed: bool = bool(p99 < targetMs)
+
+    print(
+        f"{name}: {timings.size} calls, p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms, max {timings.max():.3f} ms "
+        f"(target p99 < {targetMs} ms: {"met" if passed else "MISSED"})"
+    )
+    return passed
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration. Loaded automatically when gunicorn is started from the server directory.
+"""
+
+# Third Party Imports
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+from prometheus_client import multiprocess
+
+
+def child_exit(
+        server: Arbiter,
+        worker: Worker
+) -> None:
+    """
+    Runs in the master process when a worker exits. Removes the worker's live gauges from the shared metrics.
+
+    Args:
+        server (Arbiter): The gunicorn arbiter.
+        worker (Worker): The worker that exited.
+
+    Returns:
+        None
+    """
+    multiprocess.mark_process_dead(worker.pid)
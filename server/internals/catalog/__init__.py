@@ -0,0 +1,11 @@
+"""
+Contains the local mirror of the RAWG catalog and its background sync.
+"""
+
+from .store import CatalogStore
+from .sync import CatalogSync
+
+__all__ = [
+    "CatalogStore",
+    "CatalogSync"
+]
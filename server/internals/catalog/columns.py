@@ -0,0 +1,284 @@
+"""
+Contains the ColumnIndex class, a memory-mapped columnar copy of the catalog mirror's numeric fields with presorted
+orderings.
+"""
+
+# Standard Library Imports
+from datetime import date
+from json import loads
+from os import getpid
+from pathlib import Path
+from shutil import rmtree
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .index import CatalogIndex, findRows
+from ..clogging.registry import ensureDirectory
+
+if TYPE_CHECKING:
+    from .store import CatalogStore
+
+# Constants
+COLUMNS: Dict[str, Tuple[str, str]] = {  # The SQL expression (or path in the payload) and dtype of each column
+    "released": ("julianday(released) - 1721424.5", "float32"),  # Days, as date.toordinal()
+    "updated": ("CAST(strftime('%s', updated) AS INTEGER)", "float64"),  # Unix time
+    "added": ("added", "float32"),
+    "rating": ("rating", "float32"),
+    "rating_top": ("$.rating_top", "float32"),
+    "ratings_count": ("ratings_count", "float32"),
+    "metacritic": ("metacritic", "float32"),
+    "playtime": ("$.playtime", "float32"),
+    "platforms_count": ("platforms_count", "float32"),
+    "reviews_count": ("$.reviews_count", "float32"),
+    "reviews_text_count": ("$.reviews_text_count", "float32"),
+    "suggestions_count": ("$.suggestions_count", "float32"),
+    # Only in the details
+    "screenshots_count": ("$.screenshots_count", "float32"),
+    "movies_count": ("$.movies_count", "float32"),
+    "achievements_count": ("$.achievements_count", "float32"),
+    "additions_count": ("$.additions_count", "float32"),
+    "game_series_count": ("$.game_series_count", "float32"),
+    "parents_count": ("$.parents_count", "float32"),
+    "creators_count": ("$.creators_count", "float32")
+}
+SORTED_COLUMNS: tuple[str, ...] = ("released", "added", "updated", "rating", "metacritic")  # Orderings besides name
+KEPT_GENERATIONS: int = 2  # Older generations are deleted, workers still mapping them keep their copy until they let go
+FORMAT: int = 2  # Changed whenever the files of a generation change, so generations written before are not used
+UNIX_EPOCH_DAY: int = date(1970, 1, 1).toordinal()
+FETCH_SIZE: int = 100_000  # Rows read from the mirror at a time while building
+
+
+def dayRange(
+        field: str,
+        start: str,
+        end: str
+) -> Tuple[float, float]:
+    """
+    Converts an inclusive range of YYYY-MM-DD dates into the half-open range of a date column's values it covers.
+
+    Args:
+        field (str): The column, released or updated.
+        start (str): The first date.
+        end (str): The last date.
+
+    Returns:
+        Tuple[float, float]: The lowest value in the range, and the lowest value after it.
+
+    Raises:
+        ValueError: If a date is not a YYYY-MM-DD date.
+    """
+    first: int = date.fromisoformat(start).toordinal()
+    after: int = date.fromisoformat(end).toordinal() + 1
+
+    if field == "updated":
+        return (first - UNIX_EPOCH_DAY) * 86400, (after - UNIX_EPOCH_DAY) * 86400
+
+    return first, after
+
+
+class ColumnState:
+    """
+    The memory-mapped arrays of a generation of the ColumnIndex.
+    """
+    __slots__ = ("generation", "games", "columns", "orders", "sortedValues")
+
+    def __init__(
+            self,
+            directory: Path
+    ) -> None:
+        """
+        Maps a generation's arrays.
+
+        Args:
+            directory (Path): The generation's directory.
+        """
+        self.generation: str = directory.name
+        self.games: np.ndarray = np.load(directory / "id.npy", mmap_mode="r")
+        self.columns: Dict[str, np.ndarray] = {
+            column: np.load(directory / f"{column}.npy", mmap_mode="r") for column in COLUMNS
+        }
+        self.orders: Dict[str, np.ndarray] = {}
+        self.sortedValues: Dict[str, np.ndarray] = {}
+
+        for field in ("name", *SORTED_COLUMNS):
+            self.orders[field] = np.load(directory / f"order_{field}.npy", mmap_mode="r")
+            self.orders[f"-{field}"] = np.load(directory / f"order_{field}_desc.npy", mmap_mode="r")
+
+        for column in SORTED_COLUMNS:
+            self.sortedValues[column] = np.load(directory / f"sorted_{column}.npy", mmap_mode="r")
+
+    def rows(
+            self,
+            ids: np.ndarray
+    ) -> np.ndarray:
+        """
+        Finds the rows of games.
+
+        Args:
+            ids (np.ndarray): The ids of the games.
+
+        Returns:
+            np.ndarray: The row of each game, or -1 for games synced since the generation was built.
+        """
+        return findRows(self.games, ids)
+
+    def rangeRows(
+            self,
+            column: str,
+            low: float,
+            below: float
+    ) -> np.ndarray:
+        """
+        Finds the games with a value in a range, using a binary search over the column's sorted values.
+
+        Args:
+            column (str): The column, one of SORTED_COLUMNS.
+            low (float): The lowest value included.
+            below (float): The lowest value above the range.
+
+        Returns:
+            np.ndarray: The rows of the games.
+        """
+        values: np.ndarray = self.sortedValues[column]
+        return self.orders[column][np.searchsorted(values, low, "left"):np.searchsorted(values, below, "left")]
+
+
+class ColumnIndex(CatalogIndex):
+    """
+    The mirror's numeric fields as one memory-mapped array per column, with presorted permutations of the games for
+    every ordering the mirror supports, so ordered, filtered and paginated lists are a mask and a slice rather than a
+    sort per query.
+
+    Each generation of the index is written to its own directory next to the database by the first worker to build it,
+    and the other workers map the same files, so they share one copy through the page cache.
+    """
+    __slots__ = ("directory",)
+
+    def __init__(
+            self,
+            store: "CatalogStore"
+    ) -> None:
+        """
+        Initializes the ColumnIndex.
+
+        Args:
+            store (CatalogStore): The mirror to build the index from.
+        """
+        super().__init__(store)
+        self.directory: Path = Path(f"{store.path}.columns")
+
+    def build(
+            self,
+            previous: ColumnState | None
+    ) -> ColumnState:
+        """
+        Maps the generation for the current version of the mirror, writing it first if no worker has yet.
+
+        Args:
+            previous (ColumnState | None): Unused, every generation is built from scratch.
+
+        Returns:
+            ColumnState: The mapped generation.
+        """
+        generation: Path = self.directory / f"{FORMAT}-{self.store.getState("version") or "initial"}"
+
+        if not generation.exists():
+            self._write(generation)
+
+        return ColumnState(generation)
+
+    def _write(
+            self,
+            generation: Path
+    ) -> None:
+        """
+        Writes a generation. It is written to a temporary directory and renamed into place, so other workers never map
+        a partly written one.
+
+        Args:
+            generation (Path): The generation's directory.
+
+        Returns:
+            None
+        """
+        ensureDirectory(self.directory)
+        temporary: Path = self.directory / f".{generation.name}.{getpid()}"
+        temporary.mkdir(exist_ok=True)
+
+        # Fields only in the payload are extracted together, so each payload is parsed once
+        tableColumns: List[str] = [column for column, (expression, _) in COLUMNS.items() if not expression.startswith("$")]
+        payloadColumns: List[str] = [column for column in COLUMNS if column not in tableColumns]
+        cursor = self.store.connection.execute(
+            f"""
+            SELECT
+                id,
+                name,
+                {", ".join(COLUMNS[column][0] for column in tableColumns)},
+                json_extract(coalesce(details, payload), {", ".join(f"'{COLUMNS[column][0]}'" for column in payloadColumns)})
+            FROM games
+            ORDER BY id
+            """
+        )
+        cursor.row_factory = None
+        idChunks: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        names: List[str | None] = []
+        valueChunks: Dict[str, List[np.ndarray]] = {column: [np.empty(0, dtype=dtype)] for column, (_, dtype) in COLUMNS.items()}
+
+        while chunk := cursor.fetchmany(FETCH_SIZE):
+            values: List[tuple] = list(zip(*chunk))
+            idChunks.append(np.array(values[0], dtype=np.int64))
+            names.extend(values[1])
+            values = [*values[2:-1], *zip(*map(loads, values[-1]))]
+
+            for column, columnValues in zip([*tableColumns, *payloadColumns], values):
+                valueChunks[column].append(np.array(columnValues, dtype=np.float64).astype(COLUMNS[column][1]))  # None becomes NaN
+
+        np.save(temporary / "id.npy", np.concatenate(idChunks))
+
+        for column, chunks in valueChunks.items():
+            np.save(temporary / f"{column}.npy", np.concatenate(chunks))
+
+        # Rows are in id order and every sort is stable, so ties are broken by id like the SQL ordering does
+        ascending: List[int] = sorted(range(len(names)), key=lambda row: (names[row] is None, names[row] or ""))
+        descending: List[int] = sorted(range(len(names)), key=lambda row: names[row] or "", reverse=True)
+        descending = [row for row in descending if names[row] is not None] + [row for row in descending if names[row] is None]
+
+        np.save(temporary / "order_name.npy", np.array(ascending, dtype=np.int32))
+        np.save(temporary / "order_name_desc.npy", np.array(descending, dtype=np.int32))
+
+        for column in SORTED_COLUMNS:
+            values: np.ndarray = np.load(temporary / f"{column}.npy")
+            missing: np.ndarray = np.isnan(values)
+            keys: np.ndarray = np.where(missing, 0, values)
+
+            # Games missing the field come last in both directions
+            order: np.ndarray = np.lexsort((keys, missing)).astype(np.int32)
+            np.save(temporary / f"order_{column}.npy", order)
+            np.save(temporary / f"order_{column}_desc.npy", np.lexsort((-keys, missing)).astype(np.int32))
+            np.save(temporary / f"sorted_{column}.npy", values[order])
+
+        try:
+            temporary.rename(generation)
+        except OSError:
+            rmtree(temporary, ignore_errors=True)  # Another worker got there first
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """
+        Deletes all but the newest generations.
+
+        Returns:
+            None
+        """
+        generations: List[Path] = sorted(
+            (path for path in self.directory.iterdir() if not path.name.startswith(".")),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True
+        )
+
+        for generation in generations[KEPT_GENERATIONS:]:
+            rmtree(generation, ignore_errors=True)
@@ -0,0 +1,315 @@
+"""
+Contains the FacetIndex class, used for filtering and counting games by genre, platform, store, tag, developer and
+publisher.
+"""
+
+# Standard Library Imports
+from typing import Dict, List, Tuple
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .index import CatalogIndex, findRows, runPositions
+
+# Constants
+DENSE_FRACTION: float = 1 / 32  # Values on more games than this get a bitmap, smaller ones keep their sorted postings
+COUNTED_VALUES: int = 20  # Values returned per facet, most common first
+SMALL_FRACTION: float = 1 / 8  # Sets of fewer games than this are counted from their own values rather than a mask
+FETCH_SIZE: int = 100_000  # Rows read from the mirror at a time while building
+
+
+class FacetColumn:
+    """
+    The bitmaps and postings of a single facet.
+    """
+    __slots__ = ("values", "slugs", "labels", "offsets", "postings", "dense", "rowOffsets", "rowValues")
+
+    def __init__(
+            self,
+            values: np.ndarray,
+            slugs: Dict[str, int],
+            labels: List[Tuple[str | None, str | None]],
+            offsets: np.ndarray,
+            postings: np.ndarray,
+            dense: Dict[int, np.ndarray],
+            rowOffsets: np.ndarray,
+            rowValues: np.ndarray
+    ) -> None:
+        """
+        Initializes the FacetColumn.
+
+        Args:
+            values (np.ndarray): The sorted ids of the facet's values.
+            slugs (Dict[str, int]): The index of each value, by slug.
+            labels (List[Tuple[str | None, str | None]]): The slug and name of each value.
+            offsets (np.ndarray): Where each value's games start in postings (one more entry than values).
+            postings (np.ndarray): The rows of the games with each value, grouped by value.
+            dense (Dict[int, np.ndarray]): Packed bitmaps of the rows with each common value, by value index.
+            rowOffsets (np.ndarray): Where each row's values start in rowValues (one more entry than rows).
+            rowValues (np.ndarray): The value indices of each row, grouped by row. Used for counting.
+        """
+        self.values: np.ndarray = values
+        self.slugs: Dict[str, int] = slugs
+        self.labels: List[Tuple[str | None, str | None]] = labels
+        self.offsets: np.ndarray = offsets
+        self.postings: np.ndarray = postings
+        self.dense: Dict[int, np.ndarray] = dense
+        self.rowOffsets: np.ndarray = rowOffsets
+        self.rowValues: np.ndarray = rowValues
+
+    def lookup(
+            self,
+            value: str
+    ) -> int | None:
+        """
+        Finds the index of a value from its id or slug.
+
+        Args:
+            value (str): The id or slug.
+
+        Returns:
+            int | None: The index, or None if no game has the value.
+        """
+        if not value.isdigit():
+            return self.slugs.get(value)
+
+        index: int = int(np.searchsorted(self.values, int(value)))
+        return index if index < self.values.size and self.values[index] == int(value) else None
+
+
+class FacetState:
+    """
+    The columns making up a built FacetIndex.
+    """
+    __slots__ = ("games", "columns")
+
+    def __init__(
+            self,
+            games: np.ndarray,
+            columns: Dict[str, FacetColumn]
+    ) -> None:
+        """
+        Initializes the FacetState.
+
+        Args:
+            games (np.ndarray): The sorted ids of every game. A game's row is its position in this array.
+            columns (Dict[str, FacetColumn]): The columns, by facet.
+        """
+        self.games: np.ndarray = games
+        self.columns: Dict[str, FacetColumn] = columns
+
+    def rows(
+            self,
+            ids: np.ndarray
+    ) -> np.ndarray:
+        """
+        Finds the rows of games.
+
+        Args:
+            ids (np.ndarray): The ids of the games.
+
+        Returns:
+            np.ndarray: The row of each game, or -1 for games synced since the index was built.
+        """
+        return findRows(self.games, ids)
+
+
+class FacetIndex(CatalogIndex):
+    """
+    Bitmaps of the games with each facet value, so any combination of facets can be resolved with vectorized set
+    operations.
+
+    Common values (such as the PC platform) are stored as packed bitmaps and rare ones as sorted lists of rows, which
+    keeps thousands of tags small in memory. Every facet also keeps the values of each game, so the values within a set
+    of games are counted in one vectorized pass.
+    """
+    __slots__ = ()
+
+    def build(
+            self,
+            previous: FacetState | None
+    ) -> FacetState:
+        """
+        Builds the index from the mirror.
+
+        Args:
+            previous (FacetState | None): Unused, the index is always rebuilt from scratch.
+
+        Returns:
+            FacetState: The built index.
+        """
+        connection = self.store.connection
+        games: np.ndarray = self._readColumns("SELECT id FROM games ORDER BY id", 1)[0]
+        facets: List[str] = [row["facet"] for row in connection.execute("SELECT DISTINCT facet FROM facet_values")]
+        columns: Dict[str, FacetColumn] = {}
+
+        for facet in facets:
+            # Grouped by value, then ordered by game, so postings are already sorted. The order is the primary key's, so
+            # it costs nothing, but SQLite only guarantees it when asked for
+            valueIds, gameIds = self._readColumns(
+                "SELECT value, game_id FROM game_facets WHERE facet = ? ORDER BY value, game_id",
+                2,
+                facet
+            )
+
+            # Skip games synced after the games were read
+            rows: np.ndarray = findRows(games, gameIds)
+            valueIds, rows = valueIds[rows >= 0], rows[rows >= 0].astype(np.int32)
+            values, starts, valueIndices = np.unique(valueIds, return_index=True, return_inverse=True)
+            offsets: np.ndarray = np.append(starts, rows.size).astype(np.int64)
+
+            labels: List[Tuple[str | None, str | None]] = [(None, None)] * values.size
+            slugs: Dict[str, int] = {}
+
+            for row in connection.execute("SELECT id, slug, name FROM facet_values WHERE facet = ?", (facet,)):
+                index: int = int(np.searchsorted(values, row["id"]))
+
+                if index < values.size and values[index] == row["id"]:
+                    labels[index] = (row["slug"], row["name"])
+                    slugs[row["slug"]] = index
+
+            dense: Dict[int, np.ndarray] = {}
+
+            for index in np.flatnonzero(np.diff(offsets) > DENSE_FRACTION * games.size).tolist():
+                bits: np.ndarray = np.zeros(games.size, dtype=bool)
+                bits[rows[offsets[index]:offsets[index + 1]]] = True
+                dense[index] = np.packbits(bits)
+
+            order: np.ndarray = np.argsort(rows, kind="stable")
+
+            columns[facet] = FacetColumn(
+                values=values,
+                slugs=slugs,
+                labels=labels,
+                offsets=offsets,
+                postings=rows,
+                dense=dense,
+                rowOffsets=np.append(0, np.cumsum(np.bincount(rows, minlength=games.size))).astype(np.int64),
+                rowValues=valueIndices[order].astype(np.int32)
+            )
+
+        return FacetState(games=games, columns=columns)
+
+    def _readColumns(
+            self,
+            sql: str,
+            width: int,
+            *arguments: str
+    ) -> List[np.ndarray]:
+        """
+        Reads the integer columns of a query into arrays, a chunk at a time so millions of rows never sit in lists.
+
+        Args:
+            sql (str): The query.
+            width (int): How many columns it returns.
+            *arguments (str): The query's arguments.
+
+        Returns:
+            List[np.ndarray]: Each column.
+        """
+        cursor = self.store.connection.execute(sql, arguments)
+        cursor.row_factory = None
+        chunks: List[np.ndarray] = [np.empty((0, width), dtype=np.int64)]
+
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            chunks.append(np.array(rows, dtype=np.int64).reshape(-1, width))
+
+        return list(np.concatenate(chunks).T)
+
+    def filter(
+            self,
+            filters: Dict[str, List[str]]
+    ) -> Tuple[FacetState, np.ndarray] | None:
+        """
+        Finds the games matching every facet filter, with any of the values of a facet matching.
+
+        Args:
+            filters (Dict[str, List[str]]): The ids or slugs wanted, by facet.
+
+        Returns:
+            Tuple[FacetState, np.ndarray] | None: The state used and a mask of its matching rows, or None if the index
+                is not built yet.
+        """
+        state: FacetState | None = self.getState()
+
+        if state is None:
+            return None
+
+        mask: np.ndarray = np.ones(state.games.size, dtype=bool)
+
+        for facet, wanted in filters.items():
+            column: FacetColumn | None = state.columns.get(facet)
+            indices: List[int] = [] if column is None else [
+                index for index in map(column.lookup, wanted) if index is not None
+            ]
+            facetMask: np.ndarray = np.zeros(state.games.size, dtype=bool)
+
+            # Combine the bitmaps while they are still packed, then add the rows of the rarer values
+            packed: List[np.ndarray] = [column.dense[index] for index in indices if index in column.dense]
+
+            if packed:
+                facetMask = np.unpackbits(np.bitwise_or.reduce(packed), count=state.games.size).view(bool)
+
+            for index in indices:
+                if index not in column.dense:
+                    facetMask[column.postings[column.offsets[index]:column.offsets[index + 1]]] = True
+
+            mask &= facetMask
+
+        return state, mask
+
+    @staticmethod
+    def count(
+            state: FacetState,
+            rows: np.ndarray,
+            limit: int = COUNTED_VALUES
+    ) -> Dict[str, List[Dict]]:
+        """
+        Counts the values of every facet within a set of games.
+
+        Args:
+            state (FacetState): The state the rows come from.
+            rows (np.ndarray): The rows of the games, each at most once.
+            limit (int): The most values to return per facet.
+
+        Returns:
+            Dict[str, List[Dict]]: The id, slug, name and count of the most common values, by facet.
+        """
+        counts: Dict[str, List[Dict]] = {}
+
+        # Large sets are counted by checking every posting against a mask, small ones by gathering their rows' values
+        mask: np.ndarray | None = None
+
+        if rows.size > SMALL_FRACTION * state.games.size:
+            mask = np.zeros(state.games.size, dtype=bool)
+            mask[rows] = True
+
+        for facet, column in state.columns.items():
+            if mask is not None:
+                hits: np.ndarray = np.concatenate(([0], np.cumsum(mask[column.postings], dtype=np.int64)))
+                totals: np.ndarray = np.diff(hits[column.offsets])
+            else:
+                starts: np.ndarray = column.rowOffsets[rows]
+                lengths: np.ndarray = column.rowOffsets[rows + 1] - starts
+                positions: np.ndarray = runPositions(starts, lengths)
+                totals: np.ndarray = np.bincount(column.rowValues[positions], minlength=column.values.size)
+
+            top: np.ndarray = np.flatnonzero(totals)
+
+            if top.size > limit:
+                top = top[np.argpartition(-totals[top], limit - 1)[:limit]]
+
+            top = top[np.argsort(-totals[top], kind="stable")]
+
+            counts[facet] = [
+                {
+                    "id": int(column.values[index]),
+                    "slug": column.labels[index][0],
+                    "name": column.labels[index][1],
+                    "count": int(totals[index])
+                }
+                for index in top.tolist()
+            ]
+
+        return counts
@@ -0,0 +1,312 @@
+"""
+Contains the TrigramIndex class, used for typo tolerant searches over the catalog mirror.
+"""
+
+# Standard Library Imports
+from json import loads
+from re import compile
+from typing import List
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .index import CatalogIndex
+
+# Constants
+MAX_TITLE_LENGTH: int = 64  # Longer titles are cut short, the start of a title is what people search for
+MAX_DOCUMENT_FREQUENCY: float = 0.02  # Trigrams in more titles than this are skipped when finding candidates
+MIN_TRIGRAMS: int = 3  # Trigrams always used, however common they are
+MAX_TRIGRAMS: int = 16  # Only the rarest trigrams of long queries are used
+CANDIDATES: int = 256  # Titles re-ranked by edit distance
+nonWord = compile(r"[\W_]+")  # Pre-compile the regex used to normalize titles
+
+
+def normalize(
+        text: str
+) -> str:
+    """
+    Normalizes a title or query for indexing: lower case, with punctuation collapsed into single spaces.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text.
+    """
+    return nonWord.sub(" ", text.lower()).strip()[:MAX_TITLE_LENGTH]
+
+
+def toCodes(
+        text: str
+) -> np.ndarray:
+    """
+    Converts text into an array of code points.
+
+    Args:
+        text (str): The text to convert.
+
+    Returns:
+        np.ndarray: The code points, as uint64 so they can be packed into trigram keys.
+    """
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def trigramKeys(
+        codes: np.ndarray
+) -> np.ndarray:
+    """
+    Packs every trigram of a padded text into a single integer. Code points fit in 21 bits, so three fit in 63.
+
+    Args:
+        codes (np.ndarray): The code points of the padded text.
+
+    Returns:
+        np.ndarray: The packed trigrams.
+    """
+    return (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+
+
+class TrigramState:
+    """
+    The arrays making up a built TrigramIndex.
+    """
+    __slots__ = ("keys", "offsets", "postings", "codes", "titleStarts", "titleLengths", "titleGames", "titleWeights")
+
+    def __init__(
+            self,
+            keys: np.ndarray,
+            offsets: np.ndarray,
+            postings: np.ndarray,
+            codes: np.ndarray,
+            titleStarts: np.ndarray,
+            titleLengths: np.ndarray,
+            titleGames: np.ndarray,
+            titleWeights: np.ndarray
+    ) -> None:
+        """
+        Initializes the TrigramState.
+
+        Args:
+            keys (np.ndarray): The sorted, unique packed trigrams.
+            offsets (np.ndarray): Where each trigram's titles start in postings (one more entry than keys).
+            postings (np.ndarray): The titles containing each trigram, grouped by trigram.
+            codes (np.ndarray): The code points of every title (with padding), one after another.
+            titleStarts (np.ndarray): Where each title starts in codes.
+            titleLengths (np.ndarray): The length of each title.
+            titleGames (np.ndarray): The id of the game each title belongs to.
+            titleWeights (np.ndarray): The popularity (added count) of the game each title belongs to.
+        """
+        self.keys: np.ndarray = keys
+        self.offsets: np.ndarray = offsets
+        self.postings: np.ndarray = postings
+        self.codes: np.ndarray = codes
+        self.titleStarts: np.ndarray = titleStarts
+        self.titleLengths: np.ndarray = titleLengths
+        self.titleGames: np.ndarray = titleGames
+        self.titleWeights: np.ndarray = titleWeights
+
+
+class TrigramIndex(CatalogIndex):
+    """
+    A trigram index over the names, original names and alternative names of every game in the mirror.
+
+    Candidates are the titles sharing the most (rare) trigrams with the query. They are then re-ranked by edit
+    distance, so misspelt queries still find the right game.
+    """
+    __slots__ = ()
+
+    def build(
+            self,
+            previous: TrigramState | None
+    ) -> TrigramState:
+        """
+        Builds the index from the mirror.
+
+        Args:
+            previous (TrigramState | None): Unused, the index is always rebuilt from scratch.
+
+        Returns:
+            TrigramState: The built index.
+        """
+        texts: List[str] = []
+        games: List[int] = []
+        weights: List[int] = []
+
+        rows = self.store.connection.execute(
+            """
+            SELECT
+                id,
+                name,
+                json_extract(coalesce(details, payload), '$.name_original') AS name_original,
+                json_extract(coalesce(details, payload), '$.alternative_names') AS alternative_names,
+                added
+            FROM games
+            """
+        )
+
+        for row in rows:
+            names: List[str] = [row["name"] or "", row["name_original"] or "", *loads(row["alternative_names"] or "[]")]
+
+            for text in dict.fromkeys(normalize(name) for name in names):
+                if text:
+                    texts.append(text)
+                    games.append(row["id"])
+                    weights.append(row["added"] or 0)
+
+        # Pad every title the same way pg_trgm does, so word starts and ends get their own trigrams
+        lengths: np.ndarray = np.fromiter((len(text) + 3 for text in texts), dtype=np.int64, count=len(texts))
+        starts: np.ndarray = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        codes: np.ndarray = toCodes("".join(f"  {text} " for text in texts))
+
+        # Keep the trigrams that do not cross from one title into the next
+        owners: np.ndarray = np.repeat(np.arange(len(texts), dtype=np.int32), lengths)
+        positions: np.ndarray = np.flatnonzero(owners[:-2] == owners[2:])
+        keys: np.ndarray = trigramKeys(codes)[positions]
+        owners = owners[positions]
+
+        # Group by trigram and drop trigrams repeated within a title
+        order: np.ndarray = np.lexsort((owners, keys))
+        keys, owners = keys[order], owners[order]
+        unique: np.ndarray = np.ones(keys.size, dtype=bool)
+        unique[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[unique], owners[unique]
+
+        vocabulary, firstPositions = np.unique(keys, return_index=True)
+
+        return TrigramState(
+            keys=vocabulary,
+            offsets=np.append(firstPositions, keys.size).astype(np.int64),
+            postings=owners,
+            codes=codes.astype(np.uint32),
+            titleStarts=starts + 2,  # Skip the padding
+            titleLengths=lengths - 3,
+            titleGames=np.asarray(games, dtype=np.int64),
+            titleWeights=np.asarray(weights, dtype=np.int64)
+        )
+
+    def search(
+            self,
+            query: str,
+            limit: int = CANDIDATES
+    ) -> List[int] | None:
+        """
+        Finds the games whose titles best match a possibly misspelt query.
+
+        Args:
+            query (str): The search query.
+            limit (int): The most games to return.
+
+        Returns:
+            List[int] | None: The ids of the matching games, best first, or None if the index is not built yet.
+        """
+        state: TrigramState | None = self.getState()
+
+        if state is None:
+            return None
+
+        text: str = normalize(query)
+
+        if not text or state.keys.size == 0:
+            return []
+
+        # Look up the query's trigrams
+        queryKeys: np.ndarray = np.unique(trigramKeys(toCodes(f"  {text} ")))
+        indices: np.ndarray = np.minimum(np.searchsorted(state.keys, queryKeys), state.keys.size - 1)
+        indices = indices[state.keys[indices] == queryKeys]
+
+        if indices.size == 0:
+            return []
+
+        # Use the rarest trigrams, skipping ones so common they would make almost every title a candidate
+        frequencies: np.ndarray = state.offsets[indices + 1] - state.offsets[indices]
+        order: np.ndarray = np.argsort(frequencies, kind="stable")
+        indices, frequencies = indices[order], frequencies[order]
+        used: np.ndarray = frequencies <= max(MAX_DOCUMENT_FREQUENCY * state.titleGames.size, 1)
+        used[:MIN_TRIGRAMS] = True
+        indices = indices[used][:MAX_TRIGRAMS]
+
+        titles, shared = np.unique(
+            np.concatenate([state.postings[state.offsets[index]:state.offsets[index + 1]] for index in indices]),
+            return_counts=True
+        )
+
+        # A title within maxEdits edits of the query loses at most three trigrams per edit
+        maxEdits: int = max(1, len(text) // 4)
+        keep: np.ndarray = shared >= max(1, indices.size - 3 * maxEdits)
+        titles, shared = titles[keep], shared[keep]
+
+        if titles.size == 0:
+            return []
+
+        if titles.size > CANDIDATES:
+            titles = titles[np.argpartition(-shared, CANDIDATES)[:CANDIDATES]]
+
+        substringDistances, fullDistances = self._distances(state, text, titles)
+
+        # Best substring match first, then the closest whole title, then the most popular game
+        order = np.lexsort((-state.titleWeights[titles], fullDistances, substringDistances))
+        order = order[substringDistances[order] <= maxEdits]
+        games: np.ndarray = state.titleGames[titles[order]]
+
+        # A game can match through several titles, keep its best
+        _, first = np.unique(games, return_index=True)
+        return games[np.sort(first)][:limit].tolist()
+
+    @staticmethod
+    def _distances(
+            state: TrigramState,
+            text: str,
+            titles: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the edit distance (Levenshtein, with swapped neighbouring characters as a single edit) between the query
+        and each candidate title, for all candidates at once.
+
+        Args:
+            state (TrigramState): The index.
+            text (str): The normalized query.
+            titles (np.ndarray): The candidate titles.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The distance to the closest substring of each title, and to the whole title.
+        """
+        lengths: np.ndarray = state.titleLengths[titles]
+        width: int = int(lengths.max(initial=0))
+        columns: np.ndarray = np.arange(width + 1, dtype=np.int16)  # Titles and queries are at most 64 characters
+
+        # One row of code points per candidate, padded with 0 (which never matches)
+        matrix: np.ndarray = np.zeros((titles.size, width), dtype=np.uint32)
+        inTitle: np.ndarray = columns[None, 1:] <= lengths[:, None]
+        matrix[inTitle] = state.codes[(state.titleStarts[titles][:, None] + columns[None, :-1])[inTitle]]
+
+        # Rows of the Wagner-Fischer matrix, whole title distances stacked on top of substring distances. A substring
+        # match may start anywhere, so its first row is all zeroes.
+        previous: np.ndarray = np.concatenate(
+            (
+                np.broadcast_to(columns, (titles.size, width + 1)),
+                np.zeros((titles.size, width + 1), dtype=columns.dtype)
+            )
+        )
+        beforePrevious: np.ndarray = previous
+        current: np.ndarray = np.empty_like(previous)
+        matrix = np.concatenate((matrix, matrix))
+        queryCodes: np.ndarray = toCodes(text).astype(np.uint32)
+
+        for row, code in enumerate(queryCodes, 1):
+            current[:, 0] = row
+            np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (matrix != code), out=current[:, 1:])
+
+            # Swapping two neighbouring characters counts as one edit
+            if row >= 2:
+                swapped: np.ndarray = (matrix[:, :-1] == code) & (matrix[:, 1:] == queryCodes[row - 2])
+                np.minimum(current[:, 2:], beforePrevious[:, :-2] + 1, out=current[:, 2:], where=swapped)
+
+            # Insertions chain along the row: current[j] = min over k <= j of current[k] + (j - k)
+            beforePrevious = previous
+            previous = np.minimum.accumulate(current - columns, axis=1) + columns
+
+        full: np.ndarray = previous[np.arange(titles.size), lengths]
+        substring: np.ndarray = np.where(columns[None, :] <= lengths[:, None], previous[titles.size:], np.iinfo(np.int16).max)
+
+        return substring.min(axis=1), full
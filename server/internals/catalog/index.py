@@ -0,0 +1,161 @@
+"""
+Contains the CatalogIndex base class.
+"""
+
+# Standard Library Imports
+from abc import ABC, abstractmethod
+from threading import Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from ..clogging import SuppressedLoggerAdapter, createLogger
+
+if TYPE_CHECKING:
+    from .store import CatalogStore
+
+
+def findRows(
+        games: np.ndarray,
+        ids: np.ndarray
+) -> np.ndarray:
+    """
+    Finds the rows of games in an index whose rows are its games' ids in ascending order.
+
+    Args:
+        games (np.ndarray): The sorted ids of the games in the index.
+        ids (np.ndarray): The ids to find.
+
+    Returns:
+        np.ndarray: The row of each game, or -1 for games synced since the index was built.
+    """
+    if games.size == 0:
+        return np.full(ids.size, -1, dtype=np.int64)
+
+    rows: np.ndarray = np.minimum(np.searchsorted(games, ids), games.size - 1)
+    return np.where(games[rows] == ids, rows, -1)
+
+
+def runPositions(
+        starts: np.ndarray,
+        lengths: np.ndarray
+) -> np.ndarray:
+    """
+    Expands runs of consecutive positions, such as the slices of a CSR array, into one array of positions.
+
+    Args:
+        starts (np.ndarray): The first position of each run.
+        lengths (np.ndarray): The length of each run.
+
+    Returns:
+        np.ndarray: The positions of every run, in order.
+    """
+    runStarts: np.ndarray = np.cumsum(lengths) - lengths
+    return np.repeat(starts - runStarts, lengths) + np.arange(int(lengths.sum()))
+
+
+class CatalogIndex(ABC):
+    """
+    Base class for the in-memory indexes built from the catalog mirror.
+
+    Each worker builds its own copy. When the mirror changes, the index is rebuilt on a background thread and swapped in
+    once ready, so queries never wait for a build. Until the first build finishes, state is None and callers should fall
+    back to another way of answering.
+    """
+    __slots__ = ("store", "logger", "interval", "state", "version", "checked", "lock", "building")
+
+    def __init__(
+            self,
+            store: "CatalogStore"
+    ) -> None:
+        """
+        Initializes the CatalogIndex.
+
+        Args:
+            store (CatalogStore): The mirror to build the index from.
+        """
+        self.store: "CatalogStore" = store
+        self.logger: SuppressedLoggerAdapter = createLogger(
+            type(self).__name__,
+            level=store.config.logging.level,
+            config=store.config
+        )
+        self.interval: float = store.config.catalog.indexInterval
+        self.state: Any = None
+        self.version: str | None = None
+        self.checked: float = float("-inf")
+        self.lock: Lock = Lock()
+        self.building: bool = False
+
+    def getState(self) -> Any:
+        """
+        Gets the current state of the index, starting a rebuild first if the mirror has changed. Checks for changes at
+        most every catalog.indexInterval seconds.
+
+        Returns:
+            Any: The state built by build(), or None if the index has not been built yet.
+        """
+        now: float = monotonic()
+
+        if now - self.checked >= self.interval:
+            self.checked = now
+            version: str = self.currentVersion()
+
+            with self.lock:
+                if version != self.version and not self.building:
+                    self.building = True
+                    Thread(target=self._rebuild, args=(version,), name=f"{type(self).__name__}Build", daemon=True).start()
+
+        return self.state
+
+    def currentVersion(self) -> str:
+        """
+        Gets the version of what the index is built from. The index is rebuilt whenever it changes.
+
+        Returns:
+            str: The version of the mirror.
+        """
+        return self.store.getState("version") or ""  # Mirrors written before versions existed have none
+
+    def _rebuild(
+            self,
+            version: str
+    ) -> None:
+        """
+        Builds the index and swaps it in.
+
+        Args:
+            version (str): The version of the mirror being indexed.
+
+        Returns:
+            None
+        """
+        start: float = monotonic()
+
+        try:
+            self.state = self.build(self.state)
+            self.version = version
+            self.logger.info("Built %s in %.2fs", type(self).__name__, monotonic() - start)
+        except Exception:
+            self.logger.exception("Failed to build %s", type(self).__name__)
+        finally:
+            with self.lock:
+                self.building = False
+
+    @abstractmethod
+    def build(
+            self,
+            previous: Any
+    ) -> Any:
+        """
+        Builds the state of the index from the mirror. Runs on a background thread.
+
+        Args:
+            previous (Any): The state being replaced, or None, for indexes that can update it incrementally.
+
+        Returns:
+            Any: The new state. It must not be modified after it is returned.
+        """
@@ -0,0 +1,76 @@
+-- Local mirror of the RAWG games catalog. Created automatically by CatalogStore.
+
+CREATE TABLE IF NOT EXISTS games
+(
+    id              INTEGER PRIMARY KEY,
+    slug            TEXT UNIQUE,
+    name            TEXT,
+    released        TEXT,             -- YYYY-MM-DD
+    updated         TEXT,             -- ISO 8601, as returned by RAWG
+    added           INTEGER,
+    rating          REAL,
+    metacritic      INTEGER,
+    ratings_count   INTEGER,
+    platforms_count INTEGER,
+    payload         TEXT    NOT NULL, -- The game as returned by the games list endpoint
+    details         TEXT,             -- The game as returned by the details endpoint, cleared when the game is updated
+    synced          REAL    NOT NULL  -- Unix time the row was last written
+);
+
+CREATE INDEX IF NOT EXISTS games_released ON games (released);
+CREATE INDEX IF NOT EXISTS games_updated ON games (updated);
+CREATE INDEX IF NOT EXISTS games_added ON games (added);
+CREATE INDEX IF NOT EXISTS games_rating ON games (rating);
+CREATE INDEX IF NOT EXISTS games_metacritic ON games (metacritic);
+CREATE INDEX IF NOT EXISTS games_name ON games (name);
+CREATE INDEX IF NOT EXISTS games_synced ON games (synced);
+
+-- Which platforms, stores, genres and tags each game has
+CREATE TABLE IF NOT EXISTS game_facets
+(
+    facet   TEXT    NOT NULL,
+    value   INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    PRIMARY KEY (facet, value, game_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS game_facets_game ON game_facets (game_id);
+
+-- Names and slugs of facet values, so filters can be given as slugs
+CREATE TABLE IF NOT EXISTS facet_values
+(
+    facet TEXT    NOT NULL,
+    id    INTEGER NOT NULL,
+    slug  TEXT,
+    name  TEXT,
+    PRIMARY KEY (facet, id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS facet_values_slug ON facet_values (facet, slug);
+
+-- The most similar games to each game, computed by SimilarityIndex
+CREATE TABLE IF NOT EXISTS similar_games
+(
+    game_id    INTEGER NOT NULL,
+    similar_id INTEGER NOT NULL,
+    score      REAL    NOT NULL, -- Cosine similarity, from 0 to 1
+    PRIMARY KEY (game_id, similar_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS similar_games_similar ON similar_games (similar_id);
+
+-- Progress of the background sync
+CREATE TABLE IF NOT EXISTS sync_state
+(
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Full-text index over game names, alternative names and developers. The rowid is the game id.
+CREATE VIRTUAL TABLE IF NOT EXISTS games_search USING fts5
+(
+    name,
+    alternative_names,
+    developers,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
@@ -0,0 +1,249 @@
+"""
+Contains the ScoreIndex class, which ranks every game in the catalog mirror by trending, popularity and rating scores.
+"""
+
+# Standard Library Imports
+from datetime import date
+from os import getpid
+from pathlib import Path
+from time import time
+from typing import Dict, List, Tuple
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .columns import ColumnState, UNIX_EPOCH_DAY
+from .index import CatalogIndex, findRows
+from ..clogging.registry import ensureDirectory
+
+# Constants
+SCORES: tuple[str, ...] = ("trending", "popular", "rated")
+RANKED_LENGTH: int = 100  # Games kept per ranking
+RANKED_PER_YEAR: int = 20  # Games kept per year of the rated ranking
+MIN_SNAPSHOT_GAP: float = 60 * 60  # Seconds between two added counts for their difference to count as a velocity
+RELEASE_GRACE: float = 7  # Days added to a game's age when its velocity is its lifetime average
+
+
+class ScoreState:
+    """
+    The rankings of a built ScoreIndex.
+    """
+    __slots__ = ("rankings", "byYear")
+
+    def __init__(
+            self,
+            rankings: Dict[str, np.ndarray],
+            byYear: Dict[int, np.ndarray]
+    ) -> None:
+        """
+        Initializes the ScoreState.
+
+        Args:
+            rankings (Dict[str, np.ndarray]): The ids of the best games for each score, best first.
+            byYear (Dict[int, np.ndarray]): The ids of the best rated games released in each year, best first.
+        """
+        self.rankings: Dict[str, np.ndarray] = rankings
+        self.byYear: Dict[int, np.ndarray] = byYear
+
+
+def topRows(
+        scores: np.ndarray,
+        limit: int
+) -> np.ndarray:
+    """
+    Finds the rows with the highest scores, ignoring NaN.
+
+    Args:
+        scores (np.ndarray): The score of every row.
+        limit (int): The most rows to return.
+
+    Returns:
+        np.ndarray: The rows, best first.
+    """
+    candidates: np.ndarray = np.flatnonzero(~np.isnan(scores))
+
+    if candidates.size > limit:
+        candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ScoreIndex(CatalogIndex):
+    """
+    Scores every game in one vectorized pass over the columnar store and keeps the best games for each score, so the
+    home page reads its lists in O(k).
+
+    - trending is how many users add the game per day, averaged over daily snapshots of the added counts with
+      older days counting exponentially less. Games without snapshots use their lifetime average.
+    - rated is the Bayesian average of the user rating (pulled towards the catalog's mean until it has enough ratings),
+      averaged with the metacritic score when there is one.
+    - popular is the rated score weighted by the log of the added count.
+
+    Scores decay with time as well as changing with the mirror, so they are also rebuilt every catalog.scoreInterval
+    minutes.
+    """
+    __slots__ = ()
+
+    def currentVersion(self) -> str:
+        """
+        Gets the version of what the scores are built from: the columnar store's generation and the current scoring
+        interval.
+
+        Returns:
+            str: The version.
+        """
+        columns: ColumnState | None = self.store.columns.getState()
+        period: int = int(time() // (self.store.config.catalog.scoreInterval * 60))
+
+        return f"{columns.generation if columns is not None else ""}:{period}"
+
+    def build(
+            self,
+            previous: ScoreState | None
+    ) -> ScoreState | None:
+        """
+        Scores every game.
+
+        Args:
+            previous (ScoreState | None): Unused, the scores are always computed from scratch.
+
+        Returns:
+            ScoreState | None: The rankings, or None if the columnar store is not built yet.
+        """
+        state: ColumnState | None = self.store.columns.getState()
+
+        if state is None:
+            return None
+
+        columns: Dict[str, np.ndarray] = state.columns
+        added: np.ndarray = columns["added"].astype(np.float64)
+        velocity: np.ndarray = self._velocity(state, added)
+
+        # Bayesian average of the user rating, with the catalog's mean rating as the prior
+        prior: float = self.store.config.catalog.ratingPrior
+        rating: np.ndarray = np.nan_to_num(columns["rating"].astype(np.float64))
+        ratingsCount: np.ndarray = np.nan_to_num(columns["ratings_count"].astype(np.float64))
+        mean: float = float(np.sum(rating * ratingsCount) / max(np.sum(ratingsCount), 1))
+        rated: np.ndarray = (prior * mean + rating * ratingsCount) / (prior + ratingsCount) / 5
+
+        # Average it with the metacritic score where there is one
+        metacritic: np.ndarray = columns["metacritic"].astype(np.float64) / 100
+        rated = np.where(np.isnan(metacritic), rated, (rated + metacritic) / 2)
+
+        popular: np.ndarray = rated * np.log1p(np.nan_to_num(added))
+
+        rankings: Dict[str, np.ndarray] = {
+            name: np.asarray(state.games[topRows(score, RANKED_LENGTH)])
+            for name, score in (("trending", velocity), ("popular", popular), ("rated", rated))
+        }
+
+        # The best rated games of each year: sort by year then score, and keep the start of each year's run
+        released: np.ndarray = columns["released"]
+        candidates: np.ndarray = np.flatnonzero(~np.isnan(released))
+        years: np.ndarray = (
+            (released[candidates] - UNIX_EPOCH_DAY).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        )
+        order: np.ndarray = np.lexsort((-rated[candidates], years))
+        candidates, years = candidates[order], years[order]
+        uniqueYears, starts = np.unique(years, return_index=True)
+
+        byYear: Dict[int, np.ndarray] = {
+            int(year): np.asarray(state.games[candidates[start:start + RANKED_PER_YEAR]])
+            for year, start in zip(uniqueYears.tolist(), starts.tolist())
+        }
+
+        return ScoreState(rankings=rankings, byYear=byYear)
+
+    def ranked(
+            self,
+            score: str,
+            limit: int,
+            year: int | None = None
+    ) -> List[int] | None:
+        """
+        Gets the best games for a score.
+
+        Args:
+            score (str): The score, one of SCORES.
+            limit (int): The most games to return (at most 100, or 20 for a year).
+            year (int | None): Only games released in this year. Only supported for the rated score.
+
+        Returns:
+            List[int] | None: The ids of the games, best first, or None if the scores are not built yet.
+
+        Raises:
+            ValueError: If the score is unknown, or a year is given for a score other than rated.
+        """
+        if score not in SCORES or (year is not None and score != "rated"):
+            raise ValueError(f"Cannot rank games by {score}{f" for {year}" if year is not None else ""}")
+
+        state: ScoreState | None = self.getState()
+
+        if state is None:
+            return None
+
+        ids: np.ndarray = state.rankings[score] if year is None else state.byYear.get(year, np.empty(0, dtype=np.int64))
+        return ids[:limit].tolist()
+
+    def _velocity(
+            self,
+            state: ColumnState,
+            added: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes how many users add each game per day. Saves today's added counts first if no worker has yet.
+
+        Args:
+            state (ColumnState): The columnar store.
+            added (np.ndarray): The added count of every game.
+
+        Returns:
+            np.ndarray: The velocity of every game, NaN for games missing both snapshots and a release date.
+        """
+        history: Path = ensureDirectory(Path(f"{self.store.path}.history"))
+        now: float = time()
+        snapshot: Path = history / f"added-{date.fromtimestamp(now).isoformat()}.npz"
+
+        if not snapshot.exists():
+            temporary: Path = history / f".{snapshot.name}.{getpid()}.npz"
+            np.savez(temporary, ids=state.games, added=added, time=now)
+            temporary.rename(snapshot)
+
+        # Keep the most recent days
+        snapshots: List[Path] = sorted(history.glob("added-*.npz"))
+        keptDays: int = self.store.config.catalog.trendingDays
+
+        for old in snapshots[:-keptDays]:
+            old.unlink(missing_ok=True)
+
+        points: List[Tuple[float, np.ndarray]] = []
+
+        for path in snapshots[-keptDays:]:
+            with np.load(path) as data:
+                rows: np.ndarray = findRows(data["ids"], np.asarray(state.games))
+                points.append((float(data["time"]), np.where(rows >= 0, data["added"][np.maximum(rows, 0)], np.nan)))
+
+        points.append((now, added))
+
+        # Daily rates between consecutive snapshots, each weighted by how long ago it was
+        halfLife: float = self.store.config.catalog.trendingHalfLife
+        weightedRates: np.ndarray = np.zeros(added.size)
+        weights: np.ndarray = np.zeros(added.size)
+
+        for (start, before), (end, after) in zip(points, points[1:]):
+            if end - start < MIN_SNAPSHOT_GAP:
+                continue
+
+            rate: np.ndarray = (after - before) / ((end - start) / 86400)
+            weight: float = 0.5 ** ((now - end) / 86400 / halfLife)
+            known: np.ndarray = ~np.isnan(rate)
+            weightedRates[known] += weight * rate[known]
+            weights[known] += weight
+
+        # Games without two snapshots yet use their lifetime average
+        age: np.ndarray = date.fromtimestamp(now).toordinal() - state.columns["released"].astype(np.float64)
+        lifetime: np.ndarray = added / (np.maximum(age, 0) + RELEASE_GRACE)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(weights > 0, weightedRates / weights, lifetime)
@@ -0,0 +1,381 @@
+"""
+Contains the SimilarityIndex class, which precomputes the most similar games to every game in the catalog mirror.
+"""
+
+# Standard Library Imports
+from time import monotonic, time
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .index import findRows, runPositions
+from ..clogging import SuppressedLoggerAdapter, createLogger
+
+if TYPE_CHECKING:
+    from .store import CatalogStore
+
+# Constants
+SIMILAR_FACETS: tuple[str, ...] = ("genres", "tags", "developers", "platforms")  # What games are compared on
+SIMILAR_COUNT: int = 12  # Similar games stored per game
+COMMON_FRACTION: float = 0.1  # Values on more games than this (and COMMON_MINIMUM) are too common to compare games on
+COMMON_MINIMUM: int = 1000
+BATCH_PRODUCTS: int = 20_000_000  # Weight products summed per batch of games
+BATCH_SCORES: int = 5_000_000  # Scores held per batch of games
+COMPACT_FRACTION: float = 0.05  # Recompute every game once this large a fraction of the games changed
+SYNC_SLACK: float = 60  # Seconds of already compared changes compared again, in case a slow write committed late
+FETCH_SIZE: int = 100_000  # Rows read from the mirror at a time
+
+
+class GameVectors:
+    """
+    The sparse, normalized feature vectors of every game, stored both by game and by feature (CSR and CSC), so the
+    similarity of a batch of games to every game is a sparse matrix product.
+    """
+    __slots__ = ("games", "rowOffsets", "rowFeatures", "rowWeights", "featureOffsets", "featureRows", "featureWeights")
+
+    def __init__(
+            self,
+            games: np.ndarray,
+            rows: np.ndarray,
+            features: np.ndarray,
+            weights: np.ndarray,
+            featureCount: int
+    ) -> None:
+        """
+        Initializes the GameVectors.
+
+        Args:
+            games (np.ndarray): The sorted ids of every game. A game's row is its position in this array.
+            rows (np.ndarray): The row of each non-zero entry.
+            features (np.ndarray): The feature of each non-zero entry.
+            weights (np.ndarray): The weight of each non-zero entry.
+            featureCount (int): How many features there are.
+        """
+        self.games: np.ndarray = games
+
+        byRow: np.ndarray = np.lexsort((features, rows))
+        self.rowOffsets: np.ndarray = np.append(0, np.cumsum(np.bincount(rows, minlength=games.size))).astype(np.int64)
+        self.rowFeatures: np.ndarray = features[byRow]
+        self.rowWeights: np.ndarray = weights[byRow]
+
+        byFeature: np.ndarray = np.lexsort((rows, features))
+        self.featureOffsets: np.ndarray = np.append(
+            0, np.cumsum(np.bincount(features, minlength=featureCount))
+        ).astype(np.int64)
+        self.featureRows: np.ndarray = rows[byFeature]
+        self.featureWeights: np.ndarray = weights[byFeature]
+
+    def similarities(
+            self,
+            rows: np.ndarray
+    ) -> np.ndarray:
+        """
+        Computes the cosine similarity of some games to every game.
+
+        Args:
+            rows (np.ndarray): The rows of the games.
+
+        Returns:
+            np.ndarray: The similarities, with a row per game given and a column per game.
+        """
+        starts: np.ndarray = self.rowOffsets[rows]
+        lengths: np.ndarray = self.rowOffsets[rows + 1] - starts
+        positions: np.ndarray = runPositions(starts, lengths)
+        batchRows: np.ndarray = np.repeat(np.arange(rows.size), lengths)
+        features: np.ndarray = self.rowFeatures[positions]
+
+        # Pair every entry of the batch with every game sharing its feature
+        featureStarts: np.ndarray = self.featureOffsets[features]
+        featureLengths: np.ndarray = self.featureOffsets[features + 1] - featureStarts
+        postings: np.ndarray = runPositions(featureStarts, featureLengths)
+
+        return np.bincount(
+            np.repeat(batchRows, featureLengths) * self.games.size + self.featureRows[postings],
+            weights=np.repeat(self.rowWeights[positions], featureLengths) * self.featureWeights[postings],
+            minlength=rows.size * self.games.size
+        ).reshape(rows.size, self.games.size)
+
+    def batches(
+            self,
+            rows: np.ndarray
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Computes the similarities of games to every game, a batch at a time so memory stays bounded.
+
+        Args:
+            rows (np.ndarray): The rows of the games.
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: The rows of a batch and their similarities.
+        """
+        # How many products each game needs: the number of games sharing each of its features
+        featureSizes: np.ndarray = np.diff(self.featureOffsets)
+        entryRows: np.ndarray = np.repeat(np.arange(self.games.size), np.diff(self.rowOffsets))
+        products: np.ndarray = np.bincount(entryRows, weights=featureSizes[self.rowFeatures], minlength=self.games.size)
+        cumulative: np.ndarray = np.cumsum(products[rows])
+        maxRows: int = max(1, BATCH_SCORES // max(self.games.size, 1))
+        start: int = 0
+
+        while start < rows.size:
+            budget: float = (cumulative[start - 1] if start else 0) + BATCH_PRODUCTS
+            end: int = max(start + 1, min(int(np.searchsorted(cumulative, budget, "right")), start + maxRows))
+            yield rows[start:end], self.similarities(rows[start:end])
+            start = end
+
+
+class SimilarityIndex:
+    """
+    The most similar games to every game, by the tags, genres, developers and platforms they share.
+
+    Each game is a sparse vector with a TF-IDF weight per value it has (so rare tags count for more than common ones),
+    normalized to unit length, and the similarity of two games is the cosine of their vectors. The neighbors are
+    computed in batched sparse products and stored in the mirror, so a game page reads them with one lookup.
+
+    Only the sync writes it. After a sync, only the games that changed are compared again, and they replace or join the
+    neighbors of the other games. Games whose neighbor got less similar have a shorter list until the next full
+    computation, which happens once enough games changed.
+    """
+    __slots__ = ("store", "logger")
+
+    def __init__(
+            self,
+            store: "CatalogStore"
+    ) -> None:
+        """
+        Initializes the SimilarityIndex.
+
+        Args:
+            store (CatalogStore): The mirror to compare the games of.
+        """
+        self.store: "CatalogStore" = store
+        self.logger: SuppressedLoggerAdapter = createLogger(
+            type(self).__name__,
+            level=store.config.logging.level,
+            config=store.config
+        )
+
+    def update(self) -> None:
+        """
+        Compares the games changed since the last update, or every game if many changed.
+
+        Returns:
+            None
+        """
+        start: float = monotonic()
+        startedAt: float = time()
+        builtAt: float = float(self.store.getState("similarBuilt") or -1)
+        vectors: GameVectors = self._vectors()
+
+        changed: np.ndarray = np.array(
+            [row["id"] for row in self.store.connection.execute(
+                "SELECT id FROM games WHERE synced > ?",
+                (builtAt - SYNC_SLACK,)
+            )],
+            dtype=np.int64
+        )
+        changedRows: np.ndarray = findRows(vectors.games, changed)
+        changedRows = np.sort(changedRows[changedRows >= 0])
+
+        if builtAt < 0 or changedRows.size > COMPACT_FRACTION * vectors.games.size:
+            self._computeAll(vectors)
+            self.logger.info("Compared all %s games in %.2fs", vectors.games.size, monotonic() - start)
+        elif changedRows.size:
+            self._computeChanged(vectors, changedRows)
+            self.logger.info("Compared %s changed games in %.2fs", changedRows.size, monotonic() - start)
+
+        self.store.setState(similarBuilt=startedAt)
+
+    def _vectors(self) -> GameVectors:
+        """
+        Builds the vector of every game from the mirror.
+
+        Returns:
+            GameVectors: The vectors.
+        """
+        games: np.ndarray = np.array(
+            [row["id"] for row in self.store.connection.execute("SELECT id FROM games ORDER BY id")],
+            dtype=np.int64
+        )
+        keyChunks: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        gameChunks: List[np.ndarray] = [np.empty(0, dtype=np.int64)]
+
+        for facetIndex, facet in enumerate(SIMILAR_FACETS):
+            cursor = self.store.connection.execute("SELECT value, game_id FROM game_facets WHERE facet = ?", (facet,))
+            cursor.row_factory = None
+
+            while chunk := cursor.fetchmany(FETCH_SIZE):
+                pairs: np.ndarray = np.array(chunk, dtype=np.int64).reshape(-1, 2)
+                keyChunks.append(facetIndex << 32 | pairs[:, 0])  # Values of different facets share ids
+                gameChunks.append(pairs[:, 1])
+
+        rows: np.ndarray = findRows(games, np.concatenate(gameChunks))
+        keys: np.ndarray = np.concatenate(keyChunks)[rows >= 0]
+        rows = rows[rows >= 0]
+        _, features = np.unique(keys, return_inverse=True)
+
+        # Values on one game match nothing, and values on most games tell little apart but multiply the work
+        counts: np.ndarray = np.bincount(features)
+        kept: np.ndarray = (counts > 1) & ~((counts > COMMON_FRACTION * games.size) & (counts > COMMON_MINIMUM))
+        keptEntries: np.ndarray = kept[features]
+        rows = rows[keptEntries]
+        _, features = np.unique(features[keptEntries], return_inverse=True)
+        counts = np.bincount(features)
+
+        weights: np.ndarray = np.log(games.size / counts)[features]
+        norms: np.ndarray = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=games.size))
+        weights /= norms[rows]
+
+        return GameVectors(
+            games=games,
+            rows=rows,
+            features=features,
+            weights=weights.astype(np.float32),
+            featureCount=counts.size
+        )
+
+    @staticmethod
+    def _neighbors(
+            rows: np.ndarray,
+            similarities: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the most similar games to each game of a batch.
+
+        Args:
+            rows (np.ndarray): The rows of the batch.
+            similarities (np.ndarray): Their similarities to every game.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The row, neighbor row and similarity of every pair found.
+        """
+        similarities[np.arange(rows.size), rows] = 0  # A game is not similar to itself
+        count: int = min(SIMILAR_COUNT, similarities.shape[1])
+
+        # The best of each of count slices are count different games, so the worst of them is a lower bound for the
+        # count-th best, and only the few games above it need sorting
+        bounds: np.ndarray = np.maximum.reduceat(
+            similarities, np.linspace(0, similarities.shape[1], count, endpoint=False).astype(np.int64), axis=1
+        ).min(axis=1)
+        pairRows, neighbors = np.nonzero((similarities >= bounds[:, None]) & (similarities > 0))
+        scores: np.ndarray = similarities[pairRows, neighbors]
+
+        order: np.ndarray = np.lexsort((-scores, pairRows))
+        pairRows, neighbors, scores = pairRows[order], neighbors[order], scores[order]
+        rank: np.ndarray = np.arange(pairRows.size) - np.searchsorted(pairRows, pairRows)
+        kept: np.ndarray = rank < count
+
+        return rows[pairRows[kept]], neighbors[kept], scores[kept]
+
+    def _computeAll(
+            self,
+            vectors: GameVectors
+    ) -> None:
+        """
+        Replaces the neighbors of every game.
+
+        Args:
+            vectors (GameVectors): The vectors of every game.
+
+        Returns:
+            None
+        """
+        allRows: np.ndarray = np.arange(vectors.games.size)
+
+        for rows, similarities in vectors.batches(allRows):
+            self._write(vectors, rows, *self._neighbors(rows, similarities))
+
+    def _computeChanged(
+            self,
+            vectors: GameVectors,
+            changedRows: np.ndarray
+    ) -> None:
+        """
+        Replaces the neighbors of changed games, and adds them to the neighbors of other games they are now among the
+        most similar to.
+
+        Args:
+            vectors (GameVectors): The vectors of every game.
+            changedRows (np.ndarray): The rows of the changed games.
+
+        Returns:
+            None
+        """
+        changedIds: List[int] = vectors.games[changedRows].tolist()
+
+        with self.store.connection as connection:
+            connection.executemany("DELETE FROM similar_games WHERE similar_id = ?", ((id,) for id in changedIds))
+
+        # The similarity a game needs to join another's neighbors, 0 for games with room left
+        thresholds: np.ndarray = np.zeros(vectors.games.size, dtype=np.float32)
+        unchanged: np.ndarray = np.ones(vectors.games.size, dtype=bool)
+        unchanged[changedRows] = False
+
+        cursor = self.store.connection.execute(
+            "SELECT game_id, min(score) FROM similar_games GROUP BY game_id HAVING count(*) >= ?",
+            (SIMILAR_COUNT,)
+        )
+        cursor.row_factory = None
+        full: np.ndarray = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 2)
+        fullRows: np.ndarray = findRows(vectors.games, full[:, 0].astype(np.int64))
+        thresholds[fullRows[fullRows >= 0]] = full[fullRows >= 0, 1]
+
+        joined: set[int] = set()
+
+        for rows, similarities in vectors.batches(changedRows):
+            joins: Tuple[np.ndarray, np.ndarray] = np.nonzero((similarities > thresholds) & unchanged)
+            joinScores: np.ndarray = similarities[joins]
+            self._write(vectors, rows, *self._neighbors(rows, similarities))
+
+            with self.store.connection as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO similar_games (game_id, similar_id, score) VALUES (?, ?, ?)",
+                    zip(
+                        vectors.games[joins[1]].tolist(),
+                        vectors.games[rows[joins[0]]].tolist(),
+                        joinScores.tolist()
+                    )
+                )
+
+            joined.update(vectors.games[joins[1]].tolist())
+
+        # Games that gained neighbors keep only the most similar
+        with self.store.connection as connection:
+            connection.executemany(
+                """
+                DELETE FROM similar_games
+                WHERE game_id = ?1 AND similar_id NOT IN (
+                    SELECT similar_id FROM similar_games WHERE game_id = ?1 ORDER BY score DESC LIMIT ?2
+                )
+                """,
+                ((id, SIMILAR_COUNT) for id in joined)
+            )
+
+    def _write(
+            self,
+            vectors: GameVectors,
+            rows: np.ndarray,
+            pairRows: np.ndarray,
+            neighborRows: np.ndarray,
+            scores: np.ndarray
+    ) -> None:
+        """
+        Replaces the neighbors of a batch of games.
+
+        Args:
+            vectors (GameVectors): The vectors of every game.
+            rows (np.ndarray): The rows of the batch.
+            pairRows (np.ndarray): The row of each neighbor pair.
+            neighborRows (np.ndarray): The neighbor row of each pair.
+            scores (np.ndarray): The similarity of each pair.
+
+        Returns:
+            None
+        """
+        with self.store.connection as connection:
+            connection.executemany("DELETE FROM similar_games WHERE game_id = ?", ((id,) for id in vectors.games[rows].tolist()))
+            connection.executemany(
+                "INSERT INTO similar_games (game_id, similar_id, score) VALUES (?, ?, ?)",
+                zip(vectors.games[pairRows].tolist(), vectors.games[neighborRows].tolist(), scores.tolist())
+            )
@@ -0,0 +1,915 @@
+"""
+Contains the CatalogStore class.
+"""
+
+# Standard Library Imports
+from json import dumps, loads
+from re import compile
+from pathlib import Path
+from sqlite3 import Connection, Row, connect
+from threading import local
+from time import time
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import urlencode
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .columns import ColumnIndex, ColumnState, dayRange
+from .facets import FacetIndex, FacetState
+from .fuzzy import TrigramIndex
+from .scores import ScoreIndex
+from .similar import SimilarityIndex
+from .suggest import PrefixIndex
+from ..clogging.registry import ensureDirectory
+from ..config import Config
+from ..metrics import catalogQueries
+from ..tracing import traced
+
+# Constants
+FACETS: tuple[str, ...] = ("parent_platforms", "platforms", "stores", "genres", "tags")
+ORDERINGS: tuple[str, ...] = ("name", "released", "added", "updated", "rating", "metacritic")
+DEFAULT_ORDERING: str = "-added"  # RAWG's own relevance ordering is not documented, popularity is the closest match
+SUPPORTED_PARAMETERS: frozenset[str] = frozenset(
+    (
+        "page", "page_size", "ordering", "dates", "updated", "metacritic", "platforms_count", "search", "search_precise",
+        "search_exact", *FACETS
+    )
+)
+SEARCH_WEIGHTS: tuple[float, ...] = (10.0, 5.0, 1.0)  # bm25 weights of name, alternative_names and developers
+searchToken = compile(r"\w+")  # Pre-compile the regex used to split search queries into tokens
+numberRange = compile(r"^[0-9]+(,[0-9]+)?$")  # Pre-compile the regex used to check metacritic ranges
+NUMBER_MINIMUMS: Dict[str, int] = {"page": 1, "page_size": 1, "platforms_count": 0}  # Whole number parameters
+
+# Search results are joined onto the games table as (game_id, score) rows, lower scores first
+FULL_TEXT_SOURCE: str = f"""
+    (
+        SELECT rowid AS game_id, bm25(games_search, {", ".join(map(str, SEARCH_WEIGHTS))}) AS score
+        FROM games_search WHERE games_search MATCH ?
+    ) AS matches JOIN games ON games.id = matches.game_id
+"""
+FUZZY_SOURCE: str = """
+    (SELECT value AS game_id, key AS score FROM json_each(?)) AS matches JOIN games ON games.id = matches.game_id
+"""
+
+
+def extractFacets(
+        payload: Dict
+) -> Dict[str, List[Dict]]:
+    """
+    Gets the facet values of a game payload. Developers and publishers are only in the details endpoint's payloads.
+
+    Args:
+        payload (Dict): The game as returned by RAWG.
+
+    Returns:
+        Dict[str, List[Dict]]: The values (with id, slug and name) of each facet.
+    """
+    return {
+        "parent_platforms": [entry["platform"] for entry in payload.get("parent_platforms") or []],
+        "platforms": [entry["platform"] for entry in payload.get("platforms") or []],
+        "stores": [entry["store"] for entry in payload.get("stores") or []],
+        "genres": payload.get("genres") or [],
+        "tags": payload.get("tags") or [],
+        "developers": payload.get("developers") or [],
+        "publishers": payload.get("publishers") or []
+    }
+
+
+def parseRanges(
+        value: str
+) -> List[Tuple[str, str]]:
+    """
+    Parses a RAWG range filter, for example 2010-01-01,2018-12-31.1960-01-01,1969-12-31.
+
+    Args:
+        value (str): The filter value.
+
+    Returns:
+        List[Tuple[str, str]]: The inclusive (start, end) pairs.
+    """
+    ranges: List[Tuple[str, str]] = []
+
+    for part in str(value).split("."):
+        start, _, end = part.partition(",")
+        ranges.append((start, end or start))
+
+    return ranges
+
+
+def buildMatch(
+        search: str,
+        precise: bool = False,
+        exact: bool = False
+) -> str | None:
+    """
+    Converts a search query into an FTS5 match expression. Every token is quoted, so the query can't use FTS5 syntax.
+
+    Args:
+        search (str): The search query.
+        precise (bool): Disable prefix matching of the last token, which is otherwise on to suit search-as-you-type.
+        exact (bool): Match the query as a phrase.
+
+    Returns:
+        str | None: The match expression, or None if the query has no searchable tokens.
+    """
+    tokens: List[str] = searchToken.findall(search.lower())
+
+    if not tokens:
+        return None
+
+    if exact:
+        return f'"{" ".join(tokens)}"'
+
+    terms: List[str] = [f'"{token}"' for token in tokens]
+
+    # Whole-word matches of the last token also match the prefix term, so they rank above other completions
+    if not precise:
+        terms[-1] = f"({terms[-1]} OR {terms[-1]}*)"
+
+    return " AND ".join(terms)
+
+
+def isTrue(
+        value: Any
+) -> bool:
+    """
+    Checks whether a query parameter is set to true.
+
+    Args:
+        value (Any): The parameter value.
+
+    Returns:
+        bool: Whether the value is true.
+    """
+    return str(value).lower() in ("true", "1")
+
+
+def isWholeNumber(
+        value: Any,
+        minimum: int
+) -> bool:
+    """
+    Checks whether a query parameter is a whole number of at least the minimum.
+
+    Args:
+        value (Any): The parameter value.
+        minimum (int): The smallest value allowed.
+
+    Returns:
+        bool: Whether the value is a whole number in range.
+    """
+    return str(value).isascii() and str(value).isdigit() and int(value) >= minimum
+
+
+class CatalogStore:
+    """
+    A local mirror of the RAWG games catalog, stored in SQLite.
+
+    Every thread gets its own connection. The database runs in WAL mode so that all workers can read it while the sync
+    writes to it.
+    """
+    __slots__ = ("config", "path", "local", "fuzzy", "suggestions", "facets", "columns", "scores", "similar")
+
+    def __init__(
+            self,
+            config: Config
+    ) -> None:
+        """
+        Initializes the CatalogStore and creates the schema if needed.
+
+        Args:
+            config (Config): The configuration object.
+        """
+        self.config: Config = config
+        self.path: Path = Path(config.catalog.path)
+        self.local: local = local()
+        self.fuzzy: TrigramIndex | None = None
+        self.suggestions: PrefixIndex = PrefixIndex(self)  # Only built once it is first used
+        self.facets: FacetIndex = FacetIndex(self)
+        self.columns: ColumnIndex = ColumnIndex(self)
+        self.scores: ScoreIndex = ScoreIndex(self)
+        self.similar: SimilarityIndex = SimilarityIndex(self)
+
+        ensureDirectory(self.path.parent)
+
+        with open(Path(__file__).with_name("schema.sql"), "r") as schemaFile:
+            schema: str = schemaFile.read()
+
+        self.connection.executescript(schema)
+
+        # Mirrors created before the full-text index existed need it filling in
+        outdated: int = self.connection.execute(
+            "SELECT (SELECT COUNT(*) FROM games_search) < (SELECT COUNT(*) FROM games)"
+        ).fetchone()[0]
+
+        if outdated:
+            self.rebuildSearchIndex()
+
+        if config.catalog.fuzzySearch:
+            self.fuzzy = TrigramIndex(self)
+
+    @property
+    def connection(self) -> Connection:
+        """
+        Gets the connection for the current thread, opening it if needed.
+
+        Returns:
+            Connection: The connection.
+        """
+        connection: Connection | None = getattr(self.local, "connection", None)
+
+        if connection is None:
+            connection = connect(self.path, timeout=30)
+            connection.row_factory = Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self.local.connection = connection
+
+        return connection
+
+    def getState(
+            self,
+            key: str
+    ) -> str | None:
+        """
+        Gets a value from the sync state.
+
+        Args:
+            key (str): The key of the value.
+
+        Returns:
+            str | None: The value, or None if it has not been set.
+        """
+        row: Row | None = self.connection.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row is not None else None
+
+    def setState(
+            self,
+            **values: Any
+    ) -> None:
+        """
+        Sets values in the sync state.
+
+        Args:
+            **values (Any): The values to set. None removes a value.
+
+        Returns:
+            None
+        """
+        with self.connection as connection:
+            for key, value in values.items():
+                if value is None:
+                    connection.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+                    continue
+
+                connection.execute(
+                    "INSERT INTO sync_state (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    (key, str(value))
+                )
+
+    def isFresh(self) -> bool:
+        """
+        Checks whether the sync has run recently enough for the mirror to be trusted.
+
+        Returns:
+            bool: Whether the mirror is fresh.
+        """
+        lastSync: str | None = self.getState("lastSync")
+        return lastSync is not None and time() - float(lastSync) < self.config.catalog.maxStaleness * 60 * 60
+
+    def isComplete(self) -> bool:
+        """
+        Checks whether the mirror holds the whole catalog and is fresh.
+
+        Returns:
+            bool: Whether list queries can be answered from the mirror.
+        """
+        return self.getState("complete") is not None and self.isFresh()
+
+    @traced
+    def upsertGames(
+            self,
+            payloads: Iterable[Dict],
+            detailed: bool = False
+    ) -> None:
+        """
+        Adds or updates games in the mirror.
+
+        Args:
+            payloads (Iterable[Dict]): The games as returned by RAWG.
+            detailed (bool): Whether the payloads come from the details endpoint rather than a list.
+
+        Returns:
+            None
+        """
+        now: float = time()
+
+        with self.connection as connection:
+            for payload in payloads:
+                # RAWG gives a slug to another game after a rename, so the game that held it gives it up until it is
+                # synced again
+                if payload.get("slug") is not None:
+                    connection.execute(
+                        "UPDATE games SET slug = NULL WHERE slug = ? AND id <> ?",
+                        (payload["slug"], payload["id"])
+                    )
+
+                connection.execute(
+                    """
+                    INSERT INTO games (
+                        id, slug, name, released, updated, added, rating, metacritic, ratings_count, platforms_count,
+                        payload, details, synced
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        slug = excluded.slug,
+                        name = excluded.name,
+                        released = excluded.released,
+                        updated = excluded.updated,
+                        added = excluded.added,
+                        rating = excluded.rating,
+                        metacritic = excluded.metacritic,
+                        ratings_count = excluded.ratings_count,
+                        platforms_count = excluded.platforms_count,
+                        -- Keep the list payload when storing details, and drop details once the game has changed
+                        payload = CASE WHEN excluded.details IS NULL THEN excluded.payload ELSE games.payload END,
+                        details = CASE
+                            WHEN excluded.details IS NOT NULL THEN excluded.details
+                            WHEN excluded.updated IS games.updated THEN games.details
+                        END,
+                        synced = excluded.synced
+                    """,
+                    (
+                        payload["id"],
+                        payload.get("slug"),
+                        payload.get("name"),
+                        payload.get("released"),
+                        payload.get("updated"),
+                        payload.get("added"),
+                        payload.get("rating"),
+                        payload.get("metacritic"),
+                        payload.get("ratings_count"),
+                        len(payload.get("platforms") or []),
+                        dumps(payload),
+                        dumps(payload) if detailed else None,
+                        now
+                    )
+                )
+
+                # Replace the game's facets, taking developers and publishers from the details if the mirror has them
+                source: Dict = self._source(connection, payload["id"])
+                connection.execute("DELETE FROM game_facets WHERE game_id = ?", (payload["id"],))
+
+                for facet, values in extractFacets(source).items():
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO game_facets (facet, value, game_id) VALUES (?, ?, ?)",
+                        [(facet, value["id"], payload["id"]) for value in values]
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO facet_values (facet, id, slug, name) VALUES (?, ?, ?, ?)",
+                        [(facet, value["id"], value.get("slug"), value.get("name")) for value in values]
+                    )
+
+                self._indexForSearch(connection, payload["id"], source)
+
+            # Lets the in-memory indexes of every worker know the mirror has changed
+            connection.execute(
+                "INSERT INTO sync_state (key, value) VALUES ('version', ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (str(now),)
+            )
+
+    @staticmethod
+    def _source(
+            connection: Connection,
+            gameId: int
+    ) -> Dict:
+        """
+        Gets the most complete copy of a game in the mirror: its details if they are stored, otherwise its list payload.
+
+        Args:
+            connection (Connection): The connection to use.
+            gameId (int): The id of the game.
+
+        Returns:
+            Dict: The game.
+        """
+        row: Row = connection.execute("SELECT payload, details FROM games WHERE id = ?", (gameId,)).fetchone()
+        return loads(row["details"] or row["payload"])
+
+    def _indexForSearch(
+            self,
+            connection: Connection,
+            gameId: int,
+            source: Dict | None = None
+    ) -> None:
+        """
+        Replaces a game's row in the full-text index. Alternative names and developers are only in the details, so
+        they are taken from the details when the mirror has them.
+
+        Args:
+            connection (Connection): The connection to use.
+            gameId (int): The id of the game.
+            source (Dict | None): The game, if already loaded with _source().
+
+        Returns:
+            None
+        """
+        source = source if source is not None else self._source(connection, gameId)
+
+        connection.execute("DELETE FROM games_search WHERE rowid = ?", (gameId,))
+        connection.execute(
+            "INSERT INTO games_search (rowid, name, alternative_names, developers) VALUES (?, ?, ?, ?)",
+            (
+                gameId,
+                source.get("name"),
+                " ".join(source.get("alternative_names") or []),
+                " ".join(developer["name"] for developer in source.get("developers") or [])
+            )
+        )
+
+    def rebuildSearchIndex(self) -> None:
+        """
+        Rebuilds the full-text index from every game in the mirror.
+
+        Returns:
+            None
+        """
+        with self.connection as connection:
+            connection.execute("DELETE FROM games_search")
+
+            for row in connection.execute("SELECT id FROM games").fetchall():
+                self._indexForSearch(connection, row["id"])
+
+    @traced
+    def getGame(
+            self,
+            id: int | str
+    ) -> Dict | None:
+        """
+        Gets the details of a game from the mirror.
+
+        Args:
+            id (int | str): The id or slug of the game.
+
+        Returns:
+            Dict | None: The game as returned by the details endpoint, or None if the mirror can't answer.
+        """
+        if not self.isFresh():
+            catalogQueries.labels("details", "miss").inc()
+            return None
+
+        column: str = "id" if str(id).isdigit() else "slug"
+        row: Row | None = self.connection.execute(f"SELECT details FROM games WHERE {column} = ?", (id,)).fetchone()
+
+        if row is None or row["details"] is None:
+            catalogQueries.labels("details", "miss").inc()
+            return None
+
+        catalogQueries.labels("details", "hit").inc()
+        return loads(row["details"])
+
+    @traced
+    def ranked(
+            self,
+            score: str,
+            limit: int,
+            year: int | None = None
+    ) -> Dict | None:
+        """
+        Gets the best games for a score computed from the mirror.
+
+        Args:
+            score (str): The score, one of trending, popular or rated.
+            limit (int): The most games to return.
+            year (int | None): Only games released in this year, for the rated score.
+
+        Returns:
+            Dict | None: The games in the same shape as a RAWG games list, or None if the mirror can't answer.
+        """
+        ids: List[int] | None = self.scores.ranked(score, limit, year) if self.isComplete() else None
+
+        if ids is None:
+            catalogQueries.labels("ranked", "miss").inc()
+            return None
+
+        stored: Dict[int, str] = {
+            row["id"]: row["payload"] for row in self.connection.execute(
+                f"SELECT id, payload FROM games WHERE id IN ({", ".join("?" * len(ids))})",
+                ids
+            )
+        }
+
+        catalogQueries.labels("ranked", "hit").inc()
+        return self._response({"page_size": limit}, len(ids), [stored[id] for id in ids if id in stored], None)
+
+    def similarGames(
+            self,
+            id: int,
+            limit: int
+    ) -> List[Dict] | None:
+        """
+        Gets the most similar games to a game.
+
+        Args:
+            id (int): The id of the game.
+            limit (int): The most games to return.
+
+        Returns:
+            List[Dict] | None: The games as returned by the games list endpoint, most similar first, or None if the
+                mirror can't answer.
+        """
+        if not self.isFresh() or self.getState("similarBuilt") is None:
+            catalogQueries.labels("similar", "miss").inc()
+            return None
+
+        rows: List[Row] = self.connection.execute(
+            """
+            SELECT games.payload
+            FROM similar_games
+            JOIN games ON games.id = similar_games.similar_id
+            WHERE similar_games.game_id = ?
+            ORDER BY similar_games.score DESC
+            LIMIT ?
+            """,
+            (id, limit)
+        ).fetchall()
+
+        catalogQueries.labels("similar", "hit").inc()
+        return [loads(row["payload"]) for row in rows]
+
+    def covers(
+            self,
+            parameters: Dict[str, Any]
+    ) -> bool:
+        """
+        Checks whether a games list query can be answered from the mirror.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters, as sent to RAWG.
+
+        Returns:
+            bool: Whether the mirror can answer the query.
+        """
+        used: set[str] = {key for key, value in parameters.items() if value is not None}
+
+        if not used <= SUPPORTED_PARAMETERS:
+            return False
+
+        if parameters.get("ordering") is not None and str(parameters["ordering"]).lstrip("-") not in ORDERINGS:
+            return False
+
+        # Values the mirror can't read are left for RAWG to answer, as it did before the mirror
+        for parameter, minimum in NUMBER_MINIMUMS.items():
+            if parameters.get(parameter) is not None and not isWholeNumber(parameters[parameter], minimum):
+                return False
+
+        if parameters.get("metacritic") is not None and numberRange.match(str(parameters["metacritic"])) is None:
+            return False
+
+        return self.isComplete()
+
+    @traced
+    def query(
+            self,
+            parameters: Dict[str, Any]
+    ) -> Dict | None:
+        """
+        Answers a games list query from the mirror.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters, as sent to RAWG.
+
+        Returns:
+            Dict | None: The response in the same shape as RAWG's, or None if the mirror can't answer the query.
+        """
+        if not self.covers(parameters):
+            catalogQueries.labels("list", "miss").inc()
+            return None
+
+        clauses: List[str] = []
+        arguments: List[Any] = []
+        facetClauses: List[str] = []
+        facetArguments: List[Any] = []
+        source: str = "games"
+        searchArguments: List[Any] = []
+
+        # Searches join the full-text matches, ranked by bm25
+        if parameters.get("search") is not None:
+            match: str | None = buildMatch(
+                str(parameters["search"]),
+                precise=isTrue(parameters.get("search_precise")),
+                exact=isTrue(parameters.get("search_exact"))
+            )
+
+            if match is None:
+                catalogQueries.labels("list", "miss").inc()
+                return None
+
+            source = FULL_TEXT_SOURCE
+            searchArguments.append(match)
+
+        facetFilters: Dict[str, List[str]] = {
+            facet: [value for value in str(parameters[facet]).split(",") if value]
+            for facet in FACETS if parameters.get(facet) is not None
+        }
+
+        # Lists that are not searches are answered from the presorted orderings once they are built
+        if parameters.get("search") is None:
+            response: Dict | None = self._queryColumns(parameters, facetFilters)
+
+            if response is not None:
+                catalogQueries.labels("list", "hit").inc()
+                return response
+
+        for facet, values in facetFilters.items():
+            ids: List[int] = [int(value) for value in values if value.isdigit()]
+            slugs: List[str] = [value for value in values if not value.isdigit()]
+
+            # Values within a facet are alternatives, facets are combined
+            facetClauses.append(
+                f"""
+                id IN (
+                    SELECT game_id FROM game_facets WHERE facet = ? AND (
+                        value IN ({", ".join("?" * len(ids))})
+                        OR value IN (SELECT id FROM facet_values WHERE facet = ? AND slug IN ({", ".join("?" * len(slugs))}))
+                    )
+                )
+                """
+            )
+            facetArguments.extend((facet, *ids, facet, *slugs))
+
+        for parameter, column in (("dates", "released"), ("updated", "substr(updated, 1, 10)")):
+            if parameters.get(parameter) is None:
+                continue
+
+            ranges: List[Tuple[str, str]] = parseRanges(parameters[parameter])
+            clauses.append(f"({" OR ".join(f"{column} BETWEEN ? AND ?" for _ in ranges)})")
+            arguments.extend(value for pair in ranges for value in pair)
+
+        if parameters.get("metacritic") is not None:
+            low, _, high = str(parameters["metacritic"]).partition(",")
+            clauses.append("metacritic BETWEEN ? AND ?")
+            arguments.extend((int(low), int(high or low)))
+
+        if parameters.get("platforms_count") is not None:
+            clauses.append("platforms_count = ?")
+            arguments.append(int(parameters["platforms_count"]))
+
+        where: str = f"WHERE {" AND ".join([*facetClauses, *clauses])}" if facetClauses or clauses else ""
+        otherWhere: str = f"WHERE {" AND ".join(clauses)}" if clauses else ""
+
+        # Order the same way RAWG does, with games missing the field last. Searches are ordered by relevance.
+        if parameters.get("ordering") is None and searchArguments:
+            orderBy: str = "score, added DESC"
+        else:
+            ordering: str = str(parameters.get("ordering") or DEFAULT_ORDERING)
+            field: str = ordering.lstrip("-")
+            orderBy: str = f"{field} IS NULL, {field} {"DESC" if ordering.startswith("-") else "ASC"}"
+
+        page: int = int(parameters.get("page", 1))
+        pageSize: int = int(parameters.get("page_size", 20))
+
+        # Once the facet bitmaps are built, they count the matches (and the values of every facet within them) instead
+        facetMatch: Tuple[FacetState, np.ndarray] | None = self.facets.filter(facetFilters) if facetFilters else None
+        count, matches = self._count(
+            source,
+            (where, [*searchArguments, *facetArguments, *arguments]),
+            (otherWhere, [*searchArguments, *arguments]),
+            facetMatch
+        )
+
+        # Too few matches may just be a typo, so try the fuzzy index before letting RAWG try
+        if searchArguments and count < self.config.catalog.searchMinResults:
+            fuzzyMatches: List[int] | None = self._fuzzyMatches(parameters)
+
+            if fuzzyMatches:
+                source = FUZZY_SOURCE
+                searchArguments = [dumps(fuzzyMatches)]
+                count, matches = self._count(
+                    source,
+                    (where, [*searchArguments, *facetArguments, *arguments]),
+                    (otherWhere, [*searchArguments, *arguments]),
+                    facetMatch
+                )
+
+            if source != FUZZY_SOURCE or count == 0:
+                catalogQueries.labels("list", "miss").inc()
+                return None
+
+        # SQLite orders and pages the matches faster than it could join them to a large list of ids from the bitmaps
+        rows: List[Row] = self.connection.execute(
+            f"SELECT payload FROM {source} {where} ORDER BY {orderBy}, id LIMIT ? OFFSET ?",
+            [*searchArguments, *facetArguments, *arguments, pageSize, (page - 1) * pageSize]
+        ).fetchall()
+
+        catalogQueries.labels("list", "hit").inc()
+
+        return self._response(
+            parameters,
+            count,
+            [row["payload"] for row in rows],
+            FacetIndex.count(facetMatch[0], matches) if facetMatch is not None else None
+        )
+
+    def _queryColumns(
+            self,
+            parameters: Dict[str, Any],
+            facetFilters: Dict[str, List[str]]
+    ) -> Dict | None:
+        """
+        Answers a games list query (that is not a search) from the presorted orderings. Filters become a mask over the
+        games, and the page is a slice of the ordering's permutation once the mask is applied.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters.
+            facetFilters (Dict[str, List[str]]): The facet filters, as ids or slugs by facet.
+
+        Returns:
+            Dict | None: The response, or None if the query needs SQLite (or the indexes are not built yet).
+        """
+        state: ColumnState | None = self.columns.getState()
+
+        if state is None:
+            return None
+
+        mask: np.ndarray = np.ones(state.games.size, dtype=bool)
+        facetMatch: Tuple[FacetState, np.ndarray] | None = None
+
+        if facetFilters:
+            facetMatch = self.facets.filter(facetFilters)
+
+            if facetMatch is None:
+                return None
+
+            facetState, facetMask = facetMatch
+
+            # The two indexes are built separately, so their rows only line up if they saw the same games
+            if np.array_equal(facetState.games, state.games):
+                mask &= facetMask
+            else:
+                facetRows: np.ndarray = state.rows(facetState.games[facetMask])
+                translated: np.ndarray = np.zeros(state.games.size, dtype=bool)
+                translated[facetRows[facetRows >= 0]] = True
+                mask &= translated
+
+        ranges: List[Tuple[str, float, float]] = []
+
+        try:
+            for parameter, field in (("dates", "released"), ("updated", "updated")):
+                if parameters.get(parameter) is not None:
+                    ranges.extend(
+                        (field, *dayRange(field, start, end)) for start, end in parseRanges(parameters[parameter])
+                    )
+        except ValueError:
+            return None  # Not a plain date, so leave the comparison to SQLite
+
+        if parameters.get("metacritic") is not None:
+            low, _, high = str(parameters["metacritic"]).partition(",")
+            ranges.append(("metacritic", int(low), int(high or low) + 1))
+
+        # Ranges of the same field are alternatives, fields are combined
+        for field in dict.fromkeys(field for field, _, _ in ranges):
+            inRange: np.ndarray = np.zeros(state.games.size, dtype=bool)
+
+            for _, low, below in (entry for entry in ranges if entry[0] == field):
+                inRange[state.rangeRows(field, low, below)] = True
+
+            mask &= inRange
+
+        if parameters.get("platforms_count") is not None:
+            mask &= state.columns["platforms_count"] == int(parameters["platforms_count"])
+
+        order: np.ndarray = state.orders[str(parameters.get("ordering") or DEFAULT_ORDERING)]
+        matches: np.ndarray = order[mask[order]]
+
+        page: int = int(parameters.get("page", 1))
+        pageSize: int = int(parameters.get("page_size", 20))
+        pageIds: List[int] = state.games[matches[(page - 1) * pageSize:page * pageSize]].tolist()
+
+        stored: Dict[int, str] = {
+            row["id"]: row["payload"] for row in self.connection.execute(
+                f"SELECT id, payload FROM games WHERE id IN ({", ".join("?" * len(pageIds))})",
+                pageIds
+            )
+        }
+
+        facets: Dict[str, List[Dict]] | None = None
+
+        if facetMatch is not None:
+            facetRows: np.ndarray = facetMatch[0].rows(state.games[matches])
+            facets = FacetIndex.count(facetMatch[0], facetRows[facetRows >= 0])
+
+        return self._response(parameters, matches.size, [stored[id] for id in pageIds if id in stored], facets)
+
+    def _response(
+            self,
+            parameters: Dict[str, Any],
+            count: int,
+            payloads: List[str],
+            facets: Dict[str, List[Dict]] | None
+    ) -> Dict:
+        """
+        Builds a games list response in the same shape as RAWG's.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters.
+            count (int): How many games match the query.
+            payloads (List[str]): The stored payloads of the games on the page.
+            facets (Dict[str, List[Dict]] | None): The facet counts, if the facet index was used.
+
+        Returns:
+            Dict: The response.
+        """
+        page: int = int(parameters.get("page", 1))
+        pageSize: int = int(parameters.get("page_size", 20))
+
+        response: Dict = {
+            "count": count,
+            "next": self._pageUrl(parameters, page + 1) if page * pageSize < count else None,
+            "previous": self._pageUrl(parameters, page - 1) if page > 1 else None,
+            "results": [loads(payload) for payload in payloads]
+        }
+
+        if facets is not None:
+            response["facets"] = facets
+
+        return response
+
+    def _count(
+            self,
+            source: str,
+            query: Tuple[str, List[Any]],
+            otherQuery: Tuple[str, List[Any]],
+            facetMatch: Tuple[FacetState, np.ndarray] | None
+    ) -> Tuple[int, np.ndarray | None]:
+        """
+        Counts the games matching a query. With the facet bitmaps, the games matching the rest of the query are
+        filtered against them instead of joining game_facets.
+
+        Args:
+            source (str): The table (or join) to select from.
+            query (Tuple[str, List[Any]]): The WHERE clause and arguments of the whole query.
+            otherQuery (Tuple[str, List[Any]]): The WHERE clause and arguments of the query without its facet filters.
+            facetMatch (Tuple[FacetState, np.ndarray] | None): The state and row mask returned by FacetIndex.filter().
+
+        Returns:
+            Tuple[int, np.ndarray | None]: The count, and the rows of the matching games when facetMatch is given.
+        """
+        if facetMatch is None:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {source} {query[0]}", query[1]).fetchone()[0], None
+
+        state, mask = facetMatch
+
+        if source == "games" and not otherQuery[0]:
+            rows: np.ndarray = np.flatnonzero(mask)
+            return rows.size, rows
+
+        cursor = self.connection.execute(f"SELECT id FROM {source} {otherQuery[0]}", otherQuery[1])
+        cursor.row_factory = None
+
+        # Games synced since the bitmaps were built are left out until the next build
+        rows: np.ndarray = state.rows(np.array(cursor.fetchall(), dtype=np.int64).reshape(-1))
+        rows = rows[rows >= 0]
+        rows = rows[mask[rows]]
+
+        return rows.size, rows
+
+    def _fuzzyMatches(
+            self,
+            parameters: Dict[str, Any]
+    ) -> List[int] | None:
+        """
+        Finds the games matching a search using the fuzzy index, if it is enabled and the search allows fuzziness.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters.
+
+        Returns:
+            List[int] | None: The ids of the matching games, best first, or None if the fuzzy index can't be used.
+        """
+        if self.fuzzy is None or isTrue(parameters.get("search_precise")) or isTrue(parameters.get("search_exact")):
+            return None
+
+        return self.fuzzy.search(str(parameters["search"]))
+
+    def _pageUrl(
+            self,
+            parameters: Dict[str, Any],
+            page: int
+    ) -> str:
+        """
+        Builds the RAWG url of another page of a query, so mirrored responses look like RAWG's.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters.
+            page (int): The page number.
+
+        Returns:
+            str: The url.
+        """
+        query: Dict[str, Any] = {key: value for key, value in parameters.items() if value is not None}
+        query["page"] = page
+
+        return f"{self.config.api.base.rstrip("/")}/games?{urlencode(query)}"
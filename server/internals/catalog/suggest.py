@@ -0,0 +1,267 @@
+"""
+Contains the PrefixIndex class, used for search-as-you-type suggestions.
+"""
+
+# Standard Library Imports
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Third Party Imports
+import numpy as np
+
+# Local Imports
+from .fuzzy import normalize
+from .index import CatalogIndex
+
+# Constants
+MAX_SUGGESTIONS: int = 20
+CACHED_PREFIX_LENGTH: int = 2  # Prefixes this short match too many titles to rank on every keystroke
+MAX_WORD_STARTS: int = 4  # Titles can also be found from their second, third and fourth words
+LAST_CODE_POINT: str = "\U0010ffff"
+SYNC_SLACK: float = 60  # Seconds of already indexed changes re-read, in case a slow write committed after the last build
+COMPACT_FRACTION: float = 0.05  # Rebuild from scratch once the changes are this large a fraction of the index
+
+
+def entryKeys(
+        name: str,
+        slug: str
+) -> List[str]:
+    """
+    Gets the keys a game can be suggested by: its name, its name from each of the first few words, and its slug.
+
+    Args:
+        name (str): The name of the game.
+        slug (str): The slug of the game.
+
+    Returns:
+        List[str]: The normalized keys.
+    """
+    words: List[str] = normalize(name).split()
+    keys: List[str] = [" ".join(words[start:]) for start in range(min(len(words), MAX_WORD_STARTS))]
+    keys.append(normalize(slug))
+
+    return [key for key in dict.fromkeys(keys) if key]
+
+
+class PrefixState:
+    """
+    The arrays making up a built PrefixIndex.
+
+    Games that change after a full build are indexed again in a small delta, and their entries in the main arrays are
+    ignored. Once the delta grows too large, the next build starts from scratch.
+    """
+    __slots__ = (
+        "keys", "games", "weights", "topCache", "deltaKeys", "deltaGames", "deltaWeights", "replaced", "titles", "builtAt"
+    )
+
+    def __init__(
+            self,
+            keys: List[str],
+            games: np.ndarray,
+            weights: np.ndarray,
+            topCache: Dict[str, List[Tuple[int, int]]],
+            delta: List[Tuple[str, int, int]],
+            replaced: frozenset[int],
+            titles: Dict[int, Tuple[str, str]],
+            builtAt: float
+    ) -> None:
+        """
+        Initializes the PrefixState.
+
+        Args:
+            keys (List[str]): The sorted keys of the main index.
+            games (np.ndarray): The game each key belongs to.
+            weights (np.ndarray): The popularity (added plus ratings count) of the game each key belongs to.
+            topCache (Dict[str, List[Tuple[int, int]]]): The (weight, game) pairs ranked ahead of time for the
+                shortest prefixes of the main index.
+            delta (List[Tuple[str, int, int]]): Sorted (key, game, weight) entries of games changed since the full
+                build.
+            replaced (frozenset[int]): The games whose main index entries are out of date.
+            titles (Dict[int, Tuple[str, str]]): The slug and name of each game.
+            builtAt (float): The newest synced time of the games indexed, used for incremental rebuilds.
+        """
+        self.keys: List[str] = keys
+        self.games: np.ndarray = games
+        self.weights: np.ndarray = weights
+        self.topCache: Dict[str, List[Tuple[int, int]]] = topCache
+        self.deltaKeys: List[str] = [entry[0] for entry in delta]
+        self.deltaGames: np.ndarray = np.fromiter((entry[1] for entry in delta), dtype=np.int64, count=len(delta))
+        self.deltaWeights: np.ndarray = np.fromiter((entry[2] for entry in delta), dtype=np.int64, count=len(delta))
+        self.replaced: frozenset[int] = replaced
+        self.titles: Dict[int, Tuple[str, str]] = titles
+        self.builtAt: float = builtAt
+
+
+def rankRange(
+        keys: List[str],
+        games: np.ndarray,
+        weights: np.ndarray,
+        prefix: str,
+        limit: int
+) -> List[Tuple[int, int]]:
+    """
+    Finds the most popular games with a key starting with a prefix.
+
+    Args:
+        keys (List[str]): The sorted keys.
+        games (np.ndarray): The game each key belongs to.
+        weights (np.ndarray): The weight of each key.
+        prefix (str): The normalized prefix.
+        limit (int): How many entries to consider. Games with several matching keys appear once, so fewer may be
+            returned.
+
+    Returns:
+        List[Tuple[int, int]]: The (weight, game) pairs, most popular first.
+    """
+    start: int = bisect_left(keys, prefix)
+    end: int = bisect_left(keys, prefix + LAST_CODE_POINT, start)
+
+    if start == end:
+        return []
+
+    rangeWeights: np.ndarray = weights[start:end]
+    take: int = min(rangeWeights.size, limit)
+    best: np.ndarray = np.argpartition(-rangeWeights, take - 1)[:take] if rangeWeights.size > take else np.arange(take)
+    best = best[np.argsort(-rangeWeights[best], kind="stable")]
+
+    return list(dict.fromkeys(zip(rangeWeights[best].tolist(), games[start:end][best].tolist())))
+
+
+class PrefixIndex(CatalogIndex):
+    """
+    A sorted index of game names and slugs, answering prefix lookups with the most popular matching games.
+    """
+    __slots__ = ()
+
+    def build(
+            self,
+            previous: PrefixState | None
+    ) -> PrefixState:
+        """
+        Builds the index. Games changed since the previous build are added to its delta, unless the delta has grown
+        large enough for a full build to be worth it.
+
+        Args:
+            previous (PrefixState | None): The state being replaced.
+
+        Returns:
+            PrefixState: The new state.
+        """
+        since: float = previous.builtAt if previous is not None else -1.0
+        rows = self.store.connection.execute(
+            "SELECT id, slug, name, added, ratings_count, synced FROM games WHERE synced > ?",
+            (since - SYNC_SLACK,)
+        ).fetchall()
+
+        if previous is None:
+            return self._fullBuild()
+
+        changed: set[int] = {row["id"] for row in rows}
+        titles: Dict[int, Tuple[str, str]] = dict(previous.titles)
+        delta: List[Tuple[str, int, int]] = [
+            entry for entry in zip(previous.deltaKeys, previous.deltaGames.tolist(), previous.deltaWeights.tolist())
+            if entry[1] not in changed
+        ]
+
+        for row in rows:
+            titles[row["id"]] = (row["slug"], row["name"])
+            weight: int = (row["added"] or 0) + (row["ratings_count"] or 0)
+            delta.extend((key, row["id"], weight) for key in entryKeys(row["name"] or "", row["slug"] or ""))
+
+        if len(delta) > COMPACT_FRACTION * len(previous.keys):
+            return self._fullBuild()
+
+        delta.sort()
+
+        return PrefixState(
+            keys=previous.keys,
+            games=previous.games,
+            weights=previous.weights,
+            topCache=previous.topCache,
+            delta=delta,
+            replaced=previous.replaced | changed,
+            titles=titles,
+            builtAt=max([since, *(row["synced"] for row in rows)])
+        )
+
+    def _fullBuild(self) -> PrefixState:
+        """
+        Builds the index from every game in the mirror.
+
+        Returns:
+            PrefixState: The new state.
+        """
+        titles: Dict[int, Tuple[str, str]] = {}
+        entries: List[Tuple[str, int, int]] = []
+        builtAt: float = -1.0
+
+        for row in self.store.connection.execute("SELECT id, slug, name, added, ratings_count, synced FROM games"):
+            titles[row["id"]] = (row["slug"], row["name"])
+            weight: int = (row["added"] or 0) + (row["ratings_count"] or 0)
+            entries.extend((key, row["id"], weight) for key in entryKeys(row["name"] or "", row["slug"] or ""))
+            builtAt = max(builtAt, row["synced"])
+
+        entries.sort()
+        keys: List[str] = [entry[0] for entry in entries]
+        games: np.ndarray = np.fromiter((entry[1] for entry in entries), dtype=np.int64, count=len(entries))
+        weights: np.ndarray = np.fromiter((entry[2] for entry in entries), dtype=np.int64, count=len(entries))
+
+        # Rank the shortest prefixes ahead of time, with room for games that later move to the delta
+        topCache: Dict[str, List[Tuple[int, int]]] = {
+            prefix: rankRange(keys, games, weights, prefix, MAX_SUGGESTIONS * 8)
+            for prefix in {key[:length] for key in keys for length in range(1, CACHED_PREFIX_LENGTH + 1)}
+        }
+
+        return PrefixState(
+            keys=keys,
+            games=games,
+            weights=weights,
+            topCache=topCache,
+            delta=[],
+            replaced=frozenset(),
+            titles=titles,
+            builtAt=builtAt
+        )
+
+    def suggest(
+            self,
+            prefix: str,
+            limit: int = 10
+    ) -> List[Dict] | None:
+        """
+        Gets the most popular games with a name or slug starting with a prefix.
+
+        Args:
+            prefix (str): What has been typed so far.
+            limit (int): The most suggestions to return (at most 20).
+
+        Returns:
+            List[Dict] | None: The id, slug and name of each game, or None if the index is not built yet.
+        """
+        state: PrefixState | None = self.getState()
+
+        if state is None:
+            return None
+
+        key: str = normalize(prefix)
+
+        if not key:
+            return []
+
+        limit = min(limit, MAX_SUGGESTIONS)
+
+        # A game can match through several keys, so consider extra entries to still have enough once merged
+        if len(key) <= CACHED_PREFIX_LENGTH:
+            ranked: List[Tuple[int, int]] = state.topCache.get(key, [])
+        else:
+            ranked: List[Tuple[int, int]] = rankRange(state.keys, state.games, state.weights, key, limit * 4)
+
+        ranked = [entry for entry in ranked if entry[1] not in state.replaced]
+
+        if state.deltaKeys:
+            ranked.extend(rankRange(state.deltaKeys, state.deltaGames, state.deltaWeights, key, limit * 4))
+            ranked.sort(reverse=True)
+
+        games: List[int] = list(dict.fromkeys(game for _, game in ranked))[:limit]
+
+        return [{"id": game, "slug": state.titles[game][0], "name": state.titles[game][1]} for game in games]
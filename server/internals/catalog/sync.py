@@ -0,0 +1,197 @@
+"""
+Contains the CatalogSync class.
+"""
+
+# Standard Library Imports
+from datetime import date
+from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
+from pathlib import Path
+from threading import Event, Thread
+from time import time
+from typing import Dict, Iterator
+
+# Local Imports
+from .store import CatalogStore
+from ..clogging import SuppressedLoggerAdapter, createLogger
+from ..config import Config
+from ..requester import Requester, pastEnd
+
+
+class CatalogSync(Thread):
+    """
+    A background thread that keeps the catalog mirror up to date.
+
+    The first runs crawl the whole games list, a limited number of pages per run. Once the crawl is complete, each run
+    only fetches the games updated since the previous run. Every worker runs a CatalogSync, but a file lock makes sure
+    only one of them syncs at a time.
+    """
+
+    def __init__(
+            self,
+            config: Config,
+            store: CatalogStore,
+            requester: Requester
+    ) -> None:
+        """
+        Initializes the CatalogSync.
+
+        Args:
+            config (Config): The configuration object.
+            store (CatalogStore): The mirror to keep up to date.
+            requester (Requester): The requester to use.
+        """
+        super().__init__(name="CatalogSync", daemon=True)
+        self.config: Config = config
+        self.store: CatalogStore = store
+        self.requester: Requester = requester
+        self.logger: SuppressedLoggerAdapter = createLogger(
+            "CatalogSync",
+            level=config.logging.level,
+            config=config
+        )
+        self.lockPath: Path = Path(f"{config.catalog.path}.lock")
+        self.stopped: Event = Event()
+
+    def run(self) -> None:
+        """
+        Syncs the mirror every catalog.syncInterval minutes until stopped.
+
+        Returns:
+            None
+        """
+        while not self.stopped.is_set():
+            try:
+                self.syncOnce()
+            except Exception:
+                self.logger.exception("Catalog sync failed")
+
+            self.stopped.wait(self.config.catalog.syncInterval * 60)
+
+    def stop(self) -> None:
+        """
+        Stops the sync after its current run.
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+
+    def syncOnce(self) -> None:
+        """
+        Runs one sync, unless another worker is already syncing.
+
+        Returns:
+            None
+        """
+        with open(self.lockPath, "a") as lockFile:
+            try:
+                flock(lockFile, LOCK_EX | LOCK_NB)
+            except BlockingIOError:
+                self.logger.debug("Another worker is syncing the catalog")
+                return
+
+            try:
+                if self.store.getState("complete") is None:
+                    self._crawl()
+                else:
+                    self._update()
+
+                # Similar games are only worth comparing once every game is in the mirror
+                if self.store.getState("complete") is not None:
+                    self.store.similar.update()
+            finally:
+                flock(lockFile, LOCK_UN)
+
+    def _crawl(self) -> None:
+        """
+        Continues the full crawl of the games list.
+
+        Returns:
+            None
+        """
+        page: int = int(self.store.getState("crawlPage") or 1)
+
+        # Changes made while the crawl runs are picked up by the first update
+        startedOn: str = self.store.getState("crawlStarted") or date.today().isoformat()
+        self.store.setState(crawlStarted=startedOn)
+
+        self.logger.info("Crawling the catalog from page %s", page)
+
+        # Only the pages this run will use are fetched, the next run picks up from crawlPage
+        pageLimit: int = self.config.catalog.pageLimit
+        limit: int = self.config.catalog.pagesPerRun
+
+        if pageLimit:
+            limit = max(min(limit, pageLimit - page + 1), 1)
+
+        pages: Iterator[Dict] = self.requester.pages(
+            "games",
+            {"ordering": "-added"},
+            page,
+            limit=limit,
+            skipCache=True,
+            noStore=True
+        )
+
+        for data in pages:
+            # Any other error leaves the crawl where it is, to be retried by the next run
+            if "results" not in data and not pastEnd(data):
+                self.logger.error("Crawling page %s failed, retrying next run: %s", page, data)
+                break
+
+            # RAWG answers pages past the end with an error instead of results
+            if "results" in data:
+                self.store.upsertGames(data["results"])
+
+            if "results" not in data or data["next"] is None or (pageLimit and page >= pageLimit):
+                self.store.setState(complete=time(), watermark=startedOn, crawlPage=None, crawlStarted=None)
+                self.logger.info("Catalog crawl complete after %s pages", page)
+                break
+
+            page += 1
+            self.store.setState(crawlPage=page)
+
+        self.store.setState(lastSync=time())
+
+    def _update(self) -> None:
+        """
+        Fetches every game updated since the last sync.
+
+        Returns:
+            None
+        """
+        watermark: str = self.store.getState("watermark")
+        newest: str = watermark
+        updatedCount: int = 0
+        parameters: Dict = {
+            "updated": f"{watermark},{date.today().isoformat()}",
+            "ordering": "-updated"
+        }
+
+        finished: bool = False
+
+        for data in self.requester.pages("games", parameters, skipCache=True, noStore=True):
+            if self.stopped.is_set():
+                break
+
+            if "results" not in data:
+                finished = pastEnd(data)
+
+                if not finished:
+                    self.logger.error("Updating the catalog failed, retrying next run: %s", data)
+
+                break
+
+            self.store.upsertGames(data["results"])
+            updatedCount += len(data["results"])
+            newest = max([newest, *(game["updated"][:10] for game in data["results"] if game.get("updated"))])
+            finished = data["next"] is None
+
+        # Games are ordered by when they were updated, so the watermark only moves once every page has been read
+        if not finished:
+            self.logger.info("Catalog update stopped after %s games, keeping the watermark %s", updatedCount, watermark)
+            return
+
+        # The filter only has day precision, so the next update starts from the newest day rather than after it
+        self.store.setState(watermark=newest, lastSync=time())
+        self.logger.info("Catalog updated with %s games changed since %s", updatedCount, watermark)
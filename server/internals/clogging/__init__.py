@@ -2,9 +2,10 @@
 Initializes the logging module.
 """
 
-from .adapters import SuppressedLoggerAdapter
+from .adapters import Deferred, SuppressedLoggerAdapter
 from .funcs import createLogger
 
 __all__ = [
+    "Deferred",
     "SuppressedLoggerAdapter"
 ]
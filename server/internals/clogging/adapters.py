@@ -4,6 +4,7 @@ Adapters module for custom logging system.
 
 # Standard Library Imports
 from logging import Logger, LoggerAdapter
+from typing import Any, Callable, MutableMapping, Tuple
 
 # Third Party Imports
 
@@ -12,10 +13,41 @@ from logging import Logger, LoggerAdapter
 # Constants
 
 
+class Deferred:
+    """
+    Wraps a callable so that its value is only computed when a handler actually formats the log record.
+
+    Can be used either as the log message itself or as one of the %-style arguments, for example:
+        logger.info("Cookies: %s", Deferred(lambda: request.cookies.to_dict()))
+    """
+    __slots__ = ("func",)
+
+    def __init__(
+            self,
+            func: Callable[[], Any]
+    ) -> None:
+        """
+        Initializes the Deferred object.
+
+        Args:
+            func (Callable[[], Any]): The callable that produces the value.
+        """
+        self.func = func
+
+    def __str__(self) -> str:
+        return str(self.func())
+
+    def __repr__(self) -> str:
+        return repr(self.func())
+
+
 # Custom LoggerAdapter that can be disabled
 class SuppressedLoggerAdapter(LoggerAdapter):
     """
     A logger adapter that can be disabled.
+
+    Messages are formatted lazily. Pass %-style arguments instead of f-strings, or pass a callable (or Deferred) as
+    the message, and nothing is formatted unless the level is enabled and a handler emits the record.
     """
     # Type hints
     suppressed: bool
@@ -49,10 +81,32 @@ class SuppressedLoggerAdapter(LoggerAdapter):
         """
         self.suppressed = False
 
+    def process(
+            self,
+            msg: Any,
+            kwargs: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        """
+        Merges the adapter's extra with any extra passed to the individual log call.
+
+        Args:
+            msg (Any): The log message.
+            kwargs (MutableMapping[str, Any]): The keyword arguments of the log call.
+
+        Returns:
+            Tuple[Any, MutableMapping[str, Any]]: The message and the processed keyword arguments.
+        """
+        if "extra" in kwargs and kwargs["extra"]:
+            kwargs["extra"] = {**(self.extra or {}), **kwargs["extra"]}
+        else:
+            kwargs["extra"] = self.extra
+
+        return msg, kwargs
+
     def log(
             self,
             level: int,
-            msg: str,
+            msg: str | Callable[[], str],
             *args,
             **kwargs
     ) -> None:
@@ -61,10 +115,22 @@ class SuppressedLoggerAdapter(LoggerAdapter):
 
         Args:
             level (int): The level of the log message.
-            msg (str): The log message.
+            msg (str | Callable[[], str]): The log message, or a callable that produces it.
             *args: Additional arguments.
             **kwargs: Additional keyword arguments.
         """
+        # Bail out before any formatting work is done
+        if self.suppressed or not self.isEnabledFor(level):
+            return
+
+        # Callables are wrapped so they are only called when a handler formats the record
+        if callable(msg) and not isinstance(msg, Deferred):
+            msg = Deferred(msg)
+
+        # Report the caller of the adapter rather than this method as the record's origin. A stacklevel passed by the
+        # caller counts from their own frame, so it is moved past this method too.
+        kwargs["stacklevel"] = kwargs.get("stacklevel", 1) + 1
+
         # This does have request context
-        if not self.suppressed:
-            super().log(level, msg, *args, **kwargs)
+        msg, kwargs = self.process(msg, kwargs)
+        self.logger.log(level, msg, *args, **kwargs)
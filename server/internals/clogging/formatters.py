@@ -1,8 +1,10 @@
 """
 Contains custom formatters for the logging module.
 """
-from logging import Formatter, LogRecord
-from typing import Literal
+from datetime import datetime
+from json import dumps
+from logging import Formatter, LogRecord, getLevelName
+from typing import Any, Dict, Literal
 
 
 def _getEscapeCode(
@@ -107,9 +109,61 @@ class ColourCodedFormatter(Formatter):
         Returns:
             str: The formatted log message.
         """
+        levelName: str = record.levelname
+
         try:
             record.levelname = f"{self.colourCoding[record.levelname]}{record.levelname}\033[0m"
         except KeyError:  # Handles the case where the level name is not in the colour coding dictionary
             pass
 
-        return super().format(record)
+        try:
+            return super().format(record)
+        finally:
+            # The record is shared with the other handlers, so don't leak the escape codes into them
+            record.levelname = levelName
+
+
+class JsonLinesFormatter(Formatter):
+    """
+    A formatter that renders each log record as a single line of JSON (NDJSON).
+    """
+    # Record attributes that are copied into the output when present
+    contextFields: tuple[str, ...] = ("requestId", "elapsedMs")
+
+    def format(
+            self,
+            record: LogRecord
+    ) -> str:
+        """
+        Formats the log record as a JSON object.
+
+        Args:
+            record (LogRecord): The log record to format.
+
+        Returns:
+            str: The formatted log record, without a trailing newline.
+        """
+        data: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": getLevelName(record.levelno),  # levelname may have been colour coded by another handler
+            "logger": getattr(record, "loggername", record.name),
+            "message": record.getMessage(),
+            "module": record.module,
+            "funcName": record.funcName,
+            "lineno": record.lineno,
+            "process": record.process,
+            "thread": record.threadName
+        }
+
+        for field in self.contextFields:
+            value: Any = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+
+        # Records that crossed the log queue carry the traceback already rendered
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+
+        return dumps(data, default=str)
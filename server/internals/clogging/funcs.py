@@ -3,25 +3,130 @@ Funcs module.
 """
 # Standard Library Imports
 from logging import FileHandler, Formatter, Handler, INFO, Logger, StreamHandler, getLogger
-from os import getcwd, mkdir, path
+from logging.handlers import QueueHandler
+from os import getcwd, getpid
 from pathlib import Path
+from queue import SimpleQueue
 from sys import stdout
 from typing import Dict, List
 
 # Local Imports
 from . import SuppressedLoggerAdapter
-from .formatters import ColourCodedFormatter
-from .handlers import DatabaseLogHandler
+from .formatters import ColourCodedFormatter, JsonLinesFormatter
+from .handlers import DatabaseLogHandler, JsonLinesFileHandler, MeasuredQueueHandler, MeasuredQueueListener, RequestContextFilter
+from .registry import ensureDirectory, getSink
 from ..config import Config
 
 # Used for storing what loggers have been created to prevent duplicate request handlers
 createdLoggers: Dict[str, bool] = {}
 
+# Constants
+DEFAULT_FORMAT: str = "[%(asctime)s] [%(loggername)s] [%(levelname)s] %(message)s"
+
+
+def _createJsonSink(
+        config: Config
+) -> QueueHandler:
+    """
+    Creates the queue handler that feeds the json-lines file sink and starts its background listener.
+
+    Args:
+        config (Config): The config object to use.
+
+    Returns:
+        QueueHandler: The queue handler to attach to loggers.
+    """
+    directory: Path = ensureDirectory(Path(f"{getcwd()}/Logs/json"))
+
+    # Each worker process writes its own file so that rotation never races between processes
+    fileHandler: JsonLinesFileHandler = JsonLinesFileHandler(
+        directory / f"ia3_{getpid()}.ndjson",
+        maxBytes=config.logging.json.maxBytes,
+        interval=config.logging.json.interval,
+        backupCount=config.logging.json.backupCount,
+        compress=config.logging.json.compress
+    )
+    fileHandler.setFormatter(JsonLinesFormatter())
+    fileHandler.pruneOrphans()
+
+    queue: SimpleQueue = SimpleQueue()
+    handler: QueueHandler = MeasuredQueueHandler(queue)
+    handler.addFilter(RequestContextFilter())  # Request context has to be captured on the request thread
+
+    # Keep a reference to the listener on the handler so the registry can stop it at exit
+    handler.listener = MeasuredQueueListener(queue, fileHandler, respect_handler_level=True)
+    handler.listener.start()
+
+    return handler
+
+
+def _createFileSink(
+        name: str,
+        formatString: str
+) -> FileHandler:
+    """
+    Creates the plain-text file handler for a logger.
+
+    Args:
+        name (str): The name of the logger.
+        formatString (str): The format string for the handler.
+
+    Returns:
+        FileHandler: The file handler.
+    """
+    directory: Path = ensureDirectory(Path(f"{getcwd()}/Logs/{name}"))
+
+    handler: FileHandler = FileHandler(directory / f"{name}_.log", encoding="utf-8")
+    handler.setFormatter(Formatter(formatString))
+    return handler
+
+
+def _createConsoleSink(
+        formatString: str,
+        doColour: bool,
+        colourCoding: Dict[str, str] | None
+) -> StreamHandler:
+    """
+    Creates the console handler.
+
+    Args:
+        formatString (str): The format string for the handler.
+        doColour (bool): Whether to use colour coding.
+        colourCoding (Dict[str, str] | None): The colour coding to use.
+
+    Returns:
+        StreamHandler: The console handler.
+    """
+    handler: StreamHandler = StreamHandler(stdout)
+    handler.setFormatter(
+        ColourCodedFormatter(formatString, colourCoding=colourCoding) if doColour else Formatter(formatString)
+    )
+    return handler
+
+
+def _createDatabaseSink(
+        config: Config,
+        formatString: str
+) -> DatabaseLogHandler:
+    """
+    Creates the database handler. Only one connection is opened per process.
+
+    Args:
+        config (Config): The config object to use.
+        formatString (str): The format string for the handler.
+
+    Returns:
+        DatabaseLogHandler: The database handler.
+    """
+    handler: DatabaseLogHandler = DatabaseLogHandler(config)
+    handler.setFormatter(Formatter(formatString))
+    return handler
+
 
 def createLogger(
         name: str,
         level: int = INFO,
-        formatString: str = "[%(asctime)s] [%(loggername)s] [%(levelname)s] %(message)s",
+        formatString: str = DEFAULT_FORMAT,
         handlers: List[Handler] = None,
         doColour: bool = True,
         colourCoding: Dict[str, str] = None,
@@ -32,6 +137,9 @@ def createLogger(
     """
     Creates a logger with the specified name, logging path, level, and formatter.
 
+    Sinks are shared through the registry, so calling this repeatedly (or for many loggers) does not open new files or
+    database connections.
+
     Args:
         name (str): The name of the logger.
         level (str): The level of the logger.
@@ -47,22 +155,12 @@ def createLogger(
     Returns:
         logger (Logger): The logger object.
     """
-    if not path.exists(Path(f"{getcwd()}/Logs/")):
-        mkdir(Path(f"{getcwd()}/Logs/"))
-
-    loggingDirectory: str = name
-    logFileName: str = name + "_"
-
-    if includeRequest and True in createdLoggers.values():
+    if includeRequest and True in createdLoggers.values() and not createdLoggers.get(name, False):
         includeRequest = False
 
     if doDb and config is None:
         raise ValueError("Config object must be provided if logging to a database.")
 
-    # Check if the logging directory exists, if not, create it
-    if not path.exists(Path(f"{getcwd()}/Logs/{loggingDirectory}")):
-        mkdir(Path(f"{getcwd()}/Logs/{loggingDirectory}"))
-
     logger: Logger = getLogger(name)  # Sets the logger's name
     logger.setLevel(level)  # Sets the logger's level
 
@@ -73,47 +171,37 @@ def createLogger(
     if handlers is None:
         handlers: list[Handler] = []
 
+    # Additional handlers are owned by the caller, only give them a formatter if they lack one
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(Formatter(formatString))
+
+    # Sinks with a non-default format or colour coding can't be shared with the default ones
+    variant: str = "" if formatString == DEFAULT_FORMAT and colourCoding is None else f":{formatString}:{colourCoding}"
+
     if "file" in config.logging.handlers:
+        handlers.append(getSink(f"file:{name}{variant}", lambda: _createFileSink(name, formatString)))
+
+    if "console" in config.logging.handlers:
         handlers.append(
-            FileHandler(
-                Path(
-                    f"{getcwd()}/Logs/{loggingDirectory}/{logFileName}.log"
-                ),
-                encoding="utf-8",
+            getSink(
+                f"console:{doColour}{variant}",
+                lambda: _createConsoleSink(formatString, doColour, colourCoding)
             )
         )
 
-    if "console" in config.logging.handlers:
-        handlers.append(StreamHandler(stdout))
-
-    if "db" in config.logging.handlers:
-        handler: DatabaseLogHandler = DatabaseLogHandler(config)
-        handler.includeRequest = includeRequest
-        handlers.append(handler)
+    if "db" in config.logging.handlers and doDb:
+        handlers.append(getSink("db", lambda: _createDatabaseSink(config, formatString)))
 
-    colourFormatter: ColourCodedFormatter = ColourCodedFormatter(formatString, colourCoding=colourCoding)
-    formatter: Formatter = Formatter(formatString)
-    requestFormatter: Formatter = Formatter("[%(asctime)s] [Requests] [%(levelname)s] %(message)s")
+    if "json" in config.logging.handlers:
+        handlers.append(getSink("json", lambda: _createJsonSink(config)))
 
     # Add the handlers to the logger
     for handler in handlers:
-        # Only add colour coding to the stream handler
-        if doColour and (not isinstance(handler, DatabaseLogHandler) and not isinstance(handler, FileHandler)):
-            handler.setFormatter(colourFormatter)
-            logger.addHandler(handler)
-            continue
-
-        # If the handler is a database log handler, set the formatter to the request formatter
-        if isinstance(handler, DatabaseLogHandler) and includeRequest:
-            handler.setFormatter(requestFormatter)
-            logger.addHandler(handler)
-            continue
-
-        # Otherwise, set the formatter to the formatter
-        handler.setFormatter(formatter)
         logger.addHandler(handler)
 
     # Add the logger to the createdLoggers dictionary
     createdLoggers[name] = includeRequest
 
-    return SuppressedLoggerAdapter(logger, extra={"loggername": name})
+    # Whether request information is written to the database travels with each record, as the handler is shared
+    return SuppressedLoggerAdapter(logger, extra={"loggername": name, "includeRequest": includeRequest})
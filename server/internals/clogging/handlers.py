@@ -4,10 +4,16 @@ Handlers for the logging system.
 
 # Standard Library Imports
 from asyncio import create_task
+from copy import copy
 from datetime import datetime
-from logging import Handler, LogRecord
-from os import getcwd
+from gzip import open as gzipOpen
+from logging import Filter, Formatter, Handler, LogRecord
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
+from os import getcwd, kill, remove, rename
 from pathlib import Path
+from shutil import copyfileobj
+from time import perf_counter, time
+from typing import Dict
 
 # External Imports
 from flask import Response, g, has_request_context, request
@@ -16,13 +22,316 @@ from psycopg2.extras import Json, RealDictConnection, RealDictCursor
 
 # Local Imports
 from ..config import Config
+from ..metrics import logDrops, logQueueDepth
+from ..timing import getSummary
+
+
+class RequestContextFilter(Filter):
+    """
+    Copies request context onto log records so that it survives being handed to a background thread.
+    """
+
+    def filter(
+            self,
+            record: LogRecord
+    ) -> bool:
+        """
+        Attaches the request uuid and the time elapsed since the request started to the record.
+
+        Args:
+            record (LogRecord): The record to annotate.
+
+        Returns:
+            bool: Always True, records are never filtered out.
+        """
+        if has_request_context() and "uuid" in g:
+            record.requestId = str(g.uuid)
+
+            if "startTime" in g:
+                record.elapsedMs = round((perf_counter() - g.startTime) * 1000, 3)
+
+        return True
+
+
+class MeasuredQueueHandler(QueueHandler):
+    """
+    A queue handler that reports how many records are waiting on the queue.
+    """
+
+    def prepare(
+            self,
+            record: LogRecord
+    ) -> LogRecord:
+        """
+        Prepares a copy of the record for the queue. Unlike QueueHandler.prepare, the traceback is kept out of the
+        message and rendered into exc_text, so formatters on the other side can still write it in its own field.
+
+        Args:
+            record (LogRecord): The record to prepare.
+
+        Returns:
+            LogRecord: The prepared copy.
+        """
+        prepared: LogRecord = copy(record)
+        prepared.message = prepared.msg = record.getMessage()
+        prepared.args = None
+
+        # The traceback holds every frame of the stack alive, so only its text crosses the queue
+        if record.exc_info and not record.exc_text:
+            prepared.exc_text = (self.formatter or Formatter()).formatException(record.exc_info)
+
+        prepared.exc_info = None
+        return prepared
+
+    def enqueue(
+            self,
+            record: LogRecord
+    ) -> None:
+        """
+        Enqueues the record and updates the queue depth metric.
+
+        Args:
+            record (LogRecord): The record to enqueue.
+
+        Returns:
+            None
+        """
+        super().enqueue(record)
+        logQueueDepth.set(self.queue.qsize())
+
+
+class MeasuredQueueListener(QueueListener):
+    """
+    A queue listener that reports how many records are waiting on the queue.
+    """
+
+    def dequeue(
+            self,
+            block: bool
+    ) -> LogRecord:
+        """
+        Dequeues a record and updates the queue depth metric.
+
+        Args:
+            block (bool): Whether to block until a record is available.
+
+        Returns:
+            LogRecord: The dequeued record.
+        """
+        record: LogRecord = super().dequeue(block)
+        logQueueDepth.set(self.queue.qsize())
+        return record
+
+
+class JsonLinesFileHandler(BaseRotatingHandler):
+    """
+    A file handler that writes one record per line and rotates the file by size and by age.
+
+    Rotated segments are renamed with a timestamp suffix and optionally compressed with gzip.
+    """
+
+    def __init__(
+            self,
+            filename: Path | str,
+            maxBytes: int = 0,
+            interval: int = 0,
+            backupCount: int = 0,
+            compress: bool = False
+    ) -> None:
+        """
+        Initializes the handler.
+
+        Args:
+            filename (Path | str): The file to write to.
+            maxBytes (int): The size in bytes after which the file is rotated. 0 disables size rotation.
+            interval (int): The age in seconds after which the file is rotated. 0 disables time rotation.
+            backupCount (int): How many rotated segments to keep. 0 keeps all of them.
+            compress (bool): Whether to gzip rotated segments.
+        """
+        super().__init__(filename, "a", encoding="utf-8", delay=True)
+        self.maxBytes: int = maxBytes
+        self.interval: int = interval
+        self.backupCount: int = backupCount
+        self.rolloverAt: float = time() + interval
+
+        if compress:
+            self.namer = lambda name: f"{name}.gz"
+            self.rotator = self._compress
+
+    @staticmethod
+    def _compress(
+            source: str,
+            destination: str
+    ) -> None:
+        """
+        Compresses a rotated segment.
+
+        Args:
+            source (str): The file that was just closed.
+            destination (str): The file to write the compressed segment to.
+
+        Returns:
+            None
+        """
+        with open(source, "rb") as sourceFile, gzipOpen(destination, "wb") as destinationFile:
+            copyfileobj(sourceFile, destinationFile)
+
+        remove(source)
+
+    def handleError(
+            self,
+            record: LogRecord
+    ) -> None:
+        """
+        Counts the dropped record before handing it to the default error handling.
+
+        Args:
+            record (LogRecord): The record that could not be written.
+
+        Returns:
+            None
+        """
+        logDrops.labels("json").inc()
+        super().handleError(record)
+
+    def shouldRollover(
+            self,
+            record: LogRecord
+    ) -> bool:
+        """
+        Checks whether the file should be rotated before writing the record.
+
+        Args:
+            record (LogRecord): The record about to be written.
+
+        Returns:
+            bool: Whether to rotate.
+        """
+        if self.interval and record.created >= self.rolloverAt:
+            return True
+
+        if not self.maxBytes:
+            return False
+
+        if self.stream is None:
+            self.stream = self._open()
+
+        # The stream position is in bytes, so measure the record the same way
+        return self.stream.tell() + len(self.format(record).encode(self.encoding or "utf-8")) + 1 >= self.maxBytes
+
+    def doRollover(self) -> None:
+        """
+        Rotates the current file and removes segments beyond the backup count.
+
+        Returns:
+            None
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        base: Path = Path(self.baseFilename)
+
+        if base.exists() and base.stat().st_size > 0:
+            destination: str = self.rotation_filename(f"{base}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+            self.rotate(str(base), destination)
+
+        if self.backupCount:
+            segments: list[Path] = sorted(base.parent.glob(f"{base.name}.*"))
+            for segment in segments[:-self.backupCount]:
+                segment.unlink(missing_ok=True)
+
+        self.rolloverAt = time() + self.interval
+
+    def rotate(
+            self,
+            source: str,
+            destination: str
+    ) -> None:
+        """
+        Moves (and possibly compresses) the source file to the destination.
+
+        Args:
+            source (str): The file to rotate.
+            destination (str): The name of the rotated segment.
+
+        Returns:
+            None
+        """
+        if callable(self.rotator):
+            self.rotator(source, destination)
+            return
+
+        rename(source, destination)
+
+    def pruneOrphans(self) -> None:
+        """
+        Cleans up after worker processes that have exited. Their last file is rotated like any other, and only the
+        newest backupCount of their segments are kept between them, so restarts don't leave files behind forever.
+
+        Returns:
+            None
+        """
+        base: Path = Path(self.baseFilename)
+        prefix: str = base.name.split("_", 1)[0]
+        orphans: list[Path] = []
+
+        for path in base.parent.glob(f"{prefix}_*.ndjson*"):
+            pid: str = path.name.removeprefix(f"{prefix}_").split(".", 1)[0]
+
+            if not pid.isdigit() or path.name.startswith(base.name) or _isRunning(int(pid)):
+                continue
+
+            if path.name.endswith(".ndjson"):
+                # Another worker may be rotating the same file, whoever renames it first compresses it
+                destination: str = f"{path}.{datetime.fromtimestamp(path.stat().st_mtime).strftime('%Y%m%d-%H%M%S-%f')}"
+
+                try:
+                    rename(path, destination)
+                except FileNotFoundError:
+                    continue
+
+                if callable(self.rotator):
+                    self.rotator(destination, self.rotation_filename(destination))
+
+                path = Path(self.rotation_filename(destination))
+
+            orphans.append(path)
+
+        if self.backupCount:
+            # Segments are named after when they were rotated, so the suffix orders them across workers
+            orphans.sort(key=lambda segment: segment.name.split(".ndjson.", 1)[-1])
+            for segment in orphans[:-self.backupCount]:
+                segment.unlink(missing_ok=True)
+
+
+def _isRunning(
+        pid: int
+) -> bool:
+    """
+    Checks whether a process is still running.
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        bool: Whether the process exists.
+    """
+    try:
+        kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # It exists, but belongs to another user
+
+    return True
 
 
 class DatabaseLogHandler(Handler):
     """
     A handler that logs all information to a sqlite database and periodically removes logs older than one week.
     """
-    __slots__ = ("file", "connection", "includeRequest")
+    __slots__ = ("connection",)
 
     def __init__(
             self,
@@ -44,9 +353,6 @@ class DatabaseLogHandler(Handler):
             connection_factory=RealDictConnection
         )
 
-        # Set includeRequest to False by default
-        self.includeRequest: bool = False
-
     def __del__(self):
         """
         This method is called when the object is deleted.
@@ -91,23 +397,46 @@ class DatabaseLogHandler(Handler):
             None
         """
 
-        # Create a cursor for the whole function
-        cursor: RealDictCursor = self.connection.cursor(cursor_factory=RealDictCursor)
+        try:
+            # Create a cursor for the whole function
+            cursor: RealDictCursor = self.connection.cursor(cursor_factory=RealDictCursor)
 
-        # Add the record to the database and get the id
-        recordId: str = self._logRecord(cursor, record)  # Why is this not being executed when request context is present
+            # Add the record to the database and get the id
+            recordId: str = self._logRecord(cursor, record)  # Why is this not being executed when request context is present
 
-        if not has_request_context() or not self.includeRequest:
-            return
+            # The handler is shared between loggers, so only records from the request logger carry this flag
+            if not has_request_context() or not getattr(record, "includeRequest", False):
+                self.connection.commit()
+                return
 
-        # Check what state the request is in
-        if not g.completed:
-            self._logRequest(cursor, recordId)
+            # Check what state the request is in
+            if not g.completed:
+                self._logRequest(cursor, recordId)
 
-        else:
-            self._logResponse(cursor, g.response)
+            else:
+                self._logResponse(cursor, g.response)
 
-        self.connection.commit()
+            self.connection.commit()
+
+        except Exception:  # A logging failure must never fail the request that logged it
+            self.connection.rollback()
+            self.handleError(record)
+
+    def handleError(
+            self,
+            record: LogRecord
+    ) -> None:
+        """
+        Counts the dropped record before handing it to the default error handling.
+
+        Args:
+            record (LogRecord): The record that could not be written.
+
+        Returns:
+            None
+        """
+        logDrops.labels("db").inc()
+        super().handleError(record)
 
     @staticmethod
     def _logRecord(
@@ -151,7 +480,7 @@ class DatabaseLogHandler(Handler):
                 record.filename,
                 record.funcName,
                 record.lineno,
-                record.msg,
+                record.getMessage(),
                 record.module,
                 record.name,
                 record.pathname,
@@ -254,6 +583,8 @@ class DatabaseLogHandler(Handler):
         Returns:
             None
         """
+        timings: Dict[str, float | int | None] = getSummary()
+
         DatabaseLogHandler._execute(
             cursor,
             """
@@ -264,9 +595,16 @@ class DatabaseLogHandler(Handler):
                 status, 
                 status_code, 
                 headers, 
-                response
+                response,
+                total_ms,
+                upstream_ms,
+                upstream_calls,
+                cache_hits,
+                cache_misses,
+                validate_ms,
+                render_ms
             ) VALUES  (
-                %s, %s, %s, %s, %s, %s, %s
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
             );
             """,
             (
@@ -276,7 +614,14 @@ class DatabaseLogHandler(Handler):
                 response.status if response.status is not None else None,
                 response.status_code if response.status_code is not None else None,
                 response.headers.__str__() if response.headers is not None else None,
-                response.response.__str__() if response.response is not None else None
+                response.response.__str__() if response.response is not None else None,
+                timings["totalMs"],
+                timings["upstreamMs"],
+                timings["upstreamCalls"],
+                timings["cacheHits"],
+                timings["cacheMisses"],
+                timings["validateMs"],
+                timings["renderMs"]
             )
         )
 
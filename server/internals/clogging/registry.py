@@ -0,0 +1,89 @@
+"""
+Process-wide registry of logging sinks.
+
+Handlers such as the console stream, log files, the database connection and the json queue listener are created once
+per process and shared by every logger that asks for them by name.
+"""
+
+# Standard Library Imports
+from atexit import register as atexitRegister
+from logging import Handler
+from logging.handlers import QueueHandler
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Set
+
+# Constants
+sinksLock: Lock = Lock()
+
+# Shared handlers, keyed by sink name
+sinks: Dict[str, Handler] = {}
+
+# Directories that are known to exist, so the filesystem is only checked once per directory
+createdDirectories: Set[Path] = set()
+
+
+def ensureDirectory(
+        directory: Path
+) -> Path:
+    """
+    Creates a directory (and its parents) if it has not already been created by this process.
+
+    Args:
+        directory (Path): The directory to create.
+
+    Returns:
+        Path: The directory.
+    """
+    if directory not in createdDirectories:
+        directory.mkdir(parents=True, exist_ok=True)
+        createdDirectories.add(directory)
+
+    return directory
+
+
+def getSink(
+        name: str,
+        factory: Callable[[], Handler]
+) -> Handler:
+    """
+    Gets a shared handler by name, creating it with the factory on first use.
+
+    Args:
+        name (str): The name of the sink.
+        factory (Callable[[], Handler]): Creates the handler if it does not exist yet.
+
+    Returns:
+        Handler: The shared handler.
+    """
+    # Fast path, does not need the lock
+    sink: Handler | None = sinks.get(name)
+    if sink is not None:
+        return sink
+
+    with sinksLock:
+        if name not in sinks:
+            sinks[name] = factory()
+
+        return sinks[name]
+
+
+def closeSinks() -> None:
+    """
+    Stops any queue listeners and closes every registered handler. Registered to run at interpreter exit.
+
+    Returns:
+        None
+    """
+    with sinksLock:
+        for sink in sinks.values():
+            # Stopping the listener flushes anything still queued
+            if isinstance(sink, QueueHandler) and getattr(sink, "listener", None) is not None:
+                sink.listener.stop()
+
+            sink.close()
+
+        sinks.clear()
+
+
+atexitRegister(closeSinks)
@@ -56,16 +56,33 @@ CREATE TABLE IF NOT EXISTS ia3.requests
 
 CREATE TABLE IF NOT EXISTS ia3.responses
 (
-    id          uuid NOT NULL PRIMARY KEY DEFAULT ia3.uuid_generate_v4(),
-    request_id  uuid NOT NULL,
-    expires     TIMESTAMP,
-    location    TEXT,
-    status      TEXT,
-    status_code INT,
-    headers     TEXT,
-    response    TEXT
+    id             uuid NOT NULL PRIMARY KEY DEFAULT ia3.uuid_generate_v4(),
+    request_id     uuid NOT NULL,
+    expires        TIMESTAMP,
+    location       TEXT,
+    status         TEXT,
+    status_code    INT,
+    headers        TEXT,
+    response       TEXT,
+    total_ms       DOUBLE PRECISION,
+    upstream_ms    DOUBLE PRECISION,
+    upstream_calls INT,
+    cache_hits     INT,
+    cache_misses   INT,
+    validate_ms    DOUBLE PRECISION,
+    render_ms      DOUBLE PRECISION
 );
 
+/* Add latency breakdown columns to responses tables created before they existed */
+ALTER TABLE ia3.responses
+    ADD COLUMN IF NOT EXISTS total_ms       DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS upstream_ms    DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS upstream_calls INT,
+    ADD COLUMN IF NOT EXISTS cache_hits     INT,
+    ADD COLUMN IF NOT EXISTS cache_misses   INT,
+    ADD COLUMN IF NOT EXISTS validate_ms    DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS render_ms      DOUBLE PRECISION;
+
 /* Create indexes that don't exist */
 CREATE INDEX IF NOT EXISTS program_logs_timestamp ON ia3.program_logs (timestamp);
 CREATE INDEX IF NOT EXISTS program_logs_level ON ia3.program_logs (level);
@@ -95,6 +112,7 @@ GRANT ALL ON ALL TABLES IN SCHEMA ia3 TO loghandler;
 DROP VIEW IF EXISTS ia3.web_logs;
 DROP VIEW IF EXISTS ia3.simple_requests;
 DROP VIEW IF EXISTS ia3.simple_responses;
+DROP VIEW IF EXISTS ia3.endpoint_latency;
 
 /* View joins program_logs, requests, and responses. More columns will be manually added */
 CREATE VIEW ia3.web_logs(timestamp, method, remote_addr, path, status) AS
@@ -145,3 +163,26 @@ ALTER TABLE ia3.simple_responses
     OWNER TO loghandler;
 
 
+CREATE VIEW ia3.endpoint_latency(endpoint, requests, p50_ms, p95_ms, p99_ms, upstream_p50_ms, upstream_p95_ms,
+                                 validate_p50_ms, render_p50_ms, cache_hit_ratio) AS
+SELECT requests.endpoint,
+       COUNT(*),
+       PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY responses.total_ms),
+       PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY responses.total_ms),
+       PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY responses.total_ms),
+       PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY responses.upstream_ms),
+       PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY responses.upstream_ms),
+       PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY responses.validate_ms),
+       PERCENTILE_CONT(0.50) WITHIN GROUP (ORDER BY responses.render_ms),
+       SUM(responses.cache_hits)::DOUBLE PRECISION /
+       NULLIF(SUM(responses.cache_hits) + SUM(responses.cache_misses), 0)
+FROM ia3.requests
+         JOIN
+     ia3.responses ON requests.id = responses.request_id
+WHERE responses.total_ms IS NOT NULL
+GROUP BY requests.endpoint;
+
+COMMENT ON VIEW ia3.endpoint_latency IS 'Used to compare latency percentiles between endpoints.';
+
+ALTER TABLE ia3.endpoint_latency
+    OWNER TO loghandler;
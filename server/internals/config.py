@@ -33,6 +33,12 @@ class Config:
         self.server = self.Server()
         self.logging = self.Logging()
         self.api = self.Api()
+        self.profiling = self.Profiling()
+        self.tracing = self.Tracing()
+        self.metrics = self.Metrics()
+        self.catalog = self.Catalog()
+        self.taxonomy = self.Taxonomy()
+        self.entities = self.Entities()
 
     class Server:
         """
@@ -45,7 +51,8 @@ class Config:
             "secretKey",
             "theme",
             "owner",
-            "recaptcha"
+            "recaptcha",
+            "serverTiming"
         ]
 
         def __init__(self) -> None:
@@ -57,6 +64,7 @@ class Config:
             self.debug: bool = settings.server.debug
             self.secretKey: str = settings.server.secretKey if settings.server.secretKey != "auto" else tokenUrlsafe(32)
             self.theme: str = settings.server.theme
+            self.serverTiming: bool = settings.get("server.serverTiming", False)  # Exposes latency in a response header
 
             self.owner = self.Owner()
             self.recaptcha = self.Recaptcha()
@@ -100,7 +108,8 @@ class Config:
         __slots__ = [
             "handlers",
             "level",
-            "db"
+            "db",
+            "json"
         ]
 
         def __init__(self) -> None:
@@ -126,6 +135,10 @@ class Config:
             if "db" in self.handlers:
                 self.db = self.Db()
 
+            # Only initialize the json object if the json handler is in the handlers list
+            if "json" in self.handlers:
+                self.json = self.Json()
+
         class Db:
             """
             Contains logging database related config data.
@@ -148,6 +161,26 @@ class Config:
                 self.user: str = settings.logging.db.user
                 self.password: str = settings.logging.db.password
 
+        class Json:
+            """
+            Contains json-lines file sink related config data.
+            """
+            __slots__ = [
+                "maxBytes",
+                "interval",
+                "backupCount",
+                "compress"
+            ]
+
+            def __init__(self) -> None:
+                """
+                Initializes the json object.
+                """
+                self.maxBytes: int = settings.get("logging.json.maxBytes", 10 * 1024 * 1024)  # Rotate after 10MiB
+                self.interval: int = settings.get("logging.json.interval", 24 * 60 * 60)  # Rotate every day (seconds)
+                self.backupCount: int = settings.get("logging.json.backupCount", 14)
+                self.compress: bool = settings.get("logging.json.compress", True)
+
     class Api:
         """
         Contains API related config data.
@@ -156,6 +189,14 @@ class Config:
             "key",
             "base",
             "cacheExpiry",
+            "timeout",
+            "pageSize",
+            "rateLimit",
+            "rateBurst",
+            "batchLimit",
+            "batchWorkers",
+            "exportLimit",
+            "maxAliases"
         ]
 
         def __init__(self) -> None:
@@ -165,3 +206,162 @@ class Config:
             self.key: str = settings.api.key
             self.base: str = settings.api.base
             self.cacheExpiry: int = settings.api.cacheExpiry
+            self.timeout: float = settings.get("api.timeout", 30)  # Seconds before an upstream request is given up on
+            self.pageSize: int = settings.get("api.pageSize", 40)  # Size of the pages fetched for smaller ones, 0 to disable
+            self.rateLimit: float = settings.get("api.rateLimit", 0)  # Upstream requests a second, 0 for no limit
+            self.rateBurst: int = settings.get("api.rateBurst", 5)  # Upstream requests allowed at once under the limit
+            self.batchLimit: int = settings.get("api.batchLimit", 50)  # Most sub-requests in one /api/batch request
+            self.batchWorkers: int = settings.get("api.batchWorkers", 8)  # Sub-requests of a batch run at once
+            self.exportLimit: int = settings.get("api.exportLimit", 4000)  # Most games an export reads from RAWG
+            self.maxAliases: int = settings.get("api.maxAliases", 20000)  # Slugs whose ids are remembered, a few MB
+
+    class Profiling:
+        """
+        Contains request profiling related config data.
+        """
+        __slots__ = [
+            "enabled",
+            "secret",
+            "sampleRate",
+            "thresholdMs",
+            "interval",
+            "directory",
+            "continuous",
+            "continuousInterval",
+            "flushMinutes",
+            "maxOverhead",
+            "keepFlamegraphs"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the profiling object.
+            """
+            self.enabled: bool = settings.get("profiling.enabled", False)
+            self.secret: str | None = settings.get("profiling.secret", None)  # Signs the X-Profile header
+            self.sampleRate: float = settings.get("profiling.sampleRate", 0.0)  # Fraction of requests to profile
+            self.thresholdMs: int = settings.get("profiling.thresholdMs", 0)  # Sample requests slower than this, 0 disables
+            self.interval: float = settings.get("profiling.interval", 0.005)  # Seconds between stack samples
+            self.directory: str = settings.get("profiling.directory", "Logs/profiles")
+
+            # Continuous sampling profiler
+            self.continuous: bool = settings.get("profiling.continuous", False)
+            self.continuousInterval: float = settings.get("profiling.continuousInterval", 0.05)  # 20 samples a second
+            self.flushMinutes: float = settings.get("profiling.flushMinutes", 10)
+            self.maxOverhead: float = settings.get("profiling.maxOverhead", 0.01)  # Fraction of wall time
+            self.keepFlamegraphs: int = settings.get("profiling.keepFlamegraphs", 144)  # A day at the default flush rate
+
+    class Tracing:
+        """
+        Contains tracing related config data.
+        """
+        __slots__ = [
+            "enabled",
+            "directory"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the tracing object.
+            """
+            self.enabled: bool = settings.get("tracing.enabled", False)
+            self.directory: str = settings.get("tracing.directory", "Logs/traces")
+
+    class Metrics:
+        """
+        Contains metrics related config data.
+        """
+        __slots__ = [
+            "allowedAddresses",
+            "token"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the metrics object.
+            """
+            self.allowedAddresses: list[str] = settings.get("metrics.allowedAddresses", ["127.0.0.1", "::1"])  # Addresses or networks
+            self.token: str | None = settings.get("metrics.token", None)  # Bearer token that is allowed from any address
+
+    class Catalog:
+        """
+        Contains catalog mirror related config data.
+        """
+        __slots__ = [
+            "enabled",
+            "path",
+            "sync",
+            "syncInterval",
+            "pagesPerRun",
+            "pageLimit",
+            "maxStaleness",
+            "searchMinResults",
+            "fuzzySearch",
+            "indexInterval",
+            "scoreInterval",
+            "trendingHalfLife",
+            "trendingDays",
+            "ratingPrior"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the catalog object.
+            """
+            self.enabled: bool = settings.get("catalog.enabled", False)
+            self.path: str = settings.get("catalog.path", "Data/catalog.sqlite3")
+            self.sync: bool = settings.get("catalog.sync", True)  # Whether this server runs the background sync
+            self.syncInterval: float = settings.get("catalog.syncInterval", 60)  # Minutes between syncs
+            self.pagesPerRun: int = settings.get("catalog.pagesPerRun", 100)  # Pages of the full crawl fetched per sync
+            self.pageLimit: int = settings.get("catalog.pageLimit", 0)  # Stop the full crawl after this page, 0 crawls everything
+            self.maxStaleness: float = settings.get("catalog.maxStaleness", 24)  # Hours without a sync before the mirror is ignored
+            self.searchMinResults: int = settings.get("catalog.searchMinResults", 1)  # Fewer local matches falls back to RAWG
+            self.fuzzySearch: bool = settings.get("catalog.fuzzySearch", False)  # Typo tolerant searches from a trigram index
+            self.indexInterval: float = settings.get("catalog.indexInterval", 300)  # Seconds between checks for a changed mirror
+            self.scoreInterval: float = settings.get("catalog.scoreInterval", 60)  # Minutes between rescoring the trending, popular and rated lists
+            self.trendingHalfLife: float = settings.get("catalog.trendingHalfLife", 7)  # Days for a day's added count to count half as much
+            self.trendingDays: int = settings.get("catalog.trendingDays", 30)  # Days of added counts kept for trending
+            self.ratingPrior: float = settings.get("catalog.ratingPrior", 20)  # Ratings a game needs before its own rating outweighs the mean
+
+    class Taxonomy:
+        """
+        Contains reference data (genres, platforms, stores and so on) related config data.
+        """
+        __slots__ = [
+            "enabled",
+            "path",
+            "sets",
+            "refreshInterval",
+            "retryInterval"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the taxonomy object.
+            """
+            self.enabled: bool = settings.get("taxonomy.enabled", True)
+            self.path: str = settings.get("taxonomy.path", "Data/taxonomy")  # Where the loaded sets are shared between workers
+            self.sets: list[str] = settings.get(  # Developers and publishers number in the hundreds of thousands
+                "taxonomy.sets",
+                ["genres", "platforms", "parent_platforms", "stores", "tags"]
+            )
+            self.refreshInterval: float = settings.get("taxonomy.refreshInterval", 24)  # Hours between reloads
+            self.retryInterval: float = settings.get("taxonomy.retryInterval", 5)  # Minutes before retrying a failed load
+
+    class Entities:
+        """
+        Contains entity store related config data.
+        """
+        __slots__ = [
+            "enabled",
+            "maxAge",
+            "maxEntries"
+        ]
+
+        def __init__(self) -> None:
+            """
+            Initializes the entities object.
+            """
+            self.enabled: bool = settings.get("entities.enabled", True)
+            self.maxAge: float = settings.get("entities.maxAge", 3600)  # Seconds a field is trusted without a fetch
+            self.maxEntries: int = settings.get("entities.maxEntries", 5000)  # Least recently used are dropped past this, tens of MB
@@ -3,8 +3,10 @@ Contains miscellaneous helper functions.
 """
 
 # Standard Library Imports
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from datetime import datetime
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator
 
 # Third Party Imports
 from flask import render_template as flaskRenderTemplate
@@ -13,8 +15,22 @@ from pydantic import BaseModel
 # Internal Imports
 from .config import Config
 
+if TYPE_CHECKING:
+    from .wrapper.taxonomy import Taxonomy
+
 # Constants
 config: Config = Config()
+PAGE_SIZE: int = 40  # The largest page size RAWG allows
+TAXONOMY_PARAMETERS: Dict[str, str] = {  # The taxonomy set the values of each list parameter belong to
+    "genres": "genres",
+    "platforms": "platforms",
+    "parent_platforms": "parent_platforms",
+    "stores": "stores",
+    "exclude_stores": "stores",
+    "tags": "tags",
+    "developers": "developers",
+    "publishers": "publishers"
+}
 
 
 def convertIfNeeded(
@@ -41,9 +57,53 @@ def convertIfNeeded(
     return None
 
 
+def prefetchPages(
+        fetch: Callable[[int], Any],
+        isLast: Callable[[Any], bool],
+        page: int = 1,
+        limit: int | None = None
+) -> Iterator[Any]:
+    """
+    Yields consecutive pages, fetching each next page on a background thread while the current one is being consumed.
+    At most two pages are held at once, and nothing is fetched past the last page or the limit.
+
+    Args:
+        fetch (Callable[[int], Any]): Gets a page by its number. It runs in a copy of the caller's context, so request
+            timings and traces still include it.
+        isLast (Callable[[Any], bool]): Whether a page is the last one.
+        page (int): The first page number.
+        limit (int | None): The most pages to fetch, if any.
+
+    Returns:
+        Iterator[Any]: The pages.
+    """
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Prefetch")
+
+    try:
+        pending: Future = executor.submit(copy_context().run, fetch, page)
+        fetched: int = 1
+
+        while True:
+            data: Any = pending.result()
+
+            if isLast(data) or (limit is not None and fetched >= limit):
+                yield data
+                return
+
+            page += 1
+            fetched += 1
+            pending = executor.submit(copy_context().run, fetch, page)
+
+            yield data
+    finally:
+        # A page still being fetched when the caller stops is left to finish, and is cached
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def addParameters(
         base: Dict[str, Any],
-        parameters: Dict[str, Any | None]
+        parameters: Dict[str, Any | None],
+        taxonomy: "Taxonomy | None" = None
 ) -> Dict[str, Any]:
     """
     Adds parameters to a base dictionary.
@@ -51,6 +111,8 @@ def addParameters(
     Args:
         base (Dict[str, Any]): The base dictionary.
         parameters (Dict[str, Any | None]): The parameters to add.
+        taxonomy (Taxonomy | None): Used to resolve the slugs in list parameters to ids, so the same query is always
+            sent (and cached) the same way.
 
     Returns:
         Dict[str, Any]: The base dictionary with the parameters added.
@@ -62,7 +124,12 @@ def addParameters(
 
         # If the value is a list, join it with commas.
         if isinstance(value, list):
-            value = ",".join(convertIfNeeded(item) for item in value)
+            items: list = [convertIfNeeded(item) for item in value]
+
+            if taxonomy is not None and key in TAXONOMY_PARAMETERS:
+                items = [taxonomy.resolve(TAXONOMY_PARAMETERS[key], item) for item in items]
+
+            value = ",".join(str(item) for item in items)
 
         base[key] = convertIfNeeded(value)
 
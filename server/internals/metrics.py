@@ -0,0 +1,157 @@
+"""
+Contains the Prometheus metrics for the server.
+
+When running under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory before the server starts (start.sh
+does this) so that every worker writes its samples there and /metrics reports the totals across all workers.
+
+/metrics is only served to the addresses in metrics.allowedAddresses, or to requests carrying metrics.token.
+"""
+
+# Standard Library Imports
+from hmac import compare_digest as compareDigest
+from ipaddress import IPv4Address, IPv6Address, ip_address as ipAddress, ip_network as ipNetwork
+from os import environ
+from re import compile
+
+# Third Party Imports
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Constants
+CONTENT_TYPE: str = CONTENT_TYPE_LATEST
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+numericSegment = compile(r"^\d+$")  # Pre-compile the regex used to collapse ids in endpoint labels
+
+# Requester cache
+requesterCacheEvents: Counter = Counter(
+    "ia3_requester_cache_events_total",
+    "Requester cache lookups and evictions.",
+    ["event"]  # hit, miss, coalesced (waited for an identical request in flight) or eviction
+)
+requesterCacheBytes: Gauge = Gauge(
+    "ia3_requester_cache_bytes",
+    "Size of the RAWG response bodies held in the Requester cache.",
+    multiprocess_mode="livesum"
+)
+
+# Upstream (RAWG) requests
+upstreamLatency: Histogram = Histogram(
+    "ia3_upstream_latency_seconds",
+    "Latency of requests to the RAWG API, including JSON decoding.",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS
+)
+upstreamInFlight: Gauge = Gauge(
+    "ia3_upstream_in_flight",
+    "Requests to the RAWG API that have not completed yet.",
+    multiprocess_mode="livesum"
+)
+
+# Catalog mirror
+catalogQueries: Counter = Counter(
+    "ia3_catalog_queries_total",
+    "Catalog mirror lookups, by whether the mirror could answer them.",
+    ["kind", "result"]  # kind is list, details, ranked or similar, result is hit or miss
+)
+
+# Routes and templates
+routeLatency: Histogram = Histogram(
+    "ia3_route_latency_seconds",
+    "Time taken to handle a request, by flask endpoint.",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS
+)
+renderLatency: Histogram = Histogram(
+    "ia3_render_latency_seconds",
+    "Time taken to render a template.",
+    ["template"],
+    buckets=LATENCY_BUCKETS
+)
+
+# Logging
+logQueueDepth: Gauge = Gauge(
+    "ia3_log_queue_depth",
+    "Records waiting to be written by the background log writer.",
+    multiprocess_mode="livesum"
+)
+logDrops: Counter = Counter(
+    "ia3_log_dropped_records_total",
+    "Log records that a handler failed to write.",
+    ["handler"]
+)
+
+
+def upstreamEndpoint(
+        url: str,
+        base: str
+) -> str:
+    """
+    Converts a RAWG url into a low-cardinality endpoint label, for example games/3498/screenshots becomes
+    games/{id}/screenshots.
+
+    Args:
+        url (str): The url that was requested.
+        base (str): The base url of the API.
+
+    Returns:
+        str: The endpoint label.
+    """
+    path: str = url.removeprefix(base).split("?", 1)[0].strip("/")
+    segments: list[str] = path.split("/")
+
+    # The second segment is an id or slug for every endpoint other than platforms/lists/parents
+    if len(segments) >= 2 and segments[1] != "lists":
+        segments[1] = "{id}"
+
+    return "/".join(numericSegment.sub("{id}", segment) for segment in segments)
+
+
+def generateLatest() -> bytes:
+    """
+    Renders every metric in the Prometheus text format, aggregated across workers when running in multiprocess mode.
+
+    Returns:
+        bytes: The rendered metrics.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in environ:
+        return generate_latest(REGISTRY)
+
+    registry: CollectorRegistry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def isScraperAllowed(
+        address: str | None,
+        authorization: str | None,
+        allowedAddresses: list[str],
+        token: str | None
+) -> bool:
+    """
+    Checks whether a request may read the metrics.
+
+    Args:
+        address (str | None): The address of the client.
+        authorization (str | None): The Authorization header of the request, if any.
+        allowedAddresses (list[str]): The addresses or networks that may read the metrics without a token.
+        token (str | None): The bearer token that may read the metrics from any address, if any.
+
+    Returns:
+        bool: Whether the request is allowed.
+    """
+    if token and authorization and compareDigest(authorization.encode(), f"Bearer {token}".encode()):
+        return True
+
+    try:
+        client: IPv4Address | IPv6Address = ipAddress(address or "")
+    except ValueError:
+        return False
+
+    for allowed in allowedAddresses:
+        try:
+            if client in ipNetwork(allowed, strict=False):
+                return True
+        except ValueError:
+            continue  # A malformed entry allows nothing
+
+    return False
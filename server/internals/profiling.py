@@ -0,0 +1,570 @@
+"""
+Contains the per-request profiling hook and the continuous sampling profiler.
+
+A request is profiled when any of the following is true:
+    - It carries a valid X-Profile header, signed with the configured secret (see signProfileHeader).
+    - It is picked by the configured sampling rate.
+    - It runs for longer than the configured latency threshold.
+
+Explicitly triggered requests (header or sampling) run under cProfile and write a .pstats file. Every profiled request
+is also watched by a stack sampler thread, which writes a collapsed-stack file that flamegraph tools can read. Requests
+that are only profiled because of the threshold are never run under cProfile, the sampler only starts looking at them
+once they pass the threshold, so fast requests pay almost nothing.
+
+Separately, the continuous sampler (profiling.continuous) samples every request thread for the life of the worker and
+writes a rolling set of collapsed-stack files to Logs/profiles/flamegraphs, showing steady-state hot spots.
+"""
+
+# Standard Library Imports
+from atexit import register as atexitRegister
+from collections import Counter
+from cProfile import Profile
+from datetime import datetime
+from hashlib import sha256
+from hmac import compare_digest, new as hmacNew
+from os import getpid, path
+from pathlib import Path
+from random import random
+from sys import _current_frames
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter, time
+from types import FrameType
+from typing import Dict, List
+
+# Third Party Imports
+from flask import Response, g, request
+
+# Local Imports
+from .clogging import SuppressedLoggerAdapter, createLogger
+from .clogging.registry import ensureDirectory
+from .config import Config
+
+# Constants
+PROFILE_HEADER: str = "X-Profile"
+
+
+def signProfileHeader(
+        secret: str,
+        path: str,
+        ttl: int = 300
+) -> str:
+    """
+    Creates a value for the X-Profile header that triggers profiling of a request to the given path.
+
+    Args:
+        secret (str): The profiling secret from the config.
+        path (str): The path of the request to profile, for example: /games/portal-2.
+        ttl (int): How many seconds the signature stays valid for.
+
+    Returns:
+        str: The header value, in the form <expires>.<signature>.
+    """
+    expires: int = int(time()) + ttl
+    signature: str = hmacNew(secret.encode(), f"{expires}:{path}".encode(), sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+
+def collapseStack(
+        frame: FrameType | None
+) -> str:
+    """
+    Collapses a stack into a single line, outermost frame first, separated by semicolons.
+
+    Args:
+        frame (FrameType | None): The innermost frame of the stack.
+
+    Returns:
+        str: The collapsed stack.
+    """
+    names: List[str] = []
+
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+
+    return ";".join(reversed(names))
+
+
+class ActiveRequest:
+    """
+    Represents a request that is being watched by the stack sampler.
+    """
+    __slots__ = ("uuid", "start", "sampleAfter", "stacks")
+
+    def __init__(
+            self,
+            uuid: str,
+            start: float,
+            sampleAfter: float
+    ) -> None:
+        """
+        Initializes the ActiveRequest.
+
+        Args:
+            uuid (str): The uuid of the request.
+            start (float): The perf_counter value at the start of the request.
+            sampleAfter (float): Seconds after the start of the request before samples are taken.
+        """
+        self.uuid: str = uuid
+        self.start: float = start
+        self.sampleAfter: float = sampleAfter
+        self.stacks: Counter = Counter()
+
+
+class StackSampler(Thread):
+    """
+    A background thread that periodically samples the stacks of the request threads it has been told to watch.
+    """
+
+    def __init__(
+            self,
+            interval: float
+    ) -> None:
+        """
+        Initializes the StackSampler.
+
+        Args:
+            interval (float): Seconds between samples.
+        """
+        super().__init__(name="StackSampler", daemon=True)
+        self.interval: float = interval
+        self.active: Dict[int, ActiveRequest] = {}
+        self.lock: Lock = Lock()
+        self.stopped: Event = Event()
+
+    def watch(
+            self,
+            threadId: int,
+            activeRequest: ActiveRequest
+    ) -> None:
+        """
+        Starts watching a request thread.
+
+        Args:
+            threadId (int): The id of the thread handling the request.
+            activeRequest (ActiveRequest): The request being handled.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.active[threadId] = activeRequest
+
+    def unwatch(
+            self,
+            threadId: int
+    ) -> ActiveRequest | None:
+        """
+        Stops watching a request thread.
+
+        Args:
+            threadId (int): The id of the thread handling the request.
+
+        Returns:
+            ActiveRequest | None: The request that was being watched, with its samples.
+        """
+        with self.lock:
+            return self.active.pop(threadId, None)
+
+    def run(self) -> None:
+        """
+        Samples the watched threads until stopped.
+
+        Returns:
+            None
+        """
+        while not self.stopped.wait(self.interval):
+            if not self.active:
+                continue
+
+            now: float = perf_counter()
+            frames: Dict[int, FrameType] = _current_frames()
+
+            with self.lock:
+                for threadId, activeRequest in self.active.items():
+                    if now - activeRequest.start < activeRequest.sampleAfter or threadId not in frames:
+                        continue
+
+                    activeRequest.stacks[collapseStack(frames[threadId])] += 1
+
+            del frames  # Don't keep the sampled frames (and everything they reference) alive until the next sample
+
+    def stop(self) -> None:
+        """
+        Stops the sampler.
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+
+
+class ContinuousSampler(Thread):
+    """
+    A background thread that samples every request thread for the life of the worker and periodically writes the
+    aggregated stacks to a rolling set of collapsed-stack (flamegraph-ready) files.
+
+    The time spent sampling is measured, and the interval is backed off whenever it would exceed the overhead budget.
+    """
+
+    def __init__(
+            self,
+            directory: Path,
+            interval: float,
+            flushMinutes: float,
+            maxOverhead: float,
+            keep: int,
+            logger: SuppressedLoggerAdapter
+    ) -> None:
+        """
+        Initializes the ContinuousSampler.
+
+        Args:
+            directory (Path): The directory to write the flamegraph files to.
+            interval (float): The preferred number of seconds between samples.
+            flushMinutes (float): Minutes between flamegraph files.
+            maxOverhead (float): The largest fraction of wall time the sampler may spend sampling, for example 0.01.
+            keep (int): How many flamegraph files to keep.
+            logger (SuppressedLoggerAdapter): The logger to use.
+        """
+        super().__init__(name="ContinuousSampler", daemon=True)
+        self.directory: Path = directory
+        self.baseInterval: float = interval
+        self.interval: float = interval
+        self.flushInterval: float = flushMinutes * 60
+        self.maxOverhead: float = maxOverhead
+        self.keep: int = keep
+        self.logger: SuppressedLoggerAdapter = logger
+        self.requestThreads: set[int] = set()
+        self.stacks: Counter = Counter()
+        self.stopped: Event = Event()
+
+        # Overhead accounting for the current flush window
+        self.windowStart: float = perf_counter()
+        self.sampleTime: float = 0.0
+        self.samples: int = 0
+
+    def add(
+            self,
+            threadId: int
+    ) -> None:
+        """
+        Marks a thread as handling a request.
+
+        Args:
+            threadId (int): The id of the thread.
+
+        Returns:
+            None
+        """
+        self.requestThreads.add(threadId)
+
+    def remove(
+            self,
+            threadId: int
+    ) -> None:
+        """
+        Marks a thread as no longer handling a request.
+
+        Args:
+            threadId (int): The id of the thread.
+
+        Returns:
+            None
+        """
+        self.requestThreads.discard(threadId)
+
+    def _sample(self) -> None:
+        """
+        Takes one sample of every request thread.
+
+        Returns:
+            None
+        """
+        frames: Dict[int, FrameType] = _current_frames()
+
+        for threadId in tuple(self.requestThreads):  # Copied, request threads come and go while this runs
+            if threadId in frames:
+                self.stacks[collapseStack(frames[threadId])] += 1
+
+        del frames  # Don't keep the sampled frames (and everything they reference) alive until the next sample
+
+    def _adjustInterval(
+            self,
+            elapsed: float
+    ) -> None:
+        """
+        Keeps the sampling overhead within budget by backing the interval off (or easing it back towards the
+        configured interval once there is headroom again).
+
+        Args:
+            elapsed (float): How long the last sample took, in seconds.
+
+        Returns:
+            None
+        """
+        overhead: float = elapsed / (self.interval + elapsed)
+
+        if overhead > self.maxOverhead:
+            self.interval = min(self.interval * 2, 60.0)
+
+        elif overhead < self.maxOverhead / 4 and self.interval > self.baseInterval:
+            self.interval = max(self.interval / 2, self.baseInterval)
+
+    def flush(self) -> None:
+        """
+        Writes the stacks collected since the last flush to a new file and removes files beyond the keep count.
+
+        Returns:
+            None
+        """
+        stacks, self.stacks = self.stacks, Counter()
+        window: float = perf_counter() - self.windowStart
+        overhead: float = self.sampleTime / window if window else 0.0
+
+        if stacks:
+            filePath: Path = self.directory / f"{getpid()}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.collapsed"
+            with open(filePath, "w", encoding="utf-8") as collapsedFile:
+                collapsedFile.writelines(f"{stack} {count}\n" for stack, count in stacks.items())
+
+            files: List[Path] = sorted(self.directory.glob(f"{getpid()}_*.collapsed"))
+            for oldFile in files[:-self.keep]:
+                oldFile.unlink(missing_ok=True)
+
+        self.logger.info(
+            "Continuous sampler took %s samples over %.0fs (%.3f%% overhead, interval %.3fs)",
+            self.samples,
+            window,
+            overhead * 100,
+            self.interval
+        )
+
+        self.windowStart = perf_counter()
+        self.sampleTime = 0.0
+        self.samples = 0
+
+    def run(self) -> None:
+        """
+        Samples the request threads until stopped, flushing on schedule.
+
+        Returns:
+            None
+        """
+        nextFlush: float = perf_counter() + self.flushInterval
+
+        while not self.stopped.wait(self.interval):
+            if self.requestThreads:
+                start: float = perf_counter()
+                self._sample()
+                elapsed: float = perf_counter() - start
+
+                self.sampleTime += elapsed
+                self.samples += 1
+                self._adjustInterval(elapsed)
+
+            if perf_counter() >= nextFlush:
+                self.flush()
+                nextFlush = perf_counter() + self.flushInterval
+
+    def stop(self) -> None:
+        """
+        Stops the sampler and writes anything collected since the last flush.
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+        self.flush()
+
+
+class RequestProfiler:
+    """
+    Decides whether to profile each request and writes the profiles to disk.
+    """
+    __slots__ = ("config", "logger", "directory", "sampler", "continuous")
+
+    def __init__(
+            self,
+            config: Config
+    ) -> None:
+        """
+        Initializes the RequestProfiler.
+
+        Args:
+            config (Config): The configuration object.
+        """
+        self.config = config.profiling
+        self.logger = createLogger("Profiler", level=config.logging.level, config=config)
+        self.directory: Path = Path(self.config.directory)
+        self.sampler: StackSampler | None = None
+        self.continuous: ContinuousSampler | None = None
+
+        if self.config.continuous:
+            self.continuous = ContinuousSampler(
+                ensureDirectory(self.directory / "flamegraphs"),
+                interval=self.config.continuousInterval,
+                flushMinutes=self.config.flushMinutes,
+                maxOverhead=self.config.maxOverhead,
+                keep=self.config.keepFlamegraphs,
+                logger=self.logger
+            )
+            self.continuous.start()
+            atexitRegister(self.continuous.stop)
+
+        if not self.config.enabled:
+            return
+
+        ensureDirectory(self.directory)
+
+        self.sampler = StackSampler(self.config.interval)
+        self.sampler.start()
+
+    def isAuthorized(self) -> bool:
+        """
+        Checks whether the current request may see the captured profiles. It must carry a value from
+        signProfileHeader for its path, either in the X-Profile header or in the signature query parameter (which the
+        profiles page adds to its download links).
+
+        Returns:
+            bool: Whether the request is signed.
+        """
+        return self._isSigned(request.headers.get(PROFILE_HEADER) or request.args.get("signature"))
+
+    def _isSigned(
+            self,
+            header: str | None = None
+    ) -> bool:
+        """
+        Checks whether the current request carries a valid, unexpired X-Profile header.
+
+        Args:
+            header (str | None): The value to check instead of the header, if any.
+
+        Returns:
+            bool: Whether the header is valid.
+        """
+        header = header or request.headers.get(PROFILE_HEADER)
+        if header is None or not self.config.secret or "." not in header:
+            return False
+
+        expires, signature = header.split(".", 1)
+        if not expires.isdigit() or int(expires) < time():
+            return False
+
+        expected: str = hmacNew(self.config.secret.encode(), f"{expires}:{request.path}".encode(), sha256).hexdigest()
+        return compare_digest(signature, expected)
+
+    def start(self) -> None:
+        """
+        Starts profiling the current request if it is triggered. Called from beforeRequest.
+
+        Returns:
+            None
+        """
+        if self.continuous is not None:
+            self.continuous.add(get_ident())
+
+        if self.sampler is None:
+            return
+
+        triggered: bool = self._isSigned() or random() < self.config.sampleRate
+
+        if triggered:
+            profile: Profile = Profile()
+            try:
+                profile.enable()
+                g.profile = profile
+            except ValueError:  # Another profiler is already active (cProfile can only run once at a time on 3.12+)
+                self.logger.debug("Skipped cProfile for request %s, another profile is running", g.uuid)
+
+        elif not self.config.thresholdMs:
+            return
+
+        self.sampler.watch(
+            get_ident(),
+            ActiveRequest(
+                uuid=str(g.uuid),
+                start=g.startTime,
+                sampleAfter=0 if triggered else self.config.thresholdMs / 1000
+            )
+        )
+
+    def stop(
+            self,
+            response: Response
+    ) -> None:
+        """
+        Stops profiling the current request and writes any profile it produced. Called from afterRequest.
+
+        Args:
+            response (Response): The response of the request.
+
+        Returns:
+            None
+        """
+        if self.sampler is None:
+            return
+
+        profile: Profile | None = g.pop("profile", None)
+        activeRequest: ActiveRequest | None = self.sampler.unwatch(get_ident())
+
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(self.directory / f"{g.uuid}.pstats")
+
+        if activeRequest is not None and activeRequest.stacks:
+            with open(self.directory / f"{g.uuid}.collapsed", "w", encoding="utf-8") as collapsedFile:
+                collapsedFile.writelines(f"{stack} {count}\n" for stack, count in activeRequest.stacks.items())
+
+        if profile is not None or (activeRequest is not None and activeRequest.stacks):
+            self.logger.info(
+                "Profiled request %s [%s] [%s] [%s]",
+                g.uuid,
+                request.method,
+                request.path,
+                response.status_code
+            )
+
+    def discard(self) -> None:
+        """
+        Stops profiling the current request without writing anything. Called on teardown, so requests that failed
+        before afterRequest ran don't leave a profiler running.
+
+        Returns:
+            None
+        """
+        if self.continuous is not None:
+            self.continuous.remove(get_ident())
+
+        if self.sampler is None:
+            return
+
+        profile: Profile | None = g.pop("profile", None)
+        if profile is not None:
+            profile.disable()
+
+        self.sampler.unwatch(get_ident())
+
+    def listProfiles(self) -> List[Dict[str, str | int | datetime]]:
+        """
+        Lists the captured profiles, newest first.
+
+        Returns:
+            List[Dict[str, str | int | datetime]]: The name, request uuid, kind, size and creation time of each file.
+        """
+        if not self.directory.exists():
+            return []
+
+        profiles: List[Dict[str, str | int | datetime]] = [
+            {
+                "name": profilePath.relative_to(self.directory).as_posix(),
+                "uuid": profilePath.stem,
+                "kind": "flamegraph" if profilePath.parent.name == "flamegraphs" else profilePath.suffix.removeprefix("."),
+                "size": profilePath.stat().st_size,
+                "created": datetime.fromtimestamp(profilePath.stat().st_mtime)
+            } for profilePath in (*self.directory.glob("*"), *self.directory.glob("flamegraphs/*"))
+            if profilePath.suffix in (".pstats", ".collapsed")
+        ]
+
+        return sorted(profiles, key=lambda profile: profile["created"], reverse=True)
@@ -2,11 +2,13 @@
 Contains the Requester class.
 """
 # Standard Library Imports
+from collections import OrderedDict
 from hashlib import sha512
-from time import time
-from typing import Any, Callable, Optional
+from time import monotonic, sleep, time
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlencode
 from uuid import uuid4
-from threading import Lock
+from threading import Event, Lock
 
 # Third Party Imports
 from requests import Response, delete, get, post, put, HTTPError
@@ -14,6 +16,10 @@ from requests import Response, delete, get, post, put, HTTPError
 # Internal Imports
 from .clogging import createLogger
 from .config import Config
+from .helpers import PAGE_SIZE, prefetchPages
+from .metrics import requesterCacheBytes, requesterCacheEvents, upstreamEndpoint, upstreamInFlight, upstreamLatency
+from .timing import incrementCounter, timed
+from .tracing import Span, currentSpan, span, traced
 
 
 # Create cache variables
@@ -23,6 +29,30 @@ cacheLastChecked: float = time()
 # Create cache dictionary
 cache: dict[str, dict] = {}
 
+# Size in bytes of each cached response body, used for the cache size metric
+cacheSizes: dict[str, int] = {}
+
+# Requests on their way upstream, by hash, set once their response is cached. Guarded by cacheLock
+inFlight: dict[str, Event] = {}
+
+# The id of the slugs seen in responses, by collection, least recently used first. Bounded by api.maxAliases
+aliasLock: Lock = Lock()
+aliases: OrderedDict[tuple[str, str], int] = OrderedDict()
+
+# Constants
+ALIASED: tuple[str, ...] = (  # Collections whose items can be fetched by id or slug
+    "games", "genres", "platforms", "stores", "tags", "developers", "publishers", "creators"
+)
+GAME_LISTS: tuple[str, ...] = ("additions", "game-series", "parent-games")  # Lists of a game that are lists of games
+EMBEDDED_ALIASES: dict[str, tuple[str, str | None]] = {  # The collection of the items in each list field of a game
+    "genres": ("genres", None),
+    "tags": ("tags", None),
+    "developers": ("developers", None),
+    "publishers": ("publishers", None),
+    "stores": ("stores", "store"),
+    "platforms": ("platforms", "platform")
+}
+
 
 class RBadGateway(HTTPError):
     """
@@ -41,19 +71,186 @@ def checkCache() -> None:
         return
 
     with cacheLock:
-        # Check the cache
-        for rhash in cache:
-            if cache[rhash]["expires"] >= time():  # If the cache has not expired, skip it
+        cacheLastChecked = time()
+
+        # Check the cache (iterate over a copy of the keys as entries are deleted)
+        for rhash in list(cache):
+            if cache[rhash]["expires"] >= cacheLastChecked:  # If the cache has not expired, skip it
                 continue
 
             del cache[rhash]
+            requesterCacheBytes.dec(cacheSizes.pop(rhash, 0))
+            requesterCacheEvents.labels("eviction").inc()
+
+
+def pastEnd(
+        data: dict
+) -> bool:
+    """
+    Checks whether a response is RAWG's answer to a page past the end of a list, rather than another error.
+
+    Args:
+        data (dict): The response.
+
+    Returns:
+        bool: Whether the page asked for does not exist.
+    """
+    return "results" not in data and data.get("detail") == "Invalid page."
+
+
+def learnAliases(
+        collection: str,
+        payload: Any
+) -> None:
+    """
+    Remembers the id of an item from a response that has both its id and slug, along with the items embedded in it.
+
+    Args:
+        collection (str): The collection the item belongs to.
+        payload (Any): The item.
+
+    Returns:
+        None
+    """
+    if not isinstance(payload, dict):
+        return
+
+    if isinstance(payload.get("id"), int) and isinstance(payload.get("slug"), str):
+        aliases[(collection, payload["slug"])] = payload["id"]
+        aliases.move_to_end((collection, payload["slug"]))
+
+    if collection != "games":
+        return
+
+    for field, (embeddedCollection, wrapper) in EMBEDDED_ALIASES.items():
+        for item in payload.get(field) or []:
+            learnAliases(embeddedCollection, item.get(wrapper) if wrapper is not None and isinstance(item, dict) else item)
+
+
+def canonicalize(
+        path: str,
+        params: Optional[dict[str, Any]]
+) -> tuple[str, Optional[dict[str, Any]]]:
+    """
+    Replaces the slug in a path (and the game_pk parameter) with the id it is an alias of, if known.
+
+    Args:
+        path (str): The path, relative to the API base.
+        params (Optional[dict[str, Any]]): The parameters.
+
+    Returns:
+        tuple[str, Optional[dict[str, Any]]]: The path and parameters.
+    """
+    parts: list[str] = path.strip("/").split("/")
+
+    if len(parts) < 2 or parts[0] not in ALIASED:
+        return path, params
+
+    if parts[1].isdigit():
+        id: int | None = int(parts[1])
+    else:
+        with aliasLock:
+            id: int | None = aliases.get((parts[0], parts[1]))
+
+            if id is not None:
+                aliases.move_to_end((parts[0], parts[1]))
+
+    if id is None:
+        return path, params
+
+    # The id may also be given as a string, so it is made an int either way
+    if params is not None and str(params.get("game_pk")) == parts[1]:
+        params = {**params, "game_pk": id}
+
+    return "/".join([parts[0], str(id), *parts[2:]]), params
+
+
+def learnResponse(
+        path: str,
+        data: Any,
+        maxAliases: int
+) -> None:
+    """
+    Remembers the ids of the items in a response, forgetting the least recently used beyond maxAliases.
+
+    Args:
+        path (str): The path the response was fetched from, relative to the API base.
+        data (Any): The response.
+        maxAliases (int): The most aliases to remember.
+
+    Returns:
+        None
+    """
+    parts: list[str] = path.strip("/").split("/")
+
+    if parts[0] not in ALIASED or not isinstance(data, dict):
+        return
+
+    with aliasLock:
+        if len(parts) == 1 or (parts[0] == "games" and len(parts) == 3 and parts[2] in GAME_LISTS):
+            for item in data.get("results") or []:
+                learnAliases(parts[0], item)
+        elif len(parts) == 2:
+            learnAliases(parts[0], data)
+
+        while len(aliases) > maxAliases:
+            aliases.popitem(last=False)
+
+
+class RateLimiter:
+    """
+    A token bucket shared by every thread making upstream requests. It refills at rate tokens a second and holds at
+    most burst of them, so short bursts go straight through while the average stays under the rate.
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated", "lock")
+
+    def __init__(
+            self,
+            rate: float,
+            burst: int
+    ) -> None:
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            rate (float): The requests allowed per second, 0 for no limit.
+            burst (int): The most requests allowed at once.
+        """
+        self.rate: float = rate
+        self.burst: float = float(max(burst, 1))
+        self.tokens: float = self.burst
+        self.updated: float = monotonic()
+        self.lock: Lock = Lock()
+
+    def acquire(self) -> None:
+        """
+        Waits until a request is allowed.
+
+        Returns:
+            None
+        """
+        if not self.rate:
+            return
+
+        with self.lock:
+            now: float = monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1.0
+
+            # Tokens are taken in order while the lock is held, so each waiter only waits for its own to refill
+            wait: float = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait:
+            with span("rate limit"):
+                sleep(wait)
 
 
 class Requester:
     """
     Handles making requests to the RAWG API.
     """
-    __sockets__ = ("config", "logger")
+    __sockets__ = ("config", "logger", "limiter")
 
     def __init__(
             self,
@@ -67,6 +264,7 @@ class Requester:
         """
         self.config = config
         self.logger = createLogger("Requester", level=config.logging.level, config=config, includeRequest=False)
+        self.limiter = RateLimiter(config.api.rateLimit, config.api.rateBurst)
 
     def get(
             self,
@@ -98,6 +296,109 @@ class Requester:
             **kwargs
         )
 
+    def getPage(
+            self,
+            url: str,
+            params: dict[str, Any]
+    ) -> Any:
+        """
+        Gets a page of a paginated RAWG list by fetching the api.pageSize sized pages that hold it and slicing it out of
+        them, so every page size and offset asked for shares the same cache entries and upstream calls.
+
+        Args:
+            url (str): The URL of the list.
+            params (dict[str, Any]): The parameters to pass to the request, including page and page_size.
+
+        Returns:
+            Any: The page in the same shape as RAWG's.
+        """
+        try:
+            page: int = int(params.get("page") or 1)
+            pageSize: int = int(params.get("page_size") or 20)
+        except ValueError:
+            return self.get(url, params)  # Left for RAWG to answer
+
+        alignment: int = self.config.api.pageSize
+
+        # Pages larger than the aligned size, or already aligned, are fetched as they are, as are ones RAWG rejects
+        if not alignment or pageSize >= alignment or page < 1 or pageSize < 1:
+            return self.get(url, params)
+
+        start: int = (page - 1) * pageSize
+        first: int = start // alignment + 1
+        last: int = (start + pageSize - 1) // alignment + 1
+        data: dict | None = None
+        results: list = []
+
+        for alignedPage in range(first, last + 1):
+            alignedData: dict = self.get(url, {**params, "page": alignedPage, "page_size": alignment})
+
+            # RAWG answers pages past the end with an error instead of results
+            if "results" not in alignedData:
+                if data is None:
+                    return alignedData
+
+                break
+
+            if data is None:
+                data = alignedData
+
+            results.extend(alignedData["results"])
+
+            if alignedData["next"] is None:
+                break
+
+        offset: int = start - (first - 1) * alignment
+        results = results[offset:offset + pageSize]
+
+        if not results and page > 1:
+            return {"detail": "Invalid page."}
+
+        return {
+            **data,
+            "next": self._pageUrl(url, params, page + 1) if start + pageSize < data["count"] else None,
+            "previous": self._pageUrl(url, params, page - 1) if page > 1 else None,
+            "results": results
+        }
+
+    def pages(
+            self,
+            url: str,
+            params: Optional[dict[str, Any]] = None,
+            page: int = 1,
+            pageSize: int = PAGE_SIZE,
+            limit: Optional[int] = None,
+            skipCache: bool = False,
+            noStore: bool = False
+    ) -> Iterator[dict]:
+        """
+        Walks a paginated RAWG list, fetching the next page while the current one is being consumed. Pages go through
+        the cache and the rate limiter like any other request.
+
+        Args:
+            url (str): The URL of the list.
+            params (Optional[dict[str, Any]]): The parameters to pass to every request, without the page.
+            page (int): The first page number.
+            pageSize (int): The number of results per page.
+            limit (Optional[int]): The most pages to fetch, if any.
+            skipCache (bool): Whether to skip the cache or not.
+            noStore (bool): Whether to leave the pages out of the cache, so a long walk does not fill it.
+
+        Returns:
+            Iterator[dict]: The pages. The last may be RAWG's error for a page past the end, without results.
+        """
+        return prefetchPages(
+            lambda number: self.get(
+                url,
+                {**(params or {}), "page": number, "page_size": pageSize},
+                skipCache=skipCache,
+                noStore=noStore
+            ),
+            lambda data: "results" not in data or data["next"] is None,
+            page,
+            limit
+        )
+
     def post(
             self,
             url: str,
@@ -188,6 +489,7 @@ class Requester:
             **kwargs
         )
 
+    @traced
     def _action(
             self,
             method: Callable,
@@ -196,6 +498,7 @@ class Requester:
             overwriteUrl: bool = False,
             headers: dict[str, Any] = None,
             skipCache: bool = False,
+            noStore: bool = False,
             **kwargs
     ) -> Any:
         """
@@ -208,20 +511,39 @@ class Requester:
             overwriteUrl (bool): Whether to use only use the URL or include the base URL.
             headers (dict[str, Any]): Headers to pass to the request.
             skipCache (bool): Whether to skip the cache or not.
+            noStore (bool): Whether to leave the response out of the cache, for walks that read each page once.
             **kwargs: Any additional keyword arguments to pass to the request.
 
         Returns:
             Any: The response from the RAWG API.
         """
-        # Create a unique ID for the request
-        requestId: str = str(uuid4())
+        # Items linked by slug are fetched by id once it is known, so both share one cache entry
+        path: str | None = None
+
+        if not overwriteUrl:
+            url, params = canonicalize(url, params)
+            path = url
 
         # Set the URL
-        url: str = f"{self.config.api.base}{"/" if not url.startswith("/") and not self.config.api.base.endswith("/") else ""}{url}" if not overwriteUrl else url
+        url: str = self._fullUrl(url) if not overwriteUrl else url
+
+        # Use the span id when tracing so the log lines can be matched to the trace, otherwise create a unique ID
+        actionSpan: Span | None = currentSpan.get()
+
+        if actionSpan is not None:
+            actionSpan.attributes["url"] = url
+            requestId: str = actionSpan.spanId
+        else:
+            requestId: str = str(uuid4())
 
         # Yes this does have request context
         self.logger.info(
-            f"{requestId} - {method.__name__.upper()} request to {url} with params {params} and kwargs {kwargs}"
+            "%s - %s request to %s with params %s and kwargs %s",
+            requestId,
+            method.__name__.upper(),
+            url,
+            params,
+            kwargs
         )
 
         # Check the cache
@@ -229,56 +551,185 @@ class Requester:
 
         # Calculate request hash
         rHash: str = sha512(f"{url}{params}{headers}{kwargs}".encode()).hexdigest()
+        requestParams: Optional[dict[str, Any]] = dict(params) if params is not None else None
+        requestHeaders: Optional[dict[str, Any]] = dict(headers) if headers is not None else None
 
-        with cacheLock:
+        with span("cache lookup"), cacheLock:
             if rHash in cache and not skipCache:
-                self.logger.debug(f"{requestId} - Cache hit")
+                self.logger.debug("%s - Cache hit", requestId)
+                incrementCounter("cacheHits")
+                requesterCacheEvents.labels("hit").inc()
                 # Return the data from the cache without the expires key
                 _tempCache: dict = cache[rHash].copy()
                 _tempCache.pop("expires")
                 return _tempCache
 
-        # Add the API key to the data
-        if params is None:
-            params = {}
+            # Only one of several identical requests is sent, the others wait for its response to be cached
+            pending: Event | None = inFlight.get(rHash) if not skipCache else None
+            leader: Event | None = None
+            flightHash: str = rHash  # The hash changes when a response fetched by slug is cached under its id
 
-        params["key"] = self.config.api.key
+            if pending is None and not skipCache and not noStore:
+                leader = inFlight[rHash] = Event()
+
+        if pending is not None:
+            with span("coalesced"):
+                pending.wait(self.config.api.timeout)
 
-        # Set the user agent
-        if headers is None:
-            headers = {}
+            # A response fetched by a slug is cached under its id, which is known once the request waited for is done
+            waitedHash: str = rHash
 
-        # Add the user agent header
-        headers["User-Agent"] = f"AHSHS IA3 {self.config.server.owner.name}"
-        headers["From"] = self.config.server.owner.email
+            if path is not None:
+                canonicalPath, canonicalParams = canonicalize(path, requestParams)
 
-        response: Response = method(
-            url,
-            params=params,
-            **kwargs
-        )
+                if canonicalPath != path:
+                    waitedHash = self._canonicalHash(canonicalPath, canonicalParams, requestHeaders, kwargs)
+
+            with cacheLock:
+                if waitedHash in cache:
+                    self.logger.debug("%s - Coalesced with a request in flight", requestId)
+                    incrementCounter("cacheHits")
+                    requesterCacheEvents.labels("coalesced").inc()
+                    _tempCache: dict = cache[waitedHash].copy()
+                    _tempCache.pop("expires")
+                    return _tempCache
+
+            # The request waited for failed or timed out, so this one is sent itself
 
-        # Response is not nullable
-        assert response is not None
+        try:
+            # Add the API key to the data
+            if params is None:
+                params = {}
 
-        self.logger.debug(f"{requestId} - Cache miss")
+            params["key"] = self.config.api.key
 
-        # Get the response data
-        data: dict = response.json()
+            # Set the user agent
+            if headers is None:
+                headers = {}
 
-        # Edit the data to remove the API key from the next and previous URLs
-        if "next" in data and data["next"] is not None:
-            data["next"] = data["next"].replace(self.config.api.key, "KEY")
+            # Add the user agent header
+            headers["User-Agent"] = f"AHSHS IA3 {self.config.server.owner.name}"
+            headers["From"] = self.config.server.owner.email
 
-        if "previous" in data and data["previous"] is not None:
-            data["previous"] = data["previous"].replace(self.config.api.key, "KEY")
+            self.logger.debug("%s - Cache miss", requestId)
+            incrementCounter("cacheMisses")
+            incrementCounter("upstreamCalls")
+            requesterCacheEvents.labels("miss").inc()
 
-        with cacheLock:
-            # Add the data to the cache
-            cache[rHash] = data.copy()
+            self.limiter.acquire()
 
-            # Add the expiration time to the cache (current time + config.api.cacheExpiry)
-            cache[rHash]["expires"] = time() + self.config.api.cacheExpiry
+            with (
+                timed("upstream"),
+                upstreamInFlight.track_inprogress(),
+                upstreamLatency.labels(upstreamEndpoint(url, self.config.api.base)).time()
+            ):
+                with span("upstream"):
+                    response: Response = method(
+                        url,
+                        params=params,
+                        **{"timeout": self.config.api.timeout, **kwargs}
+                    )
+
+                # Response is not nullable
+                assert response is not None
+
+                # Get the response data
+                with span("decode"):
+                    data: dict = response.json()
+
+            # Edit the data to remove the API key from the next and previous URLs
+            if "next" in data and data["next"] is not None:
+                data["next"] = data["next"].replace(self.config.api.key, "KEY")
+
+            if "previous" in data and data["previous"] is not None:
+                data["previous"] = data["previous"].replace(self.config.api.key, "KEY")
+
+            # Learn the ids of the slugs in the response, and cache it under the id if it was fetched by slug. Walks
+            # that are not stored read far more items than are ever asked for by slug, so they are not learnt from.
+            if path is not None and not noStore:
+                learnResponse(path, data, self.config.api.maxAliases)
+                canonicalPath, canonicalParams = canonicalize(path, requestParams)
+
+                if canonicalPath != path:
+                    rHash = self._canonicalHash(canonicalPath, canonicalParams, requestHeaders, kwargs)
+
+            if noStore:
+                return data
+
+            with cacheLock:
+                # Add the data to the cache
+                cache[rHash] = data.copy()
+
+                # Add the expiration time to the cache (current time + config.api.cacheExpiry)
+                cache[rHash]["expires"] = time() + self.config.api.cacheExpiry
+
+                # Replace the size of any entry this overwrites
+                requesterCacheBytes.inc(len(response.content) - cacheSizes.get(rHash, 0))
+                cacheSizes[rHash] = len(response.content)
+
+            # Return the data
+            return data
+        finally:
+            if leader is not None:
+                with cacheLock:
+                    inFlight.pop(flightHash, None)
+
+                leader.set()
+
+    def _canonicalHash(
+            self,
+            path: str,
+            params: Optional[dict[str, Any]],
+            headers: Optional[dict[str, Any]],
+            kwargs: dict[str, Any]
+    ) -> str:
+        """
+        Gets the cache key of a request made by id, for a response fetched by slug.
+
+        Args:
+            path (str): The canonical path.
+            params (Optional[dict[str, Any]]): The canonical parameters.
+            headers (Optional[dict[str, Any]]): The headers of the request.
+            kwargs (dict[str, Any]): The additional keyword arguments of the request.
+
+        Returns:
+            str: The cache key.
+        """
+        return sha512(f"{self._fullUrl(path)}{params}{headers}{kwargs}".encode()).hexdigest()
+
+    def _fullUrl(
+            self,
+            path: str
+    ) -> str:
+        """
+        Joins a path to the API base.
+
+        Args:
+            path (str): The path.
+
+        Returns:
+            str: The URL.
+        """
+        return f"{self.config.api.base}{"/" if not path.startswith("/") and not self.config.api.base.endswith("/") else ""}{path}"
+
+    def _pageUrl(
+            self,
+            url: str,
+            params: dict[str, Any],
+            page: int
+    ) -> str:
+        """
+        Builds the RAWG url of another page of a list, so pages sliced from larger ones look like RAWG's.
+
+        Args:
+            url (str): The URL of the list.
+            params (dict[str, Any]): The parameters of the page.
+            page (int): The page number.
+
+        Returns:
+            str: The url.
+        """
+        query: dict[str, Any] = {key: value for key, value in params.items() if value is not None}
+        query["page"] = page
 
-        # Return the data
-        return data
+        return f"{self._fullUrl(url)}?{urlencode(query, doseq=True)}"
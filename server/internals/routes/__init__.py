@@ -4,8 +4,11 @@ Initializes the routes for the server.
 
 from .api import apiBlueprint
 from .errors import errorsBlueprint
+from .export import exportBlueprint
 from .games import gamesBlueprint
 from .info import infoBlueprint
+from .metrics import metricsBlueprint
+from .profiles import profilesBlueprint
 from .tests import testsBlueprint
 
 __all__ = [
@@ -13,5 +16,8 @@ __all__ = [
     "gamesBlueprint",
     "testsBlueprint",
     "apiBlueprint",
-    "errorsBlueprint"
+    "errorsBlueprint",
+    "metricsBlueprint",
+    "profilesBlueprint",
+    "exportBlueprint"
 ]
@@ -1,12 +1,16 @@
 """
 Contains apiBlueprint routes. Has urlPrefix of /api. Soley for forwarding requests to RAWG without exposing the API key.
 """
-from typing import Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict
 
 # Third Party Imports
 from flask import request
 from flask.blueprints import Blueprint
 from flask_injector import inject
+from requests import RequestException, Timeout
+from werkzeug.exceptions import BadRequest
 
 # Internal Imports
 from ..wrapper import API
@@ -16,6 +20,80 @@ from ..wrapper import API
 apiBlueprint: Blueprint = Blueprint("api", __name__, url_prefix="/api")
 
 
+def upstreamStatus(
+        error: Exception
+) -> int:
+    """
+    Gets the status code to report for a failed sub-request.
+
+    Args:
+        error (Exception): The error the sub-request raised.
+
+    Returns:
+        int: RAWG's status code if it answered, 504 if it timed out, otherwise 502.
+    """
+    if isinstance(error, RequestException) and error.response is not None:
+        return error.response.status_code
+
+    return 504 if isinstance(error, Timeout) else 502
+
+
+@apiBlueprint.post("/batch")
+@inject
+def batch(
+        api: API
+) -> Dict:
+    """
+    Forwards several requests to the RAWG API at once, so the browser makes one round trip instead of one per request.
+
+    The body maps a name for each sub-request to its url (with or without the /api/ prefix) and parameters, for
+    example {"game": {"url": "games/4200"}, "dlcs": {"url": "games/4200/additions", "parameters": {"page_size": 6}}}.
+    The sub-requests run concurrently through the Requester, so identical ones are only sent upstream once.
+
+    Args:
+        api (API): The API wrapper to use (injected).
+
+    Returns:
+        Dict: The response to each sub-request under its name, or {"error": message, "status": code} if it failed.
+    """
+    requests: Any = request.get_json(silent=True)
+
+    if not isinstance(requests, dict) or not all(
+            isinstance(subRequest, dict)
+            and isinstance(subRequest.get("url"), str)
+            and isinstance(subRequest.get("parameters") or {}, dict)
+            for subRequest in requests.values()
+    ):
+        raise BadRequest("The body must map each sub-request's name to its url and parameters.")
+
+    if len(requests) > api.requester.config.api.batchLimit:
+        raise BadRequest(f"A batch can have at most {api.requester.config.api.batchLimit} sub-requests.")
+
+    results: Dict[str, Any] = {}
+
+    with ThreadPoolExecutor(max_workers=max(min(len(requests), api.requester.config.api.batchWorkers), 1)) as executor:
+        # Each sub-request runs in a copy of this request's context, so its timings and traces are kept
+        futures: Dict[str, Future] = {
+            name: executor.submit(
+                copy_context().run,
+                api.requester.get,
+                subRequest["url"].removeprefix("/").removeprefix("api/"),
+                {key: value for key, value in (subRequest.get("parameters") or {}).items() if key != "key"}
+            )
+            for name, subRequest in requests.items()
+        }
+
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as error:
+                # Error messages can hold the upstream url, and with it the API key, so they are only logged
+                api.requester.logger.exception("Batch sub-request %s to %s failed", name, requests[name]["url"])
+                results[name] = {"error": "Upstream request failed", "status": upstreamStatus(error)}
+
+    return results
+
+
 # Create one route that consumes the url and forwards it to the RAWG API
 @apiBlueprint.get("/<path:url>", strict_slashes=False)
 @inject
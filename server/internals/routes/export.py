@@ -0,0 +1,71 @@
+"""
+Contains exportBlueprint routes. Has urlPrefix of /export. Streams whole result sets for bulk consumers.
+"""
+
+# Standard Library Imports
+from json import dumps
+from typing import Dict, Iterator
+
+# Third Party Imports
+from flask import Response, request, stream_with_context
+from flask.blueprints import Blueprint
+from flask_injector import inject
+from werkzeug.exceptions import BadRequest
+
+# Internal Imports
+from ..wrapper import API
+from ..wrapper.handlers.game import ExportError
+
+# Constants
+exportBlueprint: Blueprint = Blueprint("export", __name__, url_prefix="/export")
+
+
+@exportBlueprint.get("/games.ndjson")
+@inject
+def games(
+        api: API
+) -> Response:
+    """
+    Streams every game matching the query as newline-delimited JSON, one game per line. The query takes the same
+    parameters as RAWG's games list (and /api/games), without page and page_size.
+
+    A cursor parameter resumes an export that was cut off: it is the number of games already received. An export that
+    stops early ends with an {"error": message, "cursor": cursor} line instead of a game, and is resumed from that cursor.
+
+    Args:
+        api (API): The API wrapper to use (injected).
+
+    Returns:
+        Response: The games, streamed with chunked transfer encoding.
+    """
+    parameters: Dict[str, str] = request.args.to_dict()
+    cursor: str = parameters.pop("cursor", "0")
+
+    if not cursor.isdigit():
+        raise BadRequest("The cursor must be the number of games already received.")
+
+    for key in ("page", "page_size", "key"):
+        parameters.pop(key, None)
+
+    def generate() -> Iterator[str]:
+        """
+        Serializes the games a page at a time, so only one page is held in memory.
+
+        Returns:
+            Iterator[str]: The lines of each page.
+        """
+        sent: int = int(cursor)
+
+        try:
+            for results in api.game.export(parameters, int(cursor)):
+                yield "".join(f"{dumps(game, separators=(",", ":"))}\n" for game in results)
+                sent += len(results)
+        except ExportError as error:
+            api.game.logger.warning("Export stopped after %s games: %s", sent, error)
+            yield f"{dumps({"error": str(error), "cursor": sent}, separators=(",", ":"))}\n"
+        except Exception:
+            # Error messages can hold the upstream url, and with it the API key, so they are only logged
+            api.game.logger.exception("Export failed after %s games", sent)
+            yield f"{dumps({"error": "Upstream request failed", "cursor": sent}, separators=(",", ":"))}\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
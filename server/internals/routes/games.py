@@ -4,6 +4,7 @@ Contains infoBlueprint routes. Has urlPrefix of /games.
 
 # Standard Library Imports
 from datetime import date, datetime, timedelta
+from typing import Dict, List
 
 # Third Party Imports
 from flask import request, render_template as renderTemplate
@@ -18,6 +19,25 @@ from ..wrapper.response import Response
 
 # Constants
 gamesBlueprint: Blueprint = Blueprint("games", __name__, url_prefix="/games")
+AGE_RATINGS: Dict[str, int] = {"adults-only": 18, "mature": 17}  # The age needed to see games with each ESRB rating
+
+
+def requiredAge(
+        gameData: Game
+) -> int:
+    """
+    Gets the age a visitor must be to see a game, from its ESRB rating.
+
+    Args:
+        gameData (Game): The game.
+
+    Returns:
+        int: The age, or 0 if anyone may see it.
+    """
+    if gameData.esrb_rating is None:
+        return 0
+
+    return AGE_RATINGS.get(gameData.esrb_rating.slug, 0)
 
 
 # Routes
@@ -38,13 +58,21 @@ def index(
         date.today()
     ]
 
-    trendingData: Response = api.game.list(dates=trendingDates, ordering="-metacritic", pageSize=6)  # Games between the start of the year and the end of the year ordering -added
-    mostPopularTimespan: Response = api.game.list(
+    # Scored locally from the catalog mirror when there is one, otherwise ordered by RAWG
+    trendingData: Response = api.game.ranked("trending", pageSize=6) or api.game.list(
+        dates=trendingDates,
+        ordering="-metacritic",
+        pageSize=6
+    )  # Games added the fastest lately
+    mostPopularTimespan: Response = api.game.ranked("rated", pageSize=6, year=2007) or api.game.list(
         dates=[date.fromisocalendar(day=7, week=51, year=2006), date.fromisocalendar(day=7, week=51, year=2008)],
         ordering="-metacritic",
         pageSize=6
-        )  # Games between 1st jan 2007 and 31st dec 2007 ordering -added
-    mostPopularAlltime: Response = api.game.list(ordering="-metacritic", pageSize=6)  # Most popular games all time
+    )  # Best rated games of 2007
+    mostPopularAlltime: Response = api.game.ranked("popular", pageSize=6) or api.game.list(
+        ordering="-metacritic",
+        pageSize=6
+    )  # Most popular games all time
 
     return renderTemplate(
         "index.html",
@@ -75,6 +103,35 @@ def search(
             )
 
 
+@gamesBlueprint.get("/suggest")
+@inject
+def suggest(
+        api: API
+) -> List[Dict]:
+    """
+    Suggests games whose name starts with what has been typed so far (the q argument). Used for search-as-you-type.
+
+    Args:
+        api (API): The API object. (Injected)
+
+    Returns:
+        List[Dict]: The id, slug and name of each suggested game, most popular first.
+    """
+    query: str = request.args.get("q", "")
+    limit: int = min(request.args.get("limit", 10, int), 20)
+
+    suggestions: List[Dict] | None = api.catalog.suggestions.suggest(query, limit) if api.catalog is not None else None
+
+    # Without a built prefix index, fall back to a search
+    if suggestions is None:
+        suggestions = [
+            {"id": game.id, "slug": game.slug, "name": game.name}
+            for game in api.game.list(search=query, pageSize=limit)
+        ] if query.strip() else []
+
+    return suggestions
+
+
 @gamesBlueprint.get("/<string:gameId>")
 @inject
 def game(
@@ -91,31 +148,38 @@ def game(
     Returns:
         str: The rendered game page.
     """
-    gameData: Game = api.game.details(gameId)
-
     try:
         # Check request cookies for age
         age: int = request.cookies.get("age", 0, int)
     except TypeError:
         age: int = 0
 
+    # The age check only needs what a games list carries, so a visitor who is turned away costs no details request.
+    # The details are checked too, in case the rating changed since the list the summary came from.
+    summary: Game = api.game.summary(gameId, ["esrb_rating"])
+
+    if requiredAge(summary) > age:
+        return renderTemplate("games/age.html", requiredAge=requiredAge(summary))
+
+    gameData: Game = api.game.details(gameId)
+
+    if requiredAge(gameData) > age:
+        return renderTemplate("games/age.html", requiredAge=requiredAge(gameData))
+
     # Get reviews for the game
     reviews: list[Review] = api.game.reviews(gameId).results
+    similar: list[Game] = api.game.similar(gameData.id)
 
     if gameData.esrb_rating is None:
         return renderTemplate(
             "games/game.html",
-            game=api.game.details(gameId)
+            game=gameData,
+            similar=similar
         )
 
-    if gameData.esrb_rating.slug == "adults-only" and age < 18:
-        return renderTemplate("games/age.html", requiredAge=18)
-
-    if gameData.esrb_rating.slug == "mature" and age < 17:
-        return renderTemplate("games/age.html", requiredAge=17)
-
     return renderTemplate(
         "games/game.html",
-        game=api.game.details(gameId),
-        reviews=reviews
+        game=gameData,
+        reviews=reviews,
+        similar=similar
     )
@@ -35,9 +35,21 @@ def index(
         date.today()
     ]
 
-    trendingData: Response = api.game.list(dates=trendingDates, ordering="-metacritic", pageSize=6)  # Games between the start of the year and the end of the year ordering -added
-    mostPopularTimespan: Response = api.game.list(dates=[date.fromisocalendar(day=7, week=51, year=2006), date.fromisocalendar(day=7, week=51, year=2008)], ordering="-metacritic", pageSize=6)  # Games between 1st jan 2007 and 31st dec 2007 ordering -added
-    mostPopularAlltime: Response = api.game.list(ordering="-metacritic", pageSize=6)  # Most popular games all time
+    # Scored locally from the catalog mirror when there is one, otherwise ordered by RAWG
+    trendingData: Response = api.game.ranked("trending", pageSize=6) or api.game.list(
+        dates=trendingDates,
+        ordering="-metacritic",
+        pageSize=6
+    )  # Games added the fastest lately
+    mostPopularTimespan: Response = api.game.ranked("rated", pageSize=6, year=2007) or api.game.list(
+        dates=[date.fromisocalendar(day=7, week=51, year=2006), date.fromisocalendar(day=7, week=51, year=2008)],
+        ordering="-metacritic",
+        pageSize=6
+    )  # Best rated games of 2007
+    mostPopularAlltime: Response = api.game.ranked("popular", pageSize=6) or api.game.list(
+        ordering="-metacritic",
+        pageSize=6
+    )  # Most popular games all time
 
     return renderTemplate(
         "index.html",
@@ -0,0 +1,49 @@
+"""
+Contains metricsBlueprint routes. Has urlPrefix of /metrics. Exposes runtime metrics in the Prometheus text format.
+"""
+
+# Standard Library Imports
+
+# Third Party Imports
+from flask import Response, request
+from flask.blueprints import Blueprint
+from flask_injector import inject
+from werkzeug.exceptions import NotFound
+
+# Internal Imports
+from ..config import Config
+from ..metrics import CONTENT_TYPE, generateLatest, isScraperAllowed
+
+# Constants
+metricsBlueprint: Blueprint = Blueprint("metrics", __name__, url_prefix="/metrics")
+
+
+@metricsBlueprint.get("/", strict_slashes=False)
+@inject
+def index(
+        config: Config
+) -> Response:
+    """
+    The metrics endpoint, scraped by Prometheus. Only served to metrics.allowedAddresses or with metrics.token,
+    otherwise the page does not exist.
+
+    Args:
+        config (Config): The configuration object (injected).
+
+    Returns:
+        Response: The metrics of every worker.
+    """
+    # Behind nginx every request comes from the proxy, which appends the client's address to X-Forwarded-For. Earlier
+    # entries are sent by the client, so only the last one is trusted.
+    forwardedFor: str = request.headers.get("X-Forwarded-For", "")
+    address: str | None = forwardedFor.rsplit(",", 1)[-1].strip() if forwardedFor else request.remote_addr
+
+    if not isScraperAllowed(
+        address,
+        request.headers.get("Authorization"),
+        config.metrics.allowedAddresses,
+        config.metrics.token
+    ):
+        raise NotFound()
+
+    return Response(generateLatest(), content_type=CONTENT_TYPE)
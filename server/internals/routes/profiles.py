@@ -0,0 +1,73 @@
+"""
+Contains profilesBlueprint routes. Has urlPrefix of /profiles. Lists and serves captured request profiles.
+"""
+
+# Standard Library Imports
+from typing import Dict, List
+
+# Third Party Imports
+from flask import Response, render_template as renderTemplate, send_from_directory as sendFromDirectory, url_for as urlFor
+from flask.blueprints import Blueprint
+from flask_injector import inject
+from werkzeug.exceptions import NotFound
+
+# Internal Imports
+from ..profiling import RequestProfiler, signProfileHeader
+
+# Constants
+profilesBlueprint: Blueprint = Blueprint("profiles", __name__, url_prefix="/profiles")
+
+
+@profilesBlueprint.get("/")
+@inject
+def index(
+        profiler: RequestProfiler
+) -> str:
+    """
+    The profiles page. Lists every captured profile. Profiles show source paths and request internals, so the request
+    must be signed with the profiling secret (see signProfileHeader), otherwise the page does not exist.
+
+    Args:
+        profiler (RequestProfiler): The request profiler (injected).
+
+    Returns:
+        str: The rendered profiles page.
+    """
+    if (not profiler.config.enabled and not profiler.config.continuous) or not profiler.isAuthorized():
+        raise NotFound()
+
+    profiles: List[Dict] = profiler.listProfiles()
+
+    # Sign each download link, as the page can not set the header on them
+    for profile in profiles:
+        profile["signature"] = signProfileHeader(
+            profiler.config.secret,
+            urlFor("profiles.download", name=profile["name"])
+        )
+
+    return renderTemplate(
+        "profiles/index.html",
+        profiles=profiles
+    )
+
+
+@profilesBlueprint.get("/<path:name>")
+@inject
+def download(
+        name: str,
+        profiler: RequestProfiler
+) -> Response:
+    """
+    Downloads a captured profile. The request must be signed like the profiles page.
+
+    Args:
+        name (str): The file name of the profile.
+        profiler (RequestProfiler): The request profiler (injected).
+
+    Returns:
+        Response: The profile file.
+    """
+    if (not profiler.config.enabled and not profiler.config.continuous) or not profiler.isAuthorized():
+        raise NotFound()
+
+    return sendFromDirectory(profiler.directory.resolve(), name, as_attachment=True)
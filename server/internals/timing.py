@@ -0,0 +1,125 @@
+"""
+Contains helpers for collecting a per-request latency breakdown.
+
+Phases (time spent) and counters are accumulated on flask's `g` object while a request is being handled. Outside a
+request context every helper is a no-op, so the wrapper can still be used from scripts and background threads.
+"""
+
+# Standard Library Imports
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterator
+
+# Third Party Imports
+from flask import g, has_request_context
+
+# Constants
+PHASES: tuple[str, ...] = ("upstream", "validate", "render")
+COUNTERS: tuple[str, ...] = ("upstreamCalls", "cacheHits", "cacheMisses")
+
+
+def addTiming(
+        phase: str,
+        seconds: float
+) -> None:
+    """
+    Adds time spent in a phase to the current request.
+
+    Args:
+        phase (str): The name of the phase.
+        seconds (float): The time spent, in seconds.
+
+    Returns:
+        None
+    """
+    if not has_request_context():
+        return
+
+    timings: Dict[str, float] = g.setdefault("timings", {})
+    timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+def incrementCounter(
+        name: str,
+        amount: int = 1
+) -> None:
+    """
+    Increments a counter for the current request.
+
+    Args:
+        name (str): The name of the counter.
+        amount (int): How much to increment the counter by.
+
+    Returns:
+        None
+    """
+    if not has_request_context():
+        return
+
+    counters: Dict[str, int] = g.setdefault("counters", {})
+    counters[name] = counters.get(name, 0) + amount
+
+
+@contextmanager
+def timed(
+        phase: str
+) -> Iterator[None]:
+    """
+    Times the body of a with statement and adds it to a phase of the current request.
+
+    Args:
+        phase (str): The name of the phase.
+
+    Yields:
+        None
+    """
+    start: float = perf_counter()
+    try:
+        yield
+    finally:
+        addTiming(phase, perf_counter() - start)
+
+
+def getSummary() -> Dict[str, float | int | None]:
+    """
+    Gets the latency breakdown of the current request. Times are in milliseconds.
+
+    Returns:
+        Dict[str, float | int | None]: The phase times (suffixed with Ms) and counters. total is None if the request
+            has not finished yet.
+    """
+    timings: Dict[str, float] = g.get("timings", {})
+    counters: Dict[str, int] = g.get("counters", {})
+
+    summary: Dict[str, float | int | None] = {
+        "totalMs": round(timings["total"] * 1000, 3) if "total" in timings else None
+    }
+
+    for phase in PHASES:
+        summary[f"{phase}Ms"] = round(timings.get(phase, 0.0) * 1000, 3)
+
+    for counter in COUNTERS:
+        summary[counter] = counters.get(counter, 0)
+
+    return summary
+
+
+def getServerTimingHeader() -> str:
+    """
+    Formats the latency breakdown of the current request as a Server-Timing header value.
+
+    Returns:
+        str: The header value, for example: rawg;dur=120.5;desc="3 calls, 2 hits", validate;dur=1.2, render;dur=4.1
+    """
+    summary: Dict[str, float | int | None] = getSummary()
+
+    entries: list[str] = [
+        f'rawg;dur={summary["upstreamMs"]};desc="{summary["upstreamCalls"]} calls, {summary["cacheHits"]} hits"',
+        f'validate;dur={summary["validateMs"]}',
+        f'render;dur={summary["renderMs"]}'
+    ]
+
+    if summary["totalMs"] is not None:
+        entries.append(f'total;dur={summary["totalMs"]}')
+
+    return ", ".join(entries)
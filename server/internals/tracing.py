@@ -0,0 +1,287 @@
+"""
+Contains a lightweight span API for tracing where a request's time goes.
+
+Spans are nested through a context variable, so a span started inside another (on the same thread, or on a thread that
+was given a copy of the context) becomes its child. Finished spans are written by a background thread to
+Logs/traces/traces_<pid>.json in the Chrome trace event format, one event per line. The file can be opened directly in
+chrome://tracing or https://ui.perfetto.dev.
+
+Tracing is off unless configureTracing is called with tracing.enabled set, in which case every helper here is close to
+free.
+"""
+
+# Standard Library Imports
+from atexit import register as atexitRegister
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import wraps
+from json import dumps
+from os import getpid
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Thread, get_native_id
+from time import perf_counter, time
+from typing import Any, Callable, Dict, Iterator
+from uuid import uuid4
+
+# Local Imports
+from .clogging.registry import ensureDirectory
+from .config import Config
+
+# Constants
+currentSpan: ContextVar["Span | None"] = ContextVar("currentSpan", default=None)
+
+
+class Span:
+    """
+    Represents a timed operation within a trace.
+    """
+    __slots__ = ("name", "traceId", "spanId", "parentId", "startWall", "start", "duration", "threadId", "attributes")
+
+    def __init__(
+            self,
+            name: str,
+            traceId: str,
+            parentId: str | None,
+            attributes: Dict[str, Any]
+    ) -> None:
+        """
+        Initializes the Span and starts its clock.
+
+        Args:
+            name (str): The name of the operation.
+            traceId (str): The id of the trace (the request uuid for request traces).
+            parentId (str | None): The id of the parent span, or None for a root span.
+            attributes (Dict[str, Any]): Extra information about the operation.
+        """
+        self.name: str = name
+        self.traceId: str = traceId
+        self.spanId: str = uuid4().hex[:16]
+        self.parentId: str | None = parentId
+        self.startWall: float = time()
+        self.start: float = perf_counter()
+        self.duration: float | None = None
+        self.threadId: int = get_native_id()
+        self.attributes: Dict[str, Any] = attributes
+
+    def finish(self) -> None:
+        """
+        Stops the span's clock.
+
+        Returns:
+            None
+        """
+        self.duration = perf_counter() - self.start
+
+    def toTraceEvent(self) -> Dict[str, Any]:
+        """
+        Converts the span into a Chrome trace "complete" event.
+
+        Returns:
+            Dict[str, Any]: The trace event.
+        """
+        return {
+            "name": self.name,
+            "cat": "ia3",
+            "ph": "X",
+            "ts": round(self.startWall * 1_000_000),
+            "dur": round((self.duration or 0.0) * 1_000_000),
+            "pid": getpid(),
+            "tid": self.threadId,
+            "args": {
+                "traceId": self.traceId,
+                "spanId": self.spanId,
+                "parentId": self.parentId,
+                **self.attributes
+            }
+        }
+
+
+class TraceExporter(Thread):
+    """
+    A background thread that appends finished spans to the trace file.
+    """
+
+    def __init__(
+            self,
+            filePath: Path
+    ) -> None:
+        """
+        Initializes the TraceExporter.
+
+        Args:
+            filePath (Path): The trace file to append to.
+        """
+        super().__init__(name="TraceExporter", daemon=True)
+        self.filePath: Path = filePath
+        self.queue: SimpleQueue = SimpleQueue()
+
+    def export(
+            self,
+            span: Span
+    ) -> None:
+        """
+        Queues a finished span to be written.
+
+        Args:
+            span (Span): The span to write.
+
+        Returns:
+            None
+        """
+        self.queue.put(span)
+
+    def run(self) -> None:
+        """
+        Writes spans until a None sentinel is received.
+
+        Returns:
+            None
+        """
+        # The trace viewer accepts a JSON array without its closing bracket, so events can be appended forever
+        isNew: bool = not self.filePath.exists() or self.filePath.stat().st_size == 0
+
+        with open(self.filePath, "a", encoding="utf-8") as traceFile:
+            if isNew:
+                traceFile.write("[\n")
+
+            while (span := self.queue.get()) is not None:
+                traceFile.write(f"{dumps(span.toTraceEvent(), default=str)},\n")
+
+                # Only flush once the queue is drained, so bursts of spans are written together
+                if self.queue.empty():
+                    traceFile.flush()
+
+    def stop(self) -> None:
+        """
+        Writes any queued spans and stops the exporter.
+
+        Returns:
+            None
+        """
+        self.queue.put(None)
+        self.join(timeout=5)
+
+
+# The exporter for this process, None when tracing is disabled
+exporter: TraceExporter | None = None
+
+
+def configureTracing(
+        config: Config
+) -> None:
+    """
+    Starts the trace exporter for this process if tracing is enabled.
+
+    Args:
+        config (Config): The configuration object.
+
+    Returns:
+        None
+    """
+    global exporter
+
+    if not config.tracing.enabled or exporter is not None:
+        return
+
+    directory: Path = ensureDirectory(Path(config.tracing.directory))
+
+    exporter = TraceExporter(directory / f"traces_{getpid()}.json")
+    exporter.start()
+    atexitRegister(exporter.stop)
+
+
+def startSpan(
+        name: str,
+        traceId: str | None = None,
+        **attributes
+) -> Token | None:
+    """
+    Starts a span and makes it the current span. Use span() instead where a with statement fits.
+
+    Args:
+        name (str): The name of the operation.
+        traceId (str | None): The id of the trace. Defaults to the current trace, or a new one.
+        **attributes: Extra information about the operation.
+
+    Returns:
+        Token | None: Pass this to finishSpan. None if tracing is disabled.
+    """
+    if exporter is None:
+        return None
+
+    parent: Span | None = currentSpan.get()
+
+    if traceId is None:
+        traceId = parent.traceId if parent is not None else uuid4().hex
+
+    return currentSpan.set(Span(name, traceId, parent.spanId if parent is not None else None, attributes))
+
+
+def finishSpan(
+        token: Token | None
+) -> None:
+    """
+    Finishes the span started by startSpan and restores its parent as the current span.
+
+    Args:
+        token (Token | None): The token returned by startSpan.
+
+    Returns:
+        None
+    """
+    if token is None:
+        return
+
+    finished: Span = currentSpan.get()
+    finished.finish()
+    currentSpan.reset(token)
+
+    if exporter is not None:
+        exporter.export(finished)
+
+
+@contextmanager
+def span(
+        name: str,
+        **attributes
+) -> Iterator[Span | None]:
+    """
+    Traces the body of a with statement as a child of the current span.
+
+    Args:
+        name (str): The name of the operation.
+        **attributes: Extra information about the operation.
+
+    Yields:
+        Span | None: The span, or None if tracing is disabled.
+    """
+    token: Token | None = startSpan(name, **attributes)
+    try:
+        yield currentSpan.get() if token is not None else None
+    finally:
+        finishSpan(token)
+
+
+def traced(
+        func: Callable
+) -> Callable:
+    """
+    Decorator that traces every call of a function or method, named after its qualified name (e.g. GameHandler.list).
+
+    Args:
+        func (Callable): The function to trace.
+
+    Returns:
+        Callable: The wrapped function.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        if exporter is None:
+            return func(*args, **kwargs)
+
+        with span(func.__qualname__):
+            return func(*args, **kwargs)
+
+    return wrapper
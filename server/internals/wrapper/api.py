@@ -8,6 +8,9 @@ Contains the API class.
 
 # Local Imports
 from .handlers import *
+from .entities import EntityStore
+from .taxonomy import Taxonomy
+from ..catalog import CatalogStore, CatalogSync
 from ..config import Config
 from ..clogging import createLogger
 from ..requester import Requester
@@ -22,9 +25,18 @@ class API:
         "config",
         "logger",
         "requester",
+        "catalog",
+        "catalogSync",
+        "taxonomy",
+        "entities",
         "creator",
         "developer",
         "game",
+        "genre",
+        "platform",
+        "publisher",
+        "store",
+        "tag",
     )
 
     def __init__(
@@ -42,7 +54,30 @@ class API:
 
         self.requester: Requester = Requester(config)  # Create a requester object to use
 
+        # Create the local catalog mirror and start keeping it up to date
+        self.catalog: CatalogStore | None = CatalogStore(config) if config.catalog.enabled else None
+        self.catalogSync: CatalogSync | None = None
+
+        if self.catalog is not None and config.catalog.sync:
+            self.catalogSync = CatalogSync(config, self.catalog, self.requester)
+            self.catalogSync.start()
+
+        # Load the reference sets in the background
+        self.taxonomy: Taxonomy | None = None
+
+        if config.taxonomy.enabled:
+            self.taxonomy = Taxonomy(config, self.requester)
+            self.taxonomy.start()
+
+        # Keep the entities embedded in responses
+        self.entities: EntityStore | None = EntityStore(config) if config.entities.enabled else None
+
         # Create the handlers
         self.creator = CreatorHandler(self.logger, self.requester)
-        self.developer = DeveloperHandler(self.logger, self.requester)
-        self.game = GameHandler(self.logger, self.requester)
+        self.developer = DeveloperHandler(self.logger, self.requester, self.taxonomy, self.entities)
+        self.game = GameHandler(self.logger, self.requester, self.catalog, self.taxonomy, self.entities)
+        self.genre = GenreHandler(self.logger, self.requester, self.taxonomy, self.entities)
+        self.platform = PlatformHandler(self.logger, self.requester, self.taxonomy, self.entities)
+        self.publisher = PublisherHandler(self.logger, self.requester, self.taxonomy, self.entities)
+        self.store = StoreHandler(self.logger, self.requester, self.taxonomy, self.entities)
+        self.tag = TagHandler(self.logger, self.requester, self.taxonomy, self.entities)
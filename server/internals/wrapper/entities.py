@@ -0,0 +1,190 @@
+"""
+Contains the EntityStore class.
+"""
+
+# Standard Library Imports
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Local Imports
+from ..config import Config
+
+# Constants
+EMBEDDED: Dict[str, Tuple[str, str | None]] = {  # The kind of the entities in each list field, and the key they are under
+    "genres": ("genres", None),
+    "tags": ("tags", None),
+    "developers": ("developers", None),
+    "publishers": ("publishers", None),
+    "stores": ("stores", "store"),
+    "platforms": ("platforms", "platform"),
+    "parent_platforms": ("parent_platforms", "platform")
+}
+DETAIL_FIELDS: tuple[str, ...] = ("id", "name", "slug", "description")  # What the details endpoints add to list items
+
+
+def requiredFields(
+        model: type
+) -> List[str]:
+    """
+    Gets the fields a pydantic model can not be built without.
+
+    Args:
+        model (type): The model.
+
+    Returns:
+        List[str]: The names of the fields.
+    """
+    return [name for name, field in model.model_fields.items() if field.is_required()]
+
+
+class Entity:
+    """
+    The fields of one entity, each with when it was last seen.
+    """
+    __slots__ = ("fields", "seen")
+
+    def __init__(self) -> None:
+        """
+        Initializes the Entity.
+        """
+        self.fields: Dict[str, Any] = {}
+        self.seen: Dict[str, float] = {}
+
+
+class EntityStore:
+    """
+    A normalized cache of every game, genre, platform, store, tag, developer and publisher seen in a RAWG response,
+    keyed by kind and id (or slug).
+
+    Responses embed partial copies of other entities (a games list carries each game's genres and tags), so every
+    payload is split into its entities and merged field by field. Each field keeps when it was last seen, so a lookup
+    only uses the fields that are fresh enough, and a live fetch is only needed when one it wants is missing or stale.
+    """
+    __slots__ = ("lock", "entities", "slugs", "maxAge", "maxEntries")
+
+    def __init__(
+            self,
+            config: Config
+    ) -> None:
+        """
+        Initializes the EntityStore.
+
+        Args:
+            config (Config): The configuration object.
+        """
+        self.lock: Lock = Lock()
+        self.entities: OrderedDict[Tuple[str, int], Entity] = OrderedDict()  # Least recently used first
+        self.slugs: Dict[Tuple[str, str], int] = {}
+        self.maxAge: float = config.entities.maxAge
+        self.maxEntries: int = config.entities.maxEntries
+
+    def ingest(
+            self,
+            kind: str,
+            payloads: Iterable[Dict]
+    ) -> None:
+        """
+        Merges entities from a response into the store, along with the entities embedded in them.
+
+        Args:
+            kind (str): The kind of the entities, such as games or genres.
+            payloads (Iterable[Dict]): The entities, as returned by RAWG.
+
+        Returns:
+            None
+        """
+        now: float = time()
+
+        with self.lock:
+            for payload in payloads:
+                self._upsert(kind, payload, now)
+
+            while len(self.entities) > self.maxEntries:
+                (evictedKind, evictedId), evicted = self.entities.popitem(last=False)
+                slugKey: Tuple[str, Any] = (evictedKind, evicted.fields.get("slug"))
+
+                # The slug may have moved to another entity since, which keeps it
+                if self.slugs.get(slugKey) == evictedId:
+                    del self.slugs[slugKey]
+
+    def _upsert(
+            self,
+            kind: str,
+            payload: Dict,
+            now: float
+    ) -> None:
+        """
+        Merges one entity and the entities embedded in it. The lock must be held.
+
+        Args:
+            kind (str): The kind of the entity.
+            payload (Dict): The entity.
+            now (float): When it was seen.
+
+        Returns:
+            None
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+            return
+
+        key: Tuple[str, int] = (kind, payload["id"])
+        entity: Entity | None = self.entities.get(key)
+
+        if entity is None:
+            entity = self.entities[key] = Entity()
+        else:
+            self.entities.move_to_end(key)
+
+        entity.fields.update(payload)
+        entity.seen.update(dict.fromkeys(payload, now))
+
+        if payload.get("slug"):
+            self.slugs[(kind, payload["slug"])] = payload["id"]
+
+        for field, (embeddedKind, wrapper) in EMBEDDED.items():
+            if not isinstance(payload.get(field), list):
+                continue
+
+            for item in payload[field]:
+                self._upsert(embeddedKind, item.get(wrapper) if wrapper is not None and isinstance(item, dict) else item, now)
+
+    def get(
+            self,
+            kind: str,
+            id: int | str,
+            fields: Iterable[str],
+            maxAge: float | None = None
+    ) -> Dict | None:
+        """
+        Gets an entity, if every field wanted was seen recently enough.
+
+        Args:
+            kind (str): The kind of the entity.
+            id (int | str): The id or slug of the entity.
+            fields (Iterable[str]): The fields needed.
+            maxAge (float | None): The oldest a field may be, in seconds. Defaults to entities.maxAge.
+
+        Returns:
+            Dict | None: Every fresh field of the entity, or None if one needed is missing or stale.
+        """
+        oldest: float = time() - (maxAge if maxAge is not None else self.maxAge)
+
+        with self.lock:
+            entityId: int | None = int(id) if str(id).isdigit() else self.slugs.get((kind, str(id)))
+            entity: Entity | None = self.entities.get((kind, entityId)) if entityId is not None else None
+
+            if entity is None:
+                return None
+
+            fresh: Dict[str, Any] = {
+                field: value for field, value in entity.fields.items() if entity.seen[field] >= oldest
+            }
+
+            if any(field not in fresh for field in fields):
+                return None
+
+            self.entities.move_to_end((kind, entityId))
+            return fresh
+
@@ -5,9 +5,19 @@ Initializes the handlers package.
 from .creator import CreatorHandler
 from .developer import DeveloperHandler
 from .game import GameHandler
+from .genre import GenreHandler
+from .platform import PlatformHandler
+from .publisher import PublisherHandler
+from .store import StoreHandler
+from .tag import TagHandler
 
 __all__ = [
     "CreatorHandler",
     "DeveloperHandler",
-    "GameHandler"
+    "GameHandler",
+    "GenreHandler",
+    "PlatformHandler",
+    "PublisherHandler",
+    "StoreHandler",
+    "TagHandler"
 ]
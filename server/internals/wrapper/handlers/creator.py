@@ -10,6 +10,8 @@ from ..response import Response
 from ..types import Creator
 from ...clogging import SuppressedLoggerAdapter
 from ...requester import Requester
+from ...timing import timed
+from ...tracing import traced
 
 
 # Third Party Imports
@@ -38,6 +40,7 @@ class CreatorHandler:
         self.logger = logger
         self.requester = requester
 
+    @traced
     def list(
             self,
             page: int = 1,
@@ -53,22 +56,24 @@ class CreatorHandler:
         Returns:
             List[Creator]: A list of creators.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             self.baseUrl, {
                 "page": page,
                 "page_size": pageSize
             }
             )
 
-        creators: List[Creator] = [
-            Creator(**creator) for creator in response["results"]
-        ]
+        with timed("validate"):
+            creators: List[Creator] = [
+                Creator(**creator) for creator in response["results"]
+            ]
 
         return Response(
             data=response,
             results=creators
         )
 
+    @traced
     def details(
             self,
             id: int | str
@@ -82,5 +87,8 @@ class CreatorHandler:
         Returns:
             Creator: The creator.
         """
-        self.logger.info(f"Getting creator details with id: {id}")
-        return Creator(**self.requester.get(f"{self.baseUrl}/{id}"))
+        self.logger.info("Getting creator details with id: %s", id)
+        data: Dict = self.requester.get(f"{self.baseUrl}/{id}")
+
+        with timed("validate"):
+            return Creator(**data)
@@ -8,8 +8,12 @@ from typing import Dict, List
 # Local Imports
 from ..response import Response
 from ..types import Developer
+from ..entities import DETAIL_FIELDS, EntityStore
+from ..taxonomy import Taxonomy
 from ...clogging import SuppressedLoggerAdapter
 from ...requester import Requester
+from ...timing import timed
+from ...tracing import traced
 
 
 # Third Party Imports
@@ -20,12 +24,14 @@ class DeveloperHandler:
     Handles managing Developer requests.
     """
 
-    __slots__ = ("logger", "baseUrl", "requester")
+    __slots__ = ("logger", "baseUrl", "requester", "taxonomy", "entities")
 
     def __init__(
             self,
             logger: SuppressedLoggerAdapter,
-            requester: Requester
+            requester: Requester,
+            taxonomy: Taxonomy | None = None,
+            entities: EntityStore | None = None
     ) -> None:
         """
         Initializes the DeveloperHandler class.
@@ -33,11 +39,16 @@ class DeveloperHandler:
         Args:
             logger (SuppressedLoggerAdapter): The logger to use.
             requester (Requester): The requester to use.
+            taxonomy (Taxonomy | None): The in-memory reference sets to answer from when they are loaded, if any.
+            entities (EntityStore | None): The entities seen in earlier responses, if any.
         """
         self.baseUrl = "developers"
         self.logger = logger
         self.requester = requester
+        self.taxonomy = taxonomy
+        self.entities = entities
 
+    @traced
     def list(
             self,
             page: int = 1,
@@ -53,22 +64,31 @@ class DeveloperHandler:
         Returns:
             List[Developer]: A list of developers.
         """
-        response: Dict = self.requester.get(
-            self.baseUrl, {
-                "page": page,
-                "page_size": pageSize
-            }
+        # Serve the page from memory once the set is loaded
+        response: Dict | None = self.taxonomy.list(self.baseUrl, page, pageSize) if self.taxonomy is not None else None
+
+        if response is None:
+            response = self.requester.getPage(
+                self.baseUrl, {
+                    "page": page,
+                    "page_size": pageSize
+                }
             )
 
-        developers: List[Developer] = [
-            Developer(**developer) for developer in response["results"]
-        ]
+            if self.entities is not None:
+                self.entities.ingest(self.baseUrl, response.get("results", []))
+
+        with timed("validate"):
+            developers: List[Developer] = [
+                Developer(**developer) for developer in response["results"]
+            ]
 
         return Response(
             data=response,
             results=developers
         )
 
+    @traced
     def details(
             self,
             id: int | str
@@ -82,5 +102,21 @@ class DeveloperHandler:
         Returns:
             Developer: The developer.
         """
-        self.logger.info(f"Getting developer details with id: {id}")
-        return Developer(**self.requester.get(f"{self.baseUrl}/{id}"))
+        self.logger.info("Getting developer details with id: %s", id)
+        data: Dict | None = self.taxonomy.details(self.baseUrl, id) if self.taxonomy is not None else None
+
+        # Then from an earlier details response, if it is recent enough
+        if data is None and self.entities is not None:
+            data = self.entities.get(self.baseUrl, id, DETAIL_FIELDS)
+
+        if data is None:
+            data = self.requester.get(f"{self.baseUrl}/{id}")
+
+            if self.taxonomy is not None:
+                self.taxonomy.remember(self.baseUrl, data)
+
+            if self.entities is not None:
+                self.entities.ingest(self.baseUrl, [data])
+
+        with timed("validate"):
+            return Developer(**data)
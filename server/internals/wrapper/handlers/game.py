@@ -4,19 +4,35 @@ Contains the Creator handler.
 # Standard Library Imports
 from datetime import datetime as Datetime
 from json import dumps
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 # Local Imports
 from ..response import Response
 from ..types import Developer, Game, Genre, Platform, Publisher, Store, Tag
 from ..types.game import *
-from ...helpers import addParameters
+from ..entities import EntityStore, requiredFields
+from ..taxonomy import Taxonomy
+from ...catalog import CatalogStore
+from ...helpers import PAGE_SIZE, TAXONOMY_PARAMETERS, addParameters, prefetchPages
 from ...clogging import SuppressedLoggerAdapter
-from ...requester import Requester
+from ...requester import Requester, pastEnd
+from ...timing import timed
+from ...tracing import traced
 
 
 # Third Party Imports
 
+# Constants
+SUMMARY_FIELDS: List[str] = requiredFields(Game)  # What a game needs from earlier lists to be served from them
+DETAILS_FIELDS: List[str] = [*SUMMARY_FIELDS, "description"]
+EXPORT_PAGE_SIZE: int = 500  # Games read from the mirror at once by exports
+
+
+class ExportError(Exception):
+    """
+    Raised when an export stops before its last game, so the caller can tell the client to resume it.
+    """
+
 
 def gamesFromData(
         data: Dict
@@ -68,12 +84,15 @@ class GameHandler:
     Handles managing Game requests.
     """
 
-    __slots__ = ("logger", "baseUrl", "requester")
+    __slots__ = ("logger", "baseUrl", "requester", "catalog", "taxonomy", "entities")
 
     def __init__(
             self,
             logger: SuppressedLoggerAdapter,
-            requester: Requester
+            requester: Requester,
+            catalog: CatalogStore | None = None,
+            taxonomy: Taxonomy | None = None,
+            entities: EntityStore | None = None
     ) -> None:
         """
         Initializes the GameHandler class.
@@ -81,11 +100,18 @@ class GameHandler:
         Args:
             logger (SuppressedLoggerAdapter): The logger to use.
             requester (Requester): The requester to use.
+            catalog (CatalogStore | None): The local catalog mirror to answer from when it can, if any.
+            taxonomy (Taxonomy | None): The in-memory reference sets, used to resolve filter slugs to ids, if any.
+            entities (EntityStore | None): The entities seen in earlier responses, if any.
         """
         self.baseUrl = "games"
         self.logger = logger
         self.requester = requester
+        self.catalog = catalog
+        self.taxonomy = taxonomy
+        self.entities = entities
 
+    @traced
     def list(
             self,
             page: int = 1,
@@ -154,7 +180,7 @@ class GameHandler:
 
         # Add parameters
         parameters = addParameters(
-            parameters, {  # This is almost definitely going to throw an error
+            parameters, {
                 "search": search,
                 "search_precise": searchPrecise,
                 "search_exact": searchExact,
@@ -176,19 +202,122 @@ class GameHandler:
                 "exclude_game_series": excludeGameSeries,
                 "exclude_stores": excludeStores,
                 "ordering": ordering
-            }
+            },
+            self.taxonomy
         )
 
-        response: Dict = self.requester.get(
-            self.baseUrl,
-            parameters
-        )
+        # Answer from the mirror when it covers the query
+        response: Dict | None = self.catalog.query(parameters) if self.catalog is not None else None
+
+        if response is None:
+            response = self.requester.getPage(
+                self.baseUrl,
+                parameters
+            )
+
+        if self.entities is not None:
+            self.entities.ingest("games", response["results"])
+
+        with timed("validate"):
+            games: List[Game] = [Game(**game) for game in response["results"]]
 
         return Response(
             data=response,
-            results=[Game(**game) for game in response["results"]]
+            results=games
         )
 
+    def iterate(
+            self,
+            **filters
+    ) -> Iterator[Game]:
+        """
+        Walks every game matching a query, fetching the next page while the current one is being consumed.
+
+        Args:
+            **filters: The filters and ordering of GameHandler.list(), without page and pageSize.
+
+        Returns:
+            Iterator[Game]: The games.
+        """
+        for response in prefetchPages(
+                lambda page: self.list(page=page, pageSize=PAGE_SIZE, **filters),
+                lambda response: response.next is None
+        ):
+            yield from response
+
+    def export(
+            self,
+            parameters: Dict[str, Any],
+            offset: int = 0
+    ) -> Iterator[List[Dict]]:
+        """
+        Walks every game matching a query, page by page, for bulk exports. The mirror is read when it covers the query,
+        otherwise RAWG is, fetching the next page while the current one is being consumed. At most api.exportLimit
+        games are read from RAWG per export. Nothing is cached, and the games are not validated or added to the entity
+        store.
+
+        Args:
+            parameters (Dict[str, Any]): The query parameters, as sent to RAWG, without page and page_size.
+            offset (int): The number of games to skip, to resume an export.
+
+        Returns:
+            Iterator[List[Dict]]: The games of each page, as returned by RAWG.
+
+        Raises:
+            ExportError: If the walk stopped before the last game, because of an error, the mirror no longer covering
+                the query or the RAWG limit.
+        """
+        # Resolve the slugs in the filters to ids, as GameHandler.list() does
+        parameters = addParameters(
+            {}, {
+                key: value.split(",") if key in TAXONOMY_PARAMETERS and isinstance(value, str) else value
+                for key, value in parameters.items()
+            },
+            self.taxonomy
+        )
+
+        fromCatalog: bool = self.catalog is not None and self.catalog.covers(parameters)
+        pageSize: int = EXPORT_PAGE_SIZE if fromCatalog else PAGE_SIZE
+        page, skip = divmod(offset, pageSize)
+
+        if fromCatalog:
+            pages: Iterator[Dict | None] = prefetchPages(
+                lambda number: self.catalog.query({**parameters, "page": number, "page_size": pageSize}),
+                lambda data: data is None or data["next"] is None,
+                page + 1
+            )
+        else:
+            pages: Iterator[Dict | None] = self.requester.pages(
+                self.baseUrl,
+                parameters,
+                page + 1,
+                pageSize,
+                limit=max(self.requester.config.api.exportLimit // pageSize, 1),
+                noStore=True
+            )
+
+        data: Dict | None = None
+
+        for data in pages:
+            if data is None:
+                raise ExportError("The catalog mirror stopped covering the query")
+
+            # RAWG answers pages past the end with an error instead of results
+            if "results" not in data:
+                if pastEnd(data):
+                    return
+
+                raise ExportError("Upstream request failed")
+
+            results: List[Dict] = data["results"][skip:]
+            skip = 0
+
+            if results:
+                yield results
+
+        if data is not None and data["next"] is not None:
+            raise ExportError("Export limit reached")
+
     @property
     def trending(self):
         """
@@ -199,6 +328,39 @@ class GameHandler:
         """
         return self.list(ordering="-rating")
 
+    @traced
+    def ranked(
+            self,
+            score: str,
+            pageSize: int = 20,
+            year: int = None
+    ) -> Response | None:
+        """
+        Gets the best games for a score computed locally from the catalog mirror. RAWG has no equivalent, so callers
+        fall back to an ordered GameHandler.list() when this returns None.
+
+        Args:
+            score (str): The score, one of trending, popular or rated.
+            pageSize (int): Number of results to return.
+            year (int): Only games released in this year, for the rated score.
+
+        Returns:
+            Response | None: The games, or None if there is no mirror or its scores are not built yet.
+        """
+        response: Dict | None = self.catalog.ranked(score, pageSize, year) if self.catalog is not None else None
+
+        if response is None:
+            return None
+
+        with timed("validate"):
+            games: List[Game] = [Game(**game) for game in response["results"]]
+
+        return Response(
+            data=response,
+            results=games
+        )
+
+    @traced
     def dlcs(
             self,
             id: int | str,
@@ -216,7 +378,7 @@ class GameHandler:
         Returns:
             List[Game]: A list of games.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/additions",
             {
                 "game_pk": id,
@@ -225,15 +387,20 @@ class GameHandler:
             }
         )
 
-        games: List[Game] = [
-            Game(**game) for game in response["results"]
-        ]
+        if self.entities is not None:
+            self.entities.ingest("games", response.get("results", []))
+
+        with timed("validate"):
+            games: List[Game] = [
+                Game(**game) for game in response["results"]
+            ]
 
         return Response(
             data=response,
             results=games
         )
 
+    @traced
     def team(
             self,
             id: int | str,
@@ -253,7 +420,7 @@ class GameHandler:
         Returns:
             List[Dict]: A list of team members.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/development-team",
             {
                 "game_pk": id,
@@ -268,6 +435,7 @@ class GameHandler:
             results=response["results"]
         )
 
+    @traced
     def series(
             self,
             id: int | str,
@@ -285,7 +453,7 @@ class GameHandler:
         Returns:
             List[Game]: A list of games.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/game-series",
             {
                 "game_pk": id,
@@ -294,15 +462,20 @@ class GameHandler:
             }
         )
 
-        games: List[Game] = [
-            Game(**game) for game in response["results"]
-        ]
+        if self.entities is not None:
+            self.entities.ingest("games", response.get("results", []))
+
+        with timed("validate"):
+            games: List[Game] = [
+                Game(**game) for game in response["results"]
+            ]
 
         return Response(
             data=response,
             results=games
         )
 
+    @traced
     def parents(
             self,
             id: int | str,
@@ -320,7 +493,7 @@ class GameHandler:
         Returns:
             List[Game]: A list of games.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/parent-games",
             {
                 "game_pk": id,
@@ -329,15 +502,20 @@ class GameHandler:
             }
         )
 
-        games: List[Game] = [
-            Game(**game) for game in response["results"]
-        ]
+        if self.entities is not None:
+            self.entities.ingest("games", response.get("results", []))
+
+        with timed("validate"):
+            games: List[Game] = [
+                Game(**game) for game in response["results"]
+            ]
 
         return Response(
             data=response,
             results=games
         )
 
+    @traced
     def screenshots(
             self,
             id: int | str,
@@ -357,7 +535,7 @@ class GameHandler:
         Returns:
             List[Dict]: A list of screenshots.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/screenshots",
             {
                 "game_pk": id,
@@ -372,6 +550,7 @@ class GameHandler:
             results=response["results"]
         )
 
+    @traced
     def stores(
             self,
             id: int | str,
@@ -391,7 +570,7 @@ class GameHandler:
         Returns:
             List[Dict]: A list of stores.
         """
-        response: Dict = self.requester.get(
+        response: Dict = self.requester.getPage(
             f"{self.baseUrl}/{id}/stores",
             {
                 "game_pk": id,
@@ -406,6 +585,7 @@ class GameHandler:
             results=response["results"]  # TODO: Convert all instances of results to Objects
         )
 
+    @traced
     def details(
             self,
             id: int | str
@@ -419,9 +599,78 @@ class GameHandler:
         Returns:
             Game: The game.
         """
-        self.logger.info(f"Getting game details with id: {id}")
-        return Game(**self.requester.get(f"{self.baseUrl}/{id}"))
+        self.logger.info("Getting game details with id: %s", id)
+        data: Dict | None = self.catalog.getGame(id) if self.catalog is not None else None
+
+        # Then from an earlier details response, if it is recent enough
+        if data is None and self.entities is not None:
+            data = self.entities.get(self.baseUrl, id, DETAILS_FIELDS)
+
+        if data is None:
+            data = self.requester.get(f"{self.baseUrl}/{id}")
+
+            # Keep the details in the mirror until the game next changes
+            if self.catalog is not None and "id" in data:
+                self.catalog.upsertGames([data], detailed=True)
+
+            if self.entities is not None:
+                self.entities.ingest(self.baseUrl, [data])
+
+        with timed("validate"):
+            return Game(**data)
 
+    @traced
+    def similar(
+            self,
+            id: int,
+            pageSize: int = 6
+    ) -> List[Game]:
+        """
+        Gets the games most similar to a game, by the tags, genres, developers and platforms they share. These are
+        computed from the catalog mirror, as RAWG has no equivalent.
+
+        Args:
+            id (int): The id of the game.
+            pageSize (int): Number of results to return.
+
+        Returns:
+            List[Game]: The games, most similar first. Empty if there is no mirror or it has not compared the games yet.
+        """
+        games: List[Dict] | None = self.catalog.similarGames(id, pageSize) if self.catalog is not None else None
+
+        with timed("validate"):
+            return [Game(**game) for game in games or []]
+
+    @traced
+    def summary(
+            self,
+            id: int | str,
+            fields: Iterable[str] = ()
+    ) -> Game:
+        """
+        Gets the summary of a game: the fields a games list has, without the description and other details. Served
+        from the games seen in earlier lists when they are recent enough, so it rarely needs a request.
+
+        Args:
+            id (int | str): The id of the game (can be either rawgId or slug).
+            fields (Iterable[str]): Optional fields that must be fresh too, such as esrb_rating.
+
+        Returns:
+            Game: The game. Has its details too when they had to be fetched.
+        """
+        data: Dict | None = self.entities.get(
+            self.baseUrl,
+            id,
+            [*SUMMARY_FIELDS, *fields]
+        ) if self.entities is not None else None
+
+        if data is None:
+            return self.details(id)
+
+        with timed("validate"):
+            return Game(**data)
+
+    @traced
     def achievements(  # TODO: Figure out what the hell this actually returns. The API docs are useless
             self,
             id: int | str
@@ -447,6 +696,7 @@ class GameHandler:
             results=response["results"]
         )
 
+    @traced
     def trailers(  # TODO: Figure out what the hell this actually returns. The API docs are useless
             self,
             id: int | str
@@ -472,6 +722,7 @@ class GameHandler:
             results=response["results"]
         )
 
+    @traced
     def reddit(  # TODO: Figure out what the hell this actually returns. The API docs are useless
             self,
             id: int | str
@@ -497,6 +748,7 @@ class GameHandler:
             results=response["results"]
         )
 
+    @traced
     def reviews(  # This does not exist in the API docs
             self,
             id: int | str
@@ -517,7 +769,10 @@ class GameHandler:
             }
         )
 
+        with timed("validate"):
+            reviews: List[Review] = [Review(**review) for review in response["results"]]
+
         return Response(
             data=response,
-            results=[Review(**review) for review in response["results"]]
+            results=reviews
         )
@@ -22,6 +22,7 @@ class Response:
     next: Optional[str] = None
     previous: Optional[str] = None
     results: List[BaseModel]
+    facets: Optional[Dict[str, List[Dict]]] = None  # Facet value counts, only for lists answered by the catalog mirror
 
     def __iter__(self) -> iter:
         return iter(self.results)
@@ -45,3 +46,4 @@ class Response:
         self.next = data["next"]
         self.previous = data["previous"]
         self.results = results
+        self.facets = data.get("facets")
@@ -0,0 +1,433 @@
+"""
+Contains the Taxonomy class.
+"""
+
+# Standard Library Imports
+from fcntl import LOCK_EX, LOCK_UN, flock
+from json import dumps, loads
+from os import replace
+from pathlib import Path
+from threading import Event, Thread
+from time import time
+from typing import Any, Dict, List
+from urllib.parse import urlencode
+
+# Local Imports
+from ..clogging import SuppressedLoggerAdapter, createLogger
+from ..clogging.registry import ensureDirectory
+from ..config import Config
+from ..helpers import PAGE_SIZE
+from ..requester import Requester, pastEnd
+
+# Constants
+ENDPOINTS: Dict[str, str] = {  # The RAWG endpoint listing each set
+    "genres": "genres",
+    "platforms": "platforms",
+    "parent_platforms": "platforms/lists/parents",
+    "stores": "stores",
+    "tags": "tags",
+    "developers": "developers",
+    "publishers": "publishers"
+}
+
+
+class TaxonomySet:
+    """
+    Every item of one set, in RAWG's order, indexed by id and by slug.
+    """
+    __slots__ = ("items", "byId", "bySlug")
+
+    def __init__(
+            self,
+            items: List[Dict]
+    ) -> None:
+        """
+        Initializes the TaxonomySet.
+
+        Args:
+            items (List[Dict]): The items, as returned by the list endpoint.
+        """
+        self.items: List[Dict] = items
+        self.byId: Dict[int, Dict] = {item["id"]: item for item in items}
+        self.bySlug: Dict[str, Dict] = {item["slug"]: item for item in items if item.get("slug")}
+
+    def get(
+            self,
+            id: int | str
+    ) -> Dict | None:
+        """
+        Gets an item by id or slug.
+
+        Args:
+            id (int | str): The id or slug.
+
+        Returns:
+            Dict | None: The item, or None if it is not in the set.
+        """
+        return self.byId.get(int(id)) if str(id).isdigit() else self.bySlug.get(str(id))
+
+
+class Taxonomy(Thread):
+    """
+    A background thread that loads the genres, platforms, stores, tags and other small reference sets from RAWG, and
+    keeps them in memory so they are listed, looked up and resolved from slugs without a request.
+
+    Each set is loaded by walking every page, then swapped in whole, and reloaded every taxonomy.refreshInterval hours.
+    Until a set is loaded, callers fall back to RAWG. Every worker runs a Taxonomy, but only one of them loads each set
+    from RAWG: it saves the set to taxonomy.path, and a file lock makes the others wait for it and read that copy.
+    """
+
+    def __init__(
+            self,
+            config: Config,
+            requester: Requester
+    ) -> None:
+        """
+        Initializes the Taxonomy.
+
+        Args:
+            config (Config): The configuration object.
+            requester (Requester): The requester to use.
+        """
+        super().__init__(name="Taxonomy", daemon=True)
+        self.config: Config = config
+        self.requester: Requester = requester
+        self.logger: SuppressedLoggerAdapter = createLogger(
+            "Taxonomy",
+            level=config.logging.level,
+            config=config
+        )
+        self.sets: Dict[str, TaxonomySet] = {}
+        self.stopped: Event = Event()
+        self.path: Path = Path(config.taxonomy.path)
+        self.lockPath: Path = self.path / "taxonomy.lock"
+        self.readVersions: Dict[str, float] = {}  # The modification time of the shared copy each set was read from
+
+    def run(self) -> None:
+        """
+        Refreshes every set every taxonomy.refreshInterval hours until stopped.
+
+        Returns:
+            None
+        """
+        while not self.stopped.is_set():
+            try:
+                loaded: bool = self.refresh()
+            except Exception:
+                self.logger.exception("Refreshing the taxonomy failed")
+                loaded = False
+
+            # A set that failed keeps its previous copy, and is tried again sooner than the next refresh
+            self.stopped.wait(
+                self.config.taxonomy.refreshInterval * 60 * 60 if loaded else self.config.taxonomy.retryInterval * 60
+            )
+
+    def refresh(self) -> bool:
+        """
+        Reloads the sets whose shared copy is due, then reads any shared copy newer than the set in memory. The lock is
+        held throughout, so workers that start together wait for the first one's load instead of each calling RAWG.
+
+        Returns:
+            bool: Whether every set is loaded.
+        """
+        ensureDirectory(self.path)
+
+        with open(self.lockPath, "a") as lockFile:
+            flock(lockFile, LOCK_EX)
+
+            try:
+                loaded: bool = True
+
+                for name in self.config.taxonomy.sets:
+                    try:
+                        due: bool = self._isDue(name)
+
+                        if due:
+                            self._attemptPath(name).touch()
+
+                        # A load that failed is retried sooner, while the older copy stays in use
+                        fresh: bool = not due or self.load(name)
+                        loaded = self.read(name) and fresh and loaded
+                    except Exception:
+                        self.logger.exception("Loading the %s failed", name)
+                        loaded = False
+
+                return loaded
+            finally:
+                flock(lockFile, LOCK_UN)
+
+    def stop(self) -> None:
+        """
+        Stops the refreshes after the current one.
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+
+    def load(
+            self,
+            name: str
+    ) -> bool:
+        """
+        Loads a set by walking every page of its list, then swaps it in and saves the shared copy. The set already
+        loaded is kept unless every page was read.
+
+        Args:
+            name (str): The set, one of ENDPOINTS.
+
+        Returns:
+            bool: Whether the set was loaded.
+        """
+        items: List[Dict] = []
+        finished: bool = False
+
+        for data in self.requester.pages(ENDPOINTS[name], skipCache=True, noStore=True):
+            if self.stopped.is_set():
+                return False  # Stopped part way through, keep the set already loaded
+
+            # RAWG answers pages past the end with an error instead of results
+            if "results" not in data:
+                finished = pastEnd(data)
+
+                if not finished:
+                    self.logger.error("Loading the %s failed on page %s: %s", name, len(items) // PAGE_SIZE + 1, data)
+
+                break
+
+            items.extend(data["results"])
+            finished = data["next"] is None
+
+        if not finished:
+            return False
+
+        # Written aside and moved into place, so other workers never read half a set
+        sharedPath: Path = self._sharedPath(name)
+        partialPath: Path = sharedPath.with_suffix(".partial")
+        partialPath.write_text(dumps(items))
+        replace(partialPath, sharedPath)
+
+        self._swap(name, items)
+        self.readVersions[name] = sharedPath.stat().st_mtime
+        self.logger.info("Loaded %s %s", len(items), name)
+        return True
+
+    def read(
+            self,
+            name: str
+    ) -> bool:
+        """
+        Swaps in the shared copy of a set if it is newer than the one in memory.
+
+        Args:
+            name (str): The set, one of ENDPOINTS.
+
+        Returns:
+            bool: Whether the set is loaded.
+        """
+        sharedPath: Path = self._sharedPath(name)
+
+        if sharedPath.exists() and sharedPath.stat().st_mtime != self.readVersions.get(name):
+            self.readVersions[name] = sharedPath.stat().st_mtime
+            self._swap(name, loads(sharedPath.read_text()))
+            self.logger.debug("Read %s %s loaded by another worker", len(self.sets[name].items), name)
+
+        return name in self.sets
+
+    def _swap(
+            self,
+            name: str,
+            items: List[Dict]
+    ) -> None:
+        """
+        Swaps in a set, keeping the descriptions already fetched from the details endpoint.
+
+        Args:
+            name (str): The set.
+            items (List[Dict]): The items, as returned by the list endpoint.
+
+        Returns:
+            None
+        """
+        previous: TaxonomySet | None = self.sets.get(name)
+
+        if previous is not None:
+            items = [{**previous.byId.get(item["id"], {}), **item} for item in items]
+
+        self.sets[name] = TaxonomySet(items)
+
+    def _isDue(
+            self,
+            name: str
+    ) -> bool:
+        """
+        Checks whether a set should be loaded from RAWG: its shared copy is missing or older than
+        taxonomy.refreshInterval hours, and no worker has failed to load it in the last taxonomy.retryInterval minutes.
+
+        Args:
+            name (str): The set.
+
+        Returns:
+            bool: Whether to load the set.
+        """
+        now: float = time()
+        sharedPath: Path = self._sharedPath(name)
+        attemptPath: Path = self._attemptPath(name)
+
+        shared: float | None = sharedPath.stat().st_mtime if sharedPath.exists() else None
+        attempted: float | None = attemptPath.stat().st_mtime if attemptPath.exists() else None
+
+        if shared is not None and now - shared < self.config.taxonomy.refreshInterval * 60 * 60:
+            return False
+
+        # The attempt is touched before loading, so one newer than the shared copy failed
+        if attempted is not None and (shared is None or attempted > shared):
+            return now - attempted >= self.config.taxonomy.retryInterval * 60
+
+        return True
+
+    def _sharedPath(
+            self,
+            name: str
+    ) -> Path:
+        """
+        Gets the path of the shared copy of a set.
+
+        Args:
+            name (str): The set.
+
+        Returns:
+            Path: The path.
+        """
+        return self.path / f"{name}.json"
+
+    def _attemptPath(
+            self,
+            name: str
+    ) -> Path:
+        """
+        Gets the path of the file touched whenever a worker tries to load a set, so a failing load is not retried by
+        every worker in turn.
+
+        Args:
+            name (str): The set.
+
+        Returns:
+            Path: The path.
+        """
+        return self.path / f"{name}.attempt"
+
+    def list(
+            self,
+            name: str,
+            page: int,
+            pageSize: int
+    ) -> Dict | None:
+        """
+        Gets a page of a set.
+
+        Args:
+            name (str): The set.
+            page (int): The page number.
+            pageSize (int): The number of items per page.
+
+        Returns:
+            Dict | None: The page in the same shape as RAWG's, or None if the set is not loaded.
+        """
+        taxonomySet: TaxonomySet | None = self.sets.get(name)
+
+        if taxonomySet is None:
+            return None
+
+        count: int = len(taxonomySet.items)
+
+        return {
+            "count": count,
+            "next": self._pageUrl(name, page + 1, pageSize) if page * pageSize < count else None,
+            "previous": self._pageUrl(name, page - 1, pageSize) if page > 1 else None,
+            "results": taxonomySet.items[(page - 1) * pageSize:page * pageSize]
+        }
+
+    def details(
+            self,
+            name: str,
+            id: int | str
+    ) -> Dict | None:
+        """
+        Gets an item with its details (the description), if they have been fetched before.
+
+        Args:
+            name (str): The set.
+            id (int | str): The id or slug of the item.
+
+        Returns:
+            Dict | None: The item, or None if it or its details are not loaded.
+        """
+        taxonomySet: TaxonomySet | None = self.sets.get(name)
+        item: Dict | None = taxonomySet.get(id) if taxonomySet is not None else None
+
+        return item if item is not None and "description" in item else None
+
+    def remember(
+            self,
+            name: str,
+            item: Dict
+    ) -> None:
+        """
+        Keeps the details of an item fetched from RAWG, so they are served from memory from then on.
+
+        Args:
+            name (str): The set.
+            item (Dict): The item, as returned by the details endpoint.
+
+        Returns:
+            None
+        """
+        taxonomySet: TaxonomySet | None = self.sets.get(name)
+
+        if taxonomySet is None or "id" not in item or item["id"] not in taxonomySet.byId:
+            return
+
+        taxonomySet.byId[item["id"]].update(item)
+
+    def resolve(
+            self,
+            name: str,
+            value: Any
+    ) -> Any:
+        """
+        Resolves a slug to the id of the item it belongs to.
+
+        Args:
+            name (str): The set.
+            value (Any): The id or slug.
+
+        Returns:
+            Any: The id, or the value as given if it is not a slug of a loaded item.
+        """
+        taxonomySet: TaxonomySet | None = self.sets.get(name)
+
+        if taxonomySet is None or not isinstance(value, str) or value.isdigit():
+            return value
+
+        item: Dict | None = taxonomySet.bySlug.get(value)
+        return item["id"] if item is not None else value
+
+    def _pageUrl(
+            self,
+            name: str,
+            page: int,
+            pageSize: int
+    ) -> str:
+        """
+        Builds the RAWG url of another page of a set, so pages served from memory look like RAWG's.
+
+        Args:
+            name (str): The set.
+            page (int): The page number.
+            pageSize (int): The number of items per page.
+
+        Returns:
+            str: The url.
+        """
+        return f"{self.config.api.base.rstrip("/")}/{ENDPOINTS[name]}?{urlencode({"page": page, "page_size": pageSize})}"
@@ -6,18 +6,23 @@ Main file for IA3 Project.
 from datetime import datetime
 from logging import getLogger
 from os import chdir, getcwd
+from time import perf_counter
 from typing import List
 from uuid import uuid4
 
 # Third Party Imports
-from flask import Flask, Response, g, request
+from flask import Flask, Response, before_render_template, g, request, template_rendered
 from flask_injector import FlaskInjector
 from injector import Binder, singleton
 
 # Local Imports
-from internals.clogging import SuppressedLoggerAdapter, createLogger
+from internals.clogging import Deferred, SuppressedLoggerAdapter, createLogger
 from internals.config import Config
+from internals.metrics import renderLatency, routeLatency
+from internals.profiling import RequestProfiler
 from internals.routes import *
+from internals.timing import addTiming, getServerTimingHeader
+from internals.tracing import configureTracing, finishSpan, startSpan
 from internals.wrapper.api import API
 
 # Constants
@@ -47,6 +52,12 @@ if not config.server.debug:
 # Connect to the API
 api: API = API(config)
 
+# Create the request profiler
+profiler: RequestProfiler = RequestProfiler(config)
+
+# Start the trace exporter
+configureTracing(config)
+
 # Add a workaround for a bug in FlaskInjector
 Flask.url_for.__annotations__ = {}
 
@@ -63,6 +74,9 @@ app.register_blueprint(gamesBlueprint)
 app.register_blueprint(testsBlueprint)
 app.register_blueprint(apiBlueprint)
 app.register_blueprint(errorsBlueprint)
+app.register_blueprint(metricsBlueprint)
+app.register_blueprint(profilesBlueprint)
+app.register_blueprint(exportBlueprint)
 
 
 @app.before_request
@@ -77,14 +91,64 @@ def beforeRequest() -> None:
     """
     # Set request uuid
     g.uuid = uuid4()
+    g.startTime = perf_counter()
     g.completed = False
+    g.traceToken = startSpan(f"{request.method} {request.path}", traceId=str(g.uuid), endpoint=request.endpoint)
     logger.info(  # 2 spaces here to match the indentation of the response log
-        f"Request  [{g.uuid}] [{request.method}] [{request.path}] from {request.headers['X-Forwarded-For'] if 'X-Forwarded-For' in request.headers else request.remote_addr} with "
-        f"with cookies {request.cookies.to_dict()}"
+        "Request  [%s] [%s] [%s] from %s with cookies %s",
+        g.uuid,
+        request.method,
+        request.path,
+        request.headers.get("X-Forwarded-For", request.remote_addr),
+        Deferred(request.cookies.to_dict)
     )
+
+    profiler.start()
     return
 
 
+@before_render_template.connect_via(app)
+def beforeRender(
+        sender: Flask,
+        **extra
+) -> None:
+    """
+    Runs before a template is rendered. Starts the render timer.
+
+    Args:
+        sender (Flask): The app rendering the template.
+        **extra: The template and its context.
+
+    Returns:
+        None
+    """
+    g.renderStart = perf_counter()
+    g.renderToken = startSpan("render", template=extra["template"].name)
+
+
+@template_rendered.connect_via(app)
+def afterRender(
+        sender: Flask,
+        **extra
+) -> None:
+    """
+    Runs after a template is rendered. Adds the render time to the request's latency breakdown.
+
+    Args:
+        sender (Flask): The app that rendered the template.
+        **extra: The template and its context.
+
+    Returns:
+        None
+    """
+    if "renderStart" in g:
+        elapsed: float = perf_counter() - g.pop("renderStart")
+        addTiming("render", elapsed)
+        renderLatency.labels(extra["template"].name).observe(elapsed)
+
+    finishSpan(g.pop("renderToken", None))
+
+
 @app.context_processor
 def processor() -> dict:
     """
@@ -112,7 +176,14 @@ def afterRequest(
     """
     g.completed = True
     g.response = response
-    logger.info(f"Response [{g.uuid}] [{response.status_code}]")
+    elapsed: float = perf_counter() - g.startTime
+    addTiming("total", elapsed)
+    routeLatency.labels(request.endpoint or "unmatched").observe(elapsed)
+    profiler.stop(response)
+    logger.info("Response [%s] [%s]", g.uuid, response.status_code)
+
+    if config.server.serverTiming:
+        response.headers["Server-Timing"] = getServerTimingHeader()
 
     # # Add a theme cookie to the response if the user doesn't have one
     # if "theme" not in request.cookies:
@@ -126,6 +197,27 @@ def afterRequest(
     return response
 
 
+@app.teardown_request
+def teardownRequest(
+        error: BaseException | None
+) -> None:
+    """
+    Runs at the end of every request, even if it failed. Makes sure no profiler is left running and closes the
+    request's trace.
+
+    Args:
+        error (BaseException | None): The error that ended the request, if any.
+
+    Returns:
+        None
+    """
+    profiler.discard()
+
+    # A template that failed to render leaves its span open
+    finishSpan(g.pop("renderToken", None))
+    finishSpan(g.pop("traceToken", None))
+
+
 def configureDependencies(
         binder: Binder
 ) -> None:
@@ -140,6 +232,7 @@ def configureDependencies(
     """
     binder.bind(Config, config, scope=singleton)
     binder.bind(API, api, scope=singleton)
+    binder.bind(RequestProfiler, profiler, scope=singleton)
 
 
 # Add dependencies
@@ -148,7 +241,12 @@ FlaskInjector(app=app, modules=[configureDependencies])
 # Run the app
 if __name__ == "__main__":
     # Log the start of the server including what address and port it is running on
-    logger.info(f"Server started on following addresses: {f'{"https" if config.server.ssl else "http"}://{config.server.host}:{config.server.port}'}")
+    logger.info(
+        "Server started on following addresses: %s://%s:%s",
+        "https" if config.server.ssl else "http",
+        config.server.host,
+        config.server.port
+    )
 
     app.run(
         host=config.server.host,
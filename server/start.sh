@@ -1 +1,5 @@
+# Workers share their metrics through this directory, it must be emptied before the server starts
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/ia3-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 authbind --deep gunicorn -b 127.0.0.1:8001 -w 8 wsgi:app
@@ -31,6 +31,26 @@ function _get(url, parameters = {}) {
 }
 
 
+function _getMany(requests) {
+    // Fetch several /api/ urls in one round trip. Takes an object of {url, parameters} by name, and resolves to an
+    // object of their responses by the same names. A sub-request that failed has {error, status} as its response
+    return fetch("/api/batch", {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json"
+        },
+        body: JSON.stringify(requests)
+    }).then(response => {
+        // Reject when the batch itself was refused, rather than passing the error page on as the responses
+        if (!response.ok) {
+            throw new Error(`Batch request failed with status ${response.status}`);
+        }
+
+        return response.json();
+    });
+}
+
+
 // Adds a child div with the message to the parent div
 function fillError(div, message) {
     // Create a new div
@@ -1,3 +1,39 @@
 async function runSearch() {
 
-}
\ No newline at end of file
+}
+
+// Search-as-you-type suggestions for the game search box
+let suggestionTimeout = null;
+let latestSuggestionQuery = "";
+
+function fillSuggestions(query) {
+    latestSuggestionQuery = query;
+
+    _get("/games/suggest", {q: query, limit: 10}).then(suggestions => {
+        // Ignore responses to anything other than the latest keystroke
+        if (query !== latestSuggestionQuery) {
+            return;
+        }
+
+        let datalist = document.getElementById("search-suggestions");
+        datalist.replaceChildren(...suggestions.map(suggestion => {
+            let option = document.createElement("option");
+            option.value = suggestion.name;
+            return option;
+        }));
+    });
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    let search = document.getElementById("search-input");
+
+    if (!search) {
+        return;
+    }
+
+    search.addEventListener("input", () => {
+        // Wait for a short pause in typing before asking for suggestions
+        clearTimeout(suggestionTimeout);
+        suggestionTimeout = setTimeout(() => fillSuggestions(search.value.trim()), 100);
+    });
+});
@@ -92,4 +92,92 @@ async function getListClass(){
 
     // Send the user to the /tests/game/list page
     window.location.href = "/tests/game/list?" + new URLSearchParams(params).toString();
-}
\ No newline at end of file
+}
+
+// The tests of a single game's resources, by the prefix of their inputs, with the path under /api/games/<id> and the
+// parameters they read
+const GAME_TESTS = {
+    details: {path: "", parameters: []},
+    additions: {path: "/additions", parameters: ["page", "page_size"]},
+    creators: {path: "/development-team", parameters: ["ordering", "page", "page_size"]},
+    series: {path: "/game-series", parameters: ["page", "page_size"]},
+    parents: {path: "/parent-games", parameters: ["page", "page_size"]},
+    screenshots: {path: "/screenshots", parameters: ["page", "page_size"]},
+    stores: {path: "/stores", parameters: ["ordering", "page", "page_size"]},
+    achievements: {path: "/achievements", parameters: []},
+    trailers: {path: "/movies", parameters: []},
+    reddit: {path: "/reddit", parameters: []}
+};
+
+function getGameRequest(test) {
+    // Get the id, which is required
+    let id = document.getElementById(`${test}-id`).value;
+
+    if (!id) {
+        return null;
+    }
+
+    // Create the parameters object, appending those that are not empty
+    let params = {};
+
+    for (let parameter of GAME_TESTS[test].parameters) {
+        let value = document.getElementById(`${test}-${parameter.replace("_", "-")}`).value;
+
+        if (value) { params[parameter] = value; }
+    }
+
+    return {url: `/api/games/${id}${GAME_TESTS[test].path}`, parameters: params};
+}
+
+async function getGameResources(tests) {
+    // Get every test that has an id, and display an error for a lone test without one
+    let requests = {};
+
+    for (let test of tests) {
+        let gameRequest = getGameRequest(test);
+
+        if (gameRequest) {
+            requests[test] = gameRequest;
+        } else if (tests.length === 1) {
+            fillError(document.getElementById(`get-${test}-response`), "Please enter an ID");
+        }
+    }
+
+    if (Object.keys(requests).length === 0) {
+        return;
+    }
+
+    // Get the data in one round trip
+    let data;
+
+    try {
+        data = await _getMany(requests);
+    } catch (error) {
+        for (let test of Object.keys(requests)) {
+            fillError(document.getElementById(`get-${test}-response`), error.message);
+        }
+
+        return;
+    }
+
+    // Display data using json-view
+    for (let [test, response] of Object.entries(data)) {
+        setResponse(jsonview.create(response), `get-${test}-response`);
+    }
+}
+
+async function getAllGameResources() {
+    // Run every test of a single game that has an id
+    await getGameResources(Object.keys(GAME_TESTS));
+}
+
+async function getDetails() { await getGameResources(["details"]); }
+async function getAdditions() { await getGameResources(["additions"]); }
+async function getCreators() { await getGameResources(["creators"]); }
+async function getSeries() { await getGameResources(["series"]); }
+async function getParents() { await getGameResources(["parents"]); }
+async function getScreenshots() { await getGameResources(["screenshots"]); }
+async function getStores() { await getGameResources(["stores"]); }
+async function getAchievements() { await getGameResources(["achievements"]); }
+async function getTrailers() { await getGameResources(["trailers"]); }
+async function getReddit() { await getGameResources(["reddit"]); }
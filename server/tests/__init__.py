@@ -0,0 +1,5 @@
+"""
+Tests for the server. Run from the server directory, with a config.yaml in place, using:
+
+    python -m unittest discover tests
+"""
@@ -0,0 +1,309 @@
+"""
+Contains the MemoryStore class, a stand-in for CatalogStore used to build the catalog indexes in tests and benchmarks,
+the StubRawg class, a stand-in for the RAWG API, and helpers to create real mirrors, indexes and requesters for tests.
+"""
+
+# Standard Library Imports
+from json import dumps, loads
+from pathlib import Path
+from sqlite3 import Connection, Row, connect
+from threading import Lock
+from time import sleep, time
+from typing import Any, Dict, Iterable, List, Tuple, Type
+from urllib.parse import urlencode
+
+# Local Imports
+from internals import requester
+from internals.catalog.index import CatalogIndex
+from internals.catalog.store import CatalogStore
+from internals.config import Config
+from internals.helpers import config
+
+# Constants
+SCHEMA: Path = Path(__file__).parent.parent / "internals" / "catalog" / "schema.sql"
+BASE: str = "https://rawg.test/api/"
+
+
+class MemoryStore:
+    """
+    An in-memory catalog mirror with the same schema as CatalogStore, holding only the games given to it.
+    """
+    __slots__ = ("config", "connection", "state")
+
+    def __init__(self) -> None:
+        """
+        Initializes the MemoryStore.
+        """
+        self.config: Config = config
+        self.connection: Connection = connect(":memory:", check_same_thread=False)
+        self.connection.row_factory = Row
+        self.connection.executescript(SCHEMA.read_text())
+        self.state: Dict[str, Any] = {"version": "1"}
+
+    def addGames(
+            self,
+            games: Iterable[Dict]
+    ) -> None:
+        """
+        Adds games to the mirror.
+
+        Args:
+            games (Iterable[Dict]): The games, each with at least an id, slug and name.
+
+        Returns:
+            None
+        """
+        self.connection.executemany(
+            """
+            INSERT OR REPLACE INTO games (id, slug, name, added, ratings_count, payload, synced)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    game["id"], game["slug"], game["name"], game.get("added", 0), game.get("ratings_count", 0),
+                    dumps(game), time()
+                ) for game in games
+            ]
+        )
+        self.connection.commit()
+
+    def getState(
+            self,
+            key: str
+    ) -> Any:
+        """
+        Gets a value of the sync state.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            Any: The value, or None.
+        """
+        return self.state.get(key)
+
+
+def buildIndex(
+        indexClass: Type[CatalogIndex],
+        store: MemoryStore
+) -> CatalogIndex:
+    """
+    Builds an index on the calling thread, rather than in the background, so it can be queried straight away.
+
+    Args:
+        indexClass (Type[CatalogIndex]): The index to build.
+        store (MemoryStore): The mirror to build it from.
+
+    Returns:
+        CatalogIndex: The built index.
+    """
+    index: CatalogIndex = indexClass(store)
+    index.state = index.build(None)
+    index.version = index.currentVersion()
+    return index
+
+
+def createStore(
+        directory: str,
+        complete: bool = True
+) -> CatalogStore:
+    """
+    Creates an empty mirror in a directory, with its own copy of the configuration.
+
+    Args:
+        directory (str): The directory to keep the database in.
+        complete (bool): Whether to mark the mirror as completely crawled and freshly synced.
+
+    Returns:
+        CatalogStore: The mirror.
+    """
+    storeConfig: Config = Config()
+    storeConfig.catalog.path = f"{directory}/catalog.sqlite3"
+    storeConfig.catalog.fuzzySearch = False
+
+    store: CatalogStore = CatalogStore(storeConfig)
+
+    if complete:
+        store.setState(complete=time(), lastSync=time())
+
+    return store
+
+
+def closeStore(
+        store: CatalogStore
+) -> None:
+    """
+    Waits for the indexes building in the background to finish, then closes the mirror, so its directory can be removed.
+
+    Args:
+        store (CatalogStore): The mirror.
+
+    Returns:
+        None
+    """
+    indexes: List[CatalogIndex] = [store.columns, store.facets, store.scores, store.suggestions]
+
+    while any(index.building for index in indexes):
+        sleep(0.01)
+
+    store.connection.close()
+
+
+class StubResponse:
+    """
+    A stand-in for a requests response.
+    """
+    __slots__ = ("data", "content")
+
+    def __init__(
+            self,
+            data: Dict
+    ) -> None:
+        """
+        Initializes the StubResponse.
+
+        Args:
+            data (Dict): The JSON body.
+        """
+        self.data: Dict = data
+        self.content: bytes = dumps(data).encode()
+
+    def json(self) -> Dict:
+        """
+        Gets the JSON body.
+
+        Returns:
+            Dict: A copy of the body, as each call of the real method decodes it again.
+        """
+        return loads(self.content)
+
+
+class StubRawg:
+    """
+    A stand-in for the RAWG games endpoints, called the same way as requests.get. It answers the games list, game
+    details by id or slug, and pages past the end with RAWG's error, and records every call.
+    """
+
+    def __init__(
+            self,
+            count: int,
+            delay: float = 0
+    ) -> None:
+        """
+        Initializes the StubRawg.
+
+        Args:
+            count (int): How many games the list has.
+            delay (float): Seconds each call takes.
+        """
+        self.__name__: str = "get"  # The requester logs the name of the requests function it calls
+        self.games: List[Dict] = [{"id": id, "slug": f"game-{id}", "name": f"Game {id}"} for id in range(1, count + 1)]
+        self.delay: float = delay
+        self.calls: List[Tuple[str, Dict]] = []
+        self.lock: Lock = Lock()
+        self.failing: set[int] = set()  # Pages of the games list that fail
+
+    def __call__(
+            self,
+            url: str,
+            params: Dict | None = None,
+            **kwargs
+    ) -> StubResponse:
+        """
+        Answers a request.
+
+        Args:
+            url (str): The URL.
+            params (Dict | None): The query parameters.
+            **kwargs: The other request options, ignored.
+
+        Returns:
+            StubResponse: The response.
+        """
+        params = {key: value for key, value in (params or {}).items() if key != "key"}
+
+        with self.lock:
+            self.calls.append((url, params))
+
+        sleep(self.delay)
+        parts: List[str] = url.removeprefix(BASE).strip("/").split("/")
+
+        if parts == ["games"]:
+            return StubResponse(self.list(url, params))
+
+        game: Dict | None = next((game for game in self.games if parts[1] in (str(game["id"]), game["slug"])), None)
+        return StubResponse(game or {"detail": "Not found."})
+
+    def list(
+            self,
+            url: str,
+            params: Dict
+    ) -> Dict:
+        """
+        Answers a page of the games list.
+
+        Args:
+            url (str): The URL.
+            params (Dict): The query parameters.
+
+        Returns:
+            Dict: The page, or RAWG's error for a page past the end.
+        """
+        try:
+            page: int = int(params.get("page", 1))
+            pageSize: int = int(params.get("page_size", 20))
+        except ValueError:
+            return {"detail": "Invalid page."}
+
+        if page in self.failing:
+            return {"detail": "Service unavailable."}
+
+        if page < 1 or pageSize < 1 or (page - 1) * pageSize >= len(self.games) and page > 1:
+            return {"detail": "Invalid page."}
+
+        return {
+            "count": len(self.games),
+            "next": f"{url}?{urlencode({**params, "page": page + 1})}" if page * pageSize < len(self.games) else None,
+            "previous": f"{url}?{urlencode({**params, "page": page - 1})}" if page > 1 else None,
+            "results": self.games[(page - 1) * pageSize:page * pageSize]
+        }
+
+    def listCalls(self) -> List[Dict]:
+        """
+        Gets the parameters of every call to the games list.
+
+        Returns:
+            List[Dict]: The parameters.
+        """
+        return [params for url, params in self.calls if url.removeprefix(BASE).strip("/") == "games"]
+
+
+def createRequester(
+        **api: Any
+) -> requester.Requester:
+    """
+    Creates a requester for a stub API, with an empty cache.
+
+    Args:
+        **api: Settings to change in the copy of config.api it uses.
+
+    Returns:
+        requester.Requester: The requester.
+    """
+    requesterConfig: Config = Config()
+    requesterConfig.api.base = BASE
+    requesterConfig.api.rateLimit = 0
+
+    for key, value in api.items():
+        setattr(requesterConfig.api, key, value)
+
+    # The cache, requests in flight and aliases are shared by every requester in the process
+    with requester.cacheLock:
+        requester.cache.clear()
+        requester.cacheSizes.clear()
+        requester.inFlight.clear()
+
+    with requester.aliasLock:
+        requester.aliases.clear()
+
+    return requester.Requester(requesterConfig)
@@ -0,0 +1,54 @@
+"""
+Tests the slug aliases the requester learns from responses.
+"""
+
+# Standard Library Imports
+from unittest import TestCase, main
+
+# Local Imports
+from internals import requester
+from internals.requester import canonicalize, learnResponse
+
+
+class AliasTests(TestCase):
+    """
+    Learns aliases from list and details responses into an empty table.
+    """
+
+    def setUp(self) -> None:
+        """
+        Forgets the aliases learnt by other tests.
+        """
+        requester.aliases.clear()
+
+    def tearDown(self) -> None:
+        """
+        Leaves the table empty for other tests.
+        """
+        requester.aliases.clear()
+
+    def test_rewrites_known_slugs(self) -> None:
+        """
+        A slug seen in a response, including those of embedded genres, is rewritten to its id.
+        """
+        learnResponse("games/portal-2", {"id": 4200, "slug": "portal-2", "genres": [{"id": 7, "slug": "puzzle"}]}, 100)
+
+        self.assertEqual(canonicalize("games/portal-2/additions", {"game_pk": "portal-2"}), ("games/4200/additions", {"game_pk": 4200}))
+        self.assertEqual(canonicalize("genres/puzzle", None), ("genres/7", None))
+        self.assertEqual(canonicalize("games/unknown", None), ("games/unknown", None))
+
+    def test_bounded_least_recently_used(self) -> None:
+        """
+        Beyond maxAliases the least recently used slugs are forgotten, and using a slug keeps it.
+        """
+        learnResponse("games", {"results": [{"id": id, "slug": f"game-{id}"} for id in range(1, 4)]}, 3)
+        canonicalize("games/game-1", None)
+        learnResponse("games", {"results": [{"id": 4, "slug": "game-4"}]}, 3)
+
+        self.assertEqual(len(requester.aliases), 3)
+        self.assertEqual(canonicalize("games/game-1", None), ("games/1", None))
+        self.assertEqual(canonicalize("games/game-2", None), ("games/game-2", None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Tests that identical requests made while one is on its way upstream wait for its response instead of being sent again.
+"""
+
+# Standard Library Imports
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Local Imports
+from internals.requester import Requester
+from tests.fixtures import StubRawg, createRequester
+
+# Constants
+CONCURRENT: int = 8  # Identical requests made at once
+DELAY: float = 0.3  # Seconds the stub API takes to answer, so every request is made while the first is in flight
+
+
+class CoalescingTests(TestCase):
+    """
+    Makes identical requests at once to a slow stub API.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a slow stub API with a few games and a requester for it.
+        """
+        self.rawg: StubRawg = StubRawg(5, delay=DELAY)
+        self.requester: Requester = createRequester(timeout=10)
+        self.patcher = patch("internals.requester.get", self.rawg)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """
+        Stops answering from the stub API.
+        """
+        self.patcher.stop()
+
+    def concurrently(
+            self,
+            url: str,
+            params: Dict | None = None
+    ) -> List[Dict]:
+        """
+        Makes the same request from several threads at once.
+
+        Args:
+            url (str): The URL.
+            params (Dict | None): The parameters.
+
+        Returns:
+            List[Dict]: The response each thread got.
+        """
+        with ThreadPoolExecutor(max_workers=CONCURRENT) as executor:
+            return list(executor.map(
+                lambda _: self.requester.get(url, dict(params) if params is not None else None),
+                range(CONCURRENT)
+            ))
+
+    def test_sent_once(self) -> None:
+        """
+        Identical requests in flight at once make a single upstream call, and every caller gets its response.
+        """
+        responses: List[Dict] = self.concurrently("games", {"page": 2, "page_size": 2})
+
+        self.assertEqual(len(self.rawg.calls), 1)
+        self.assertEqual([[game["id"] for game in response["results"]] for response in responses], [[3, 4]] * CONCURRENT)
+
+    def test_slug_then_id(self) -> None:
+        """
+        Requests by a slug not yet known wait for the first, whose response is cached under the id it turns out to have,
+        and a later request by that id is answered from the cache.
+        """
+        responses: List[Dict] = self.concurrently("games/game-3")
+
+        self.assertEqual(len(self.rawg.calls), 1)
+        self.assertEqual([response["id"] for response in responses], [3] * CONCURRENT)
+
+        self.assertEqual(self.requester.get("games/3")["slug"], "game-3")
+        self.assertEqual(len(self.rawg.calls), 1)
+
+    def test_sent_after_timeout(self) -> None:
+        """
+        A request that waited api.timeout seconds without a response is sent itself.
+        """
+        self.requester.config.api.timeout = DELAY / 10
+        responses: List[Dict] = self.concurrently("games/2")
+
+        self.assertEqual(len(self.rawg.calls), CONCURRENT)
+        self.assertEqual([response["id"] for response in responses], [2] * CONCURRENT)
+
+
+if __name__ == "__main__":
+    main()
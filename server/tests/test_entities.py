@@ -0,0 +1,99 @@
+"""
+Tests the EntityStore: merging embedded entities, field freshness and least recently used eviction.
+"""
+
+# Standard Library Imports
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Local Imports
+from internals.config import Config
+from internals.wrapper.entities import EntityStore
+
+
+class EntityStoreTests(TestCase):
+    """
+    Ingests small responses into a store holding at most three entities.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates an empty store for each test.
+        """
+        storeConfig: Config = Config()
+        storeConfig.entities.maxAge = 60
+        storeConfig.entities.maxEntries = 3
+        self.store: EntityStore = EntityStore(storeConfig)
+
+    def ingestAt(
+            self,
+            now: float,
+            kind: str,
+            *payloads
+    ) -> None:
+        """
+        Ingests payloads as if they were seen at a given time.
+
+        Args:
+            now (float): The time they were seen.
+            kind (str): The kind of the entities.
+            *payloads: The entities.
+
+        Returns:
+            None
+        """
+        with patch("internals.wrapper.entities.time", return_value=now):
+            self.store.ingest(kind, payloads)
+
+    def test_embedded_entities_and_slugs(self) -> None:
+        """
+        Entities embedded in a game are stored under their own kind, and found by id or slug.
+        """
+        self.ingestAt(1000, "games", {"id": 1, "slug": "portal", "name": "Portal", "genres": [{"id": 7, "slug": "puzzle"}]})
+
+        with patch("internals.wrapper.entities.time", return_value=1010):
+            self.assertEqual(self.store.get("games", "portal", ["name"])["id"], 1)
+            self.assertEqual(self.store.get("genres", 7, ["slug"])["slug"], "puzzle")
+            self.assertIsNone(self.store.get("genres", 7, ["description"]))
+
+    def test_fields_expire_separately(self) -> None:
+        """
+        Only the fields seen within maxAge are used, so a lookup needing an older field misses.
+        """
+        self.ingestAt(1000, "games", {"id": 1, "name": "Portal", "description": "Old"})
+        self.ingestAt(1050, "games", {"id": 1, "name": "Portal"})
+
+        with patch("internals.wrapper.entities.time", return_value=1080):
+            self.assertEqual(self.store.get("games", 1, ["name"]), {"id": 1, "name": "Portal"})
+            self.assertIsNone(self.store.get("games", 1, ["description"]))
+            self.assertIsNotNone(self.store.get("games", 1, ["description"], maxAge=100))
+
+    def test_least_recently_used_evicted(self) -> None:
+        """
+        Past maxEntries, the entity used least recently is dropped, along with its slug.
+        """
+        self.ingestAt(1000, "games", {"id": 1, "slug": "a"}, {"id": 2, "slug": "b"}, {"id": 3, "slug": "c"})
+
+        with patch("internals.wrapper.entities.time", return_value=1000):
+            self.store.get("games", 1, ["slug"])
+
+        self.ingestAt(1000, "games", {"id": 4, "slug": "d"})
+
+        with patch("internals.wrapper.entities.time", return_value=1000):
+            self.assertIsNone(self.store.get("games", 2, ["slug"]))
+            self.assertIsNone(self.store.get("games", "b", ["slug"]))
+            self.assertIsNotNone(self.store.get("games", "a", ["slug"]))
+
+    def test_evicted_slug_claimed_by_another(self) -> None:
+        """
+        Evicting an entity keeps its old slug's mapping when another entity has taken the slug since.
+        """
+        self.ingestAt(1000, "games", {"id": 1, "slug": "portal"}, {"id": 2, "slug": "portal"})
+        self.ingestAt(1000, "games", {"id": 3, "slug": "c"}, {"id": 4, "slug": "d"})
+
+        with patch("internals.wrapper.entities.time", return_value=1000):
+            self.assertEqual(self.store.get("games", "portal", ["slug"])["id"], 2)
+
+
+if __name__ == "__main__":
+    main()
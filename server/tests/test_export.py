@@ -0,0 +1,242 @@
+"""
+Tests game exports: resuming them from a cursor, from the mirror and from RAWG, and the line an export that stops early
+ends with.
+"""
+
+# Standard Library Imports
+from json import loads
+from logging import getLogger
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from typing import Dict, List
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Third Party Imports
+from flask import Flask
+from flask_injector import FlaskInjector
+from injector import Binder, singleton
+
+# Local Imports
+from internals.catalog.store import CatalogStore
+from internals.clogging import SuppressedLoggerAdapter
+from internals.helpers import PAGE_SIZE
+from internals.requester import Requester
+from internals.routes.export import exportBlueprint
+from internals.wrapper import API
+from internals.wrapper.handlers.game import EXPORT_PAGE_SIZE, ExportError, GameHandler
+from tests.fixtures import StubRawg, closeStore, createRequester, createStore
+
+# Constants
+GAMES: int = 150  # Three full pages from RAWG and a partial one
+CATALOG_GAMES: int = 1100  # Two full pages from the mirror and a partial one
+
+# Add a workaround for a bug in FlaskInjector, as main.py does
+Flask.url_for.__annotations__ = {}
+
+
+def exported(
+        handler: GameHandler,
+        offset: int = 0
+) -> List[int]:
+    """
+    Exports every game, from an offset.
+
+    Args:
+        handler (GameHandler): The handler to export with.
+        offset (int): The number of games to skip.
+
+    Returns:
+        List[int]: The ids of the games exported.
+    """
+    return [game["id"] for results in handler.export({}, offset) for game in results]
+
+
+class RawgExportTests(TestCase):
+    """
+    Exports from a stub API, without a mirror.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a stub API with 150 games and a handler reading from it.
+        """
+        self.rawg: StubRawg = StubRawg(GAMES)
+        self.requester: Requester = createRequester(exportLimit=1000)
+        self.handler: GameHandler = GameHandler(SuppressedLoggerAdapter(getLogger("tests.export")), self.requester)
+        self.patcher = patch("internals.requester.get", self.rawg)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """
+        Stops answering from the stub API.
+        """
+        self.patcher.stop()
+
+    def test_resumes_from_cursor(self) -> None:
+        """
+        An export resumed from any cursor, on or off a page boundary, gets exactly the games after it, starting at the
+        page the cursor is on.
+        """
+        ids: List[int] = [game["id"] for game in self.rawg.games]
+
+        for offset in (0, 1, PAGE_SIZE - 1, PAGE_SIZE, PAGE_SIZE + 1, GAMES - 1, GAMES, GAMES + PAGE_SIZE):
+            with self.subTest(offset=offset):
+                self.rawg.calls.clear()
+
+                self.assertEqual(exported(self.handler, offset), ids[offset:])
+                self.assertEqual(self.rawg.listCalls()[0]["page"], offset // PAGE_SIZE + 1)
+                self.assertEqual({params["page_size"] for params in self.rawg.listCalls()}, {PAGE_SIZE})
+
+    def test_stops_at_export_limit(self) -> None:
+        """
+        At most exportLimit games are read from RAWG, and an export cut off by it raises rather than ending quietly.
+        """
+        self.requester.config.api.exportLimit = 2 * PAGE_SIZE
+        received: List[int] = []
+
+        with self.assertRaisesRegex(ExportError, "Export limit reached"):
+            for results in self.handler.export({}, 10):
+                received.extend(game["id"] for game in results)
+
+        self.assertEqual(len(received), 2 * PAGE_SIZE - 10)
+        self.assertEqual(len(self.rawg.listCalls()), 2)
+
+    def test_ends_at_last_page(self) -> None:
+        """
+        An export that reaches the last page within the limit ends without an error.
+        """
+        self.requester.config.api.exportLimit = 4 * PAGE_SIZE
+
+        self.assertEqual(len(exported(self.handler)), GAMES)
+
+
+class CatalogExportTests(TestCase):
+    """
+    Exports from a complete mirror, which is read in larger pages than RAWG.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a mirror with 1100 games, and a handler that would fail any request to RAWG.
+        """
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.store: CatalogStore = createStore(self.directory.name)
+        self.store.upsertGames([{"id": id, "slug": f"game-{id}", "name": f"Game {id}"} for id in range(1, CATALOG_GAMES + 1)])
+        self.rawg: StubRawg = StubRawg(0)
+        self.handler: GameHandler = GameHandler(
+            SuppressedLoggerAdapter(getLogger("tests.export")),
+            createRequester(),
+            self.store
+        )
+        self.patcher = patch("internals.requester.get", self.rawg)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """
+        Stops answering from the stub API, then closes and removes the mirror.
+        """
+        self.patcher.stop()
+        closeStore(self.store)
+        self.directory.cleanup()
+
+    def test_resumes_from_cursor(self) -> None:
+        """
+        A cursor is a number of games, so it resumes at the same game although the mirror's pages are larger.
+        """
+        ids: List[int] = exported(self.handler)
+        self.assertEqual(sorted(ids), list(range(1, CATALOG_GAMES + 1)))
+
+        for offset in (1, PAGE_SIZE, EXPORT_PAGE_SIZE - 1, EXPORT_PAGE_SIZE, EXPORT_PAGE_SIZE + PAGE_SIZE + 1, CATALOG_GAMES):
+            with self.subTest(offset=offset):
+                self.assertEqual(exported(self.handler, offset), ids[offset:])
+
+        self.assertEqual(self.rawg.calls, [])
+
+
+class ExportRouteTests(TestCase):
+    """
+    Streams exports from the route, against a stub API.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates an app serving only the export routes, with a handler reading from a stub API with 150 games.
+        """
+        self.rawg: StubRawg = StubRawg(GAMES)
+        self.requester: Requester = createRequester(exportLimit=1000)
+        handler: GameHandler = GameHandler(SuppressedLoggerAdapter(getLogger("tests.export")), self.requester)
+
+        def configureDependencies(
+                binder: Binder
+        ) -> None:
+            """
+            Binds a stand-in for the API holding only the game handler.
+
+            Args:
+                binder (Binder): The binder to use.
+
+            Returns:
+                None
+            """
+            binder.bind(API, SimpleNamespace(game=handler), scope=singleton)
+
+        app: Flask = Flask(__name__)
+        app.register_blueprint(exportBlueprint)
+        FlaskInjector(app=app, modules=[configureDependencies])
+        self.client = app.test_client()
+
+        self.patcher = patch("internals.requester.get", self.rawg)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """
+        Stops answering from the stub API.
+        """
+        self.patcher.stop()
+
+    def lines(
+            self,
+            cursor: int = 0
+    ) -> List[Dict]:
+        """
+        Streams an export.
+
+        Args:
+            cursor (int): The number of games already received.
+
+        Returns:
+            List[Dict]: The lines.
+        """
+        return [loads(line) for line in self.client.get(f"/export/games.ndjson?cursor={cursor}").text.splitlines()]
+
+    def test_error_line_carries_cursor(self) -> None:
+        """
+        An export stopped by a failed page ends with the number of games received, counting those before the cursor it
+        was started from, and resuming from it gets the rest.
+        """
+        self.rawg.failing.add(3)
+        lines: List[Dict] = self.lines(10)
+
+        self.assertEqual(lines[-1], {"error": "Upstream request failed", "cursor": 2 * PAGE_SIZE})
+        self.assertEqual([line["id"] for line in lines[:-1]], list(range(11, 2 * PAGE_SIZE + 1)))
+
+        self.rawg.failing.clear()
+        self.assertEqual([line["id"] for line in self.lines(lines[-1]["cursor"])], list(range(2 * PAGE_SIZE + 1, GAMES + 1)))
+
+    def test_limit_line_carries_cursor(self) -> None:
+        """
+        An export cut off by exportLimit ends with an error line, and is resumed from its cursor.
+        """
+        self.requester.config.api.exportLimit = 2 * PAGE_SIZE
+        lines: List[Dict] = self.lines()
+
+        self.assertEqual(lines[-1], {"error": "Export limit reached", "cursor": 2 * PAGE_SIZE})
+        self.assertEqual(len(lines), 2 * PAGE_SIZE + 1)
+
+        resumed: List[Dict] = self.lines(lines[-1]["cursor"])
+        self.assertEqual(resumed[0]["id"], 2 * PAGE_SIZE + 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Tests the TrigramIndex used for typo tolerant searches.
+"""
+
+# Standard Library Imports
+from unittest import TestCase, main
+
+# Local Imports
+from internals.catalog.fuzzy import TrigramIndex
+from tests.fixtures import MemoryStore, buildIndex
+
+
+class TrigramIndexTests(TestCase):
+    """
+    Searches a small catalog of similarly named games.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Builds the index once for every test.
+        """
+        store: MemoryStore = MemoryStore()
+        store.addGames(
+            [
+                {"id": 3328, "slug": "the-witcher-3-wild-hunt", "name": "The Witcher 3: Wild Hunt", "added": 20000,
+                 "alternative_names": ["Wiedźmin 3: Dziki Gon"]},
+                {"id": 10035, "slug": "the-witcher-2", "name": "The Witcher 2: Assassins of Kings", "added": 9000},
+                {"id": 11859, "slug": "the-witcher", "name": "The Witcher", "added": 8000},
+                {"id": 4200, "slug": "portal-2", "name": "Portal 2", "added": 18000},
+                {"id": 4286, "slug": "portal", "name": "Portal", "added": 15000},
+                {"id": 5679, "slug": "the-elder-scrolls-v-skyrim", "name": "The Elder Scrolls V: Skyrim", "added": 17000},
+                {"id": 1, "slug": "witch-hunter", "name": "Witch Hunter", "added": 10}
+            ]
+        )
+        cls.index = buildIndex(TrigramIndex, store)
+
+    def test_misspelt_query(self) -> None:
+        """
+        Transposed letters still find the game.
+        """
+        self.assertEqual(self.index.search("wticher 3")[0], 3328)
+
+    def test_exact_query(self) -> None:
+        """
+        An exact title ranks its game first.
+        """
+        self.assertEqual(self.index.search("portal 2")[0], 4200)
+
+    def test_alternative_name(self) -> None:
+        """
+        Games are found by their alternative names too.
+        """
+        self.assertEqual(self.index.search("wiedzmin 3")[0], 3328)
+
+    def test_missing_letter(self) -> None:
+        """
+        A dropped letter still finds the game.
+        """
+        self.assertEqual(self.index.search("skyrm")[0], 5679)
+
+    def test_no_match(self) -> None:
+        """
+        Queries unlike any title, and empty ones, match nothing.
+        """
+        self.assertEqual(self.index.search("zzzzqqqq"), [])
+        self.assertEqual(self.index.search("  "), [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Tests the logger adapter, and the json-lines sink: records crossing the log queue, rotation by size and cleaning up
+after exited workers.
+"""
+
+# Standard Library Imports
+from gzip import open as gzipOpen
+from json import loads
+from logging import DEBUG, ERROR, INFO, Handler, LogRecord, WARNING, getLogger
+from os import getpid
+from pathlib import Path
+from queue import SimpleQueue
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+from unittest import TestCase, main
+
+# Local Imports
+from internals.clogging import SuppressedLoggerAdapter
+from internals.clogging.formatters import JsonLinesFormatter
+from internals.clogging.handlers import JsonLinesFileHandler, MeasuredQueueHandler, MeasuredQueueListener
+
+# Constants
+DEAD_PID: int = 4194304  # Above the largest pid Linux hands out
+
+
+class RecordingHandler(Handler):
+    """
+    Keeps every record it is given.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the RecordingHandler.
+        """
+        super().__init__()
+        self.records: List[LogRecord] = []
+
+    def emit(
+            self,
+            record: LogRecord
+    ) -> None:
+        """
+        Keeps the record.
+
+        Args:
+            record (LogRecord): The record.
+
+        Returns:
+            None
+        """
+        self.records.append(record)
+
+
+class AdapterTests(TestCase):
+    """
+    Logs through a SuppressedLoggerAdapter to a recording handler.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a fresh logger and adapter for each test.
+        """
+        self.handler: RecordingHandler = RecordingHandler()
+        logger = getLogger(f"tests.adapter.{self.id()}")
+        logger.addHandler(self.handler)
+        logger.propagate = False
+        logger.setLevel(DEBUG)
+        self.adapter: SuppressedLoggerAdapter = SuppressedLoggerAdapter(logger)
+
+    def test_extra_without_adapter_extra(self) -> None:
+        """
+        Extra passed to a call is kept when the adapter was created without any.
+        """
+        self.adapter.info("With extra", extra={"requestId": "abc"})
+        self.assertEqual(self.handler.records[0].requestId, "abc")
+
+    def test_caller_is_origin(self) -> None:
+        """
+        The record points at the code that called the adapter, however it was called.
+        """
+        self.adapter.info("Through info")
+        self.adapter.log(INFO, "Through log")
+
+        def wrapper() -> None:
+            self.adapter.warning("Through a wrapper", stacklevel=2)
+
+        wrapper()
+
+        self.assertEqual([record.funcName for record in self.handler.records], ["test_caller_is_origin"] * 3)
+
+    def test_filtered_calls_format_nothing(self) -> None:
+        """
+        Callables are not called, and the message is not formatted, below the logger's level.
+        """
+        self.handler.setLevel(DEBUG)
+        self.adapter.logger.setLevel(WARNING)
+        calls: List[int] = []
+
+        self.adapter.debug(lambda: calls.append(1) or "Never built")
+        self.adapter.debug("Never formatted %s", 1)
+
+        self.assertEqual(calls, [])
+        self.assertEqual(self.handler.records, [])
+
+
+class JsonLinesSinkTests(TestCase):
+    """
+    Writes records through the queue to a file handler in a temporary directory.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates the temporary log directory.
+        """
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.path: Path = Path(self.directory.name)
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary log directory.
+        """
+        self.directory.cleanup()
+
+    def createHandler(
+            self,
+            **kwargs
+    ) -> JsonLinesFileHandler:
+        """
+        Creates a file handler for this process.
+
+        Args:
+            **kwargs: The rotation settings.
+
+        Returns:
+            JsonLinesFileHandler: The handler.
+        """
+        handler: JsonLinesFileHandler = JsonLinesFileHandler(self.path / f"ia3_{getpid()}.ndjson", **kwargs)
+        handler.setFormatter(JsonLinesFormatter())
+        return handler
+
+    def test_exception_survives_queue(self) -> None:
+        """
+        The traceback is written in the exception field rather than merged into the message.
+        """
+        handler: JsonLinesFileHandler = self.createHandler()
+        queue: SimpleQueue = SimpleQueue()
+        listener: MeasuredQueueListener = MeasuredQueueListener(queue, handler)
+        logger = getLogger("tests.logging")
+        logger.addHandler(MeasuredQueueHandler(queue))
+        logger.propagate = False
+        listener.start()
+
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Dividing %s failed", 1)
+
+        listener.stop()
+        handler.close()
+
+        data: Dict = loads((self.path / f"ia3_{getpid()}.ndjson").read_text())
+        self.assertEqual(data["message"], "Dividing 1 failed")
+        self.assertIn("ZeroDivisionError", data["exception"])
+
+    def test_rollover_measures_bytes(self) -> None:
+        """
+        A record is measured in encoded bytes, not characters.
+        """
+        handler: JsonLinesFileHandler = self.createHandler(maxBytes=200)
+        record: LogRecord = LogRecord("tests", ERROR, __file__, 0, "é" * 120, None, None)
+        handler.format = lambda record: record.msg  # Without the JSON escaping, so the record stays non-ASCII
+
+        # 120 characters, but 240 bytes
+        self.assertTrue(handler.shouldRollover(record))
+        handler.close()
+
+    def test_prunes_exited_workers(self) -> None:
+        """
+        An exited worker's file is rotated, and only backupCount of the exited workers' segments are kept.
+        """
+        for day in ("01", "02", "03"):
+            (self.path / f"ia3_{DEAD_PID}.ndjson.202601{day}-000000-000000").write_text("{}\n")
+
+        (self.path / f"ia3_{DEAD_PID - 1}.ndjson").write_text("{}\n")
+
+        handler: JsonLinesFileHandler = self.createHandler(backupCount=2)
+        handler.pruneOrphans()
+        handler.close()
+
+        remaining: List[str] = sorted(path.name for path in self.path.iterdir())
+        self.assertEqual(len(remaining), 2)
+        self.assertIn(f"ia3_{DEAD_PID}.ndjson.20260103-000000-000000", remaining)
+        self.assertTrue(any(name.startswith(f"ia3_{DEAD_PID - 1}.ndjson.") for name in remaining))
+
+    def test_compresses_exited_workers(self) -> None:
+        """
+        An exited worker's file is compressed like any rotated segment when compression is on.
+        """
+        (self.path / f"ia3_{DEAD_PID}.ndjson").write_text('{"message": "left behind"}\n')
+
+        handler: JsonLinesFileHandler = self.createHandler(compress=True)
+        handler.pruneOrphans()
+        handler.close()
+
+        segments: List[Path] = list(self.path.glob(f"ia3_{DEAD_PID}.ndjson.*.gz"))
+        self.assertEqual(len(segments), 1)
+
+        with gzipOpen(segments[0], "rt") as segment:
+            self.assertEqual(loads(segment.read())["message"], "left behind")
+
+
+if __name__ == "__main__":
+    main()
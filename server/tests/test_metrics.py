@@ -0,0 +1,109 @@
+"""
+Tests the metrics exposition with a stand-in for Prometheus scraping several workers, and who may scrape it.
+"""
+
+# Standard Library Imports
+from os import environ
+from pathlib import Path
+from subprocess import run
+from sys import executable
+from tempfile import TemporaryDirectory
+from typing import Dict
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Third Party Imports
+from prometheus_client.parser import text_string_to_metric_families as textStringToMetricFamilies
+
+# Local Imports
+from internals.metrics import generateLatest, isScraperAllowed
+
+# Constants
+SERVER: Path = Path(__file__).parent.parent
+WORKER: str = """
+from sys import argv
+from internals.metrics import catalogQueries, routeLatency
+for _ in range(int(argv[1])):
+    catalogQueries.labels("list", "hit").inc()
+    routeLatency.labels("games.index").observe(0.02)
+"""
+
+
+class MultiprocessExpositionTests(TestCase):
+    """
+    Scrapes the samples written by several worker processes, as Prometheus would under gunicorn.
+    """
+
+    def scrape(
+            self,
+            directory: str
+    ) -> Dict[str, float]:
+        """
+        Renders the metrics from the samples in a directory and parses them like a scraper.
+
+        Args:
+            directory (str): The PROMETHEUS_MULTIPROC_DIR the workers wrote to.
+
+        Returns:
+            Dict[str, float]: The value of each sample, keyed by its name and labels.
+        """
+        with patch.dict(environ, {"PROMETHEUS_MULTIPROC_DIR": directory}):
+            text: str = generateLatest().decode()
+
+        return {
+            f"{sample.name}{sorted(sample.labels.items())}": sample.value
+            for family in textStringToMetricFamilies(text)
+            for sample in family.samples
+        }
+
+    def test_totals_across_workers(self) -> None:
+        """
+        Counters and histograms from every worker are summed into one series.
+        """
+        with TemporaryDirectory() as directory:
+            for count in (3, 5, 7):
+                run(
+                    [executable, "-c", WORKER, str(count)],
+                    cwd=SERVER,
+                    env={**environ, "PROMETHEUS_MULTIPROC_DIR": directory},
+                    check=True
+                )
+
+            samples: Dict[str, float] = self.scrape(directory)
+
+        self.assertEqual(samples["ia3_catalog_queries_total[('kind', 'list'), ('result', 'hit')]"], 15)
+        self.assertEqual(samples["ia3_route_latency_seconds_count[('endpoint', 'games.index')]"], 15)
+        self.assertEqual(samples["ia3_route_latency_seconds_bucket[('endpoint', 'games.index'), ('le', '0.025')]"], 15)
+        self.assertEqual(samples["ia3_route_latency_seconds_bucket[('endpoint', 'games.index'), ('le', '0.01')]"], 0)
+
+
+class ScraperAllowedTests(TestCase):
+    """
+    Only the allowed addresses, or requests with the token, may read the metrics.
+    """
+
+    def test_addresses(self) -> None:
+        """
+        Addresses are matched exactly or by network, and anything unparseable is refused.
+        """
+        allowed: list[str] = ["127.0.0.1", "::1", "10.0.0.0/8"]
+
+        self.assertTrue(isScraperAllowed("127.0.0.1", None, allowed, None))
+        self.assertTrue(isScraperAllowed("::1", None, allowed, None))
+        self.assertTrue(isScraperAllowed("10.4.2.1", None, allowed, None))
+        self.assertFalse(isScraperAllowed("203.0.113.9", None, allowed, None))
+        self.assertFalse(isScraperAllowed("not an address", None, allowed, None))
+        self.assertFalse(isScraperAllowed(None, None, allowed, None))
+
+    def test_token(self) -> None:
+        """
+        The token is accepted from any address, and only when one is configured.
+        """
+        self.assertTrue(isScraperAllowed("203.0.113.9", "Bearer secret", [], "secret"))
+        self.assertFalse(isScraperAllowed("203.0.113.9", "Bearer wrong", [], "secret"))
+        self.assertFalse(isScraperAllowed("203.0.113.9", "Bearer ", [], ""))
+        self.assertFalse(isScraperAllowed("203.0.113.9", "Bearer None", [], None))
+
+
+if __name__ == "__main__":
+    main()
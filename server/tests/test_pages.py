@@ -0,0 +1,102 @@
+"""
+Tests Requester.getPage, which slices pages of any size out of the aligned pages it fetches.
+"""
+
+# Standard Library Imports
+from typing import Dict
+from unittest import TestCase, main
+from unittest.mock import patch
+
+# Local Imports
+from internals.requester import Requester
+from tests.fixtures import BASE, StubRawg, createRequester
+
+# Constants
+GAMES: int = 95  # Two full aligned pages and a partial one
+
+
+class GetPageTests(TestCase):
+    """
+    Compares getPage against the pages RAWG itself would answer.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a requester aligned to pages of 40, and a stub API with 95 games.
+        """
+        self.rawg: StubRawg = StubRawg(GAMES)
+        self.requester: Requester = createRequester(pageSize=40)
+        self.patcher = patch("internals.requester.get", self.rawg)
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        """
+        Stops answering from the stub API.
+        """
+        self.patcher.stop()
+
+    def direct(
+            self,
+            page: int,
+            pageSize: int
+    ) -> Dict:
+        """
+        Gets a page as RAWG answers it, without alignment.
+
+        Args:
+            page (int): The page number.
+            pageSize (int): The page size.
+
+        Returns:
+            Dict: The page.
+        """
+        return self.rawg.list(f"{BASE}games", {"page": page, "page_size": pageSize})
+
+    def test_matches_direct_pages(self) -> None:
+        """
+        Every page of every size below the alignment has the same games, count and links as RAWG's, including windows
+        that cross aligned pages, the last partial page and the first page past the end.
+        """
+        for pageSize in range(1, 40):
+            for page in range(1, -(-GAMES // pageSize) + 2):
+                with self.subTest(pageSize=pageSize, page=page):
+                    expected: Dict = self.direct(page, pageSize)
+                    data: Dict = self.requester.getPage("games", {"page": page, "page_size": pageSize})
+
+                    if "results" not in expected:
+                        self.assertEqual(data, {"detail": "Invalid page."})
+                        continue
+
+                    self.assertEqual([game["id"] for game in data["results"]], [game["id"] for game in expected["results"]])
+                    self.assertEqual(data["count"], expected["count"])
+                    self.assertEqual(data["next"] is None, expected["next"] is None)
+                    self.assertEqual(data["previous"] is None, expected["previous"] is None)
+
+        # Every page was sliced out of the three aligned pages, plus the one past the end they reach into
+        self.assertEqual(
+            sorted({(params["page"], params["page_size"]) for params in self.rawg.listCalls()}),
+            [(1, 40), (2, 40), (3, 40), (4, 40)]
+        )
+
+    def test_links_point_at_the_page_size_asked_for(self) -> None:
+        """
+        The next and previous links keep the page size asked for, not the aligned one.
+        """
+        data: Dict = self.requester.getPage("games", {"page": 3, "page_size": 15})
+
+        self.assertIn("page=4", data["next"])
+        self.assertIn("page=2", data["previous"])
+        self.assertIn("page_size=15", data["next"])
+
+    def test_unreadable_pages_left_to_rawg(self) -> None:
+        """
+        Page numbers and sizes that are not positive numbers are sent to RAWG as they are.
+        """
+        for params in ({"page": "x", "page_size": 10}, {"page": 1, "page_size": -5}, {"page": -1, "page_size": 10}):
+            with self.subTest(params=params):
+                self.requester.getPage("games", dict(params))
+                self.assertEqual(self.rawg.listCalls()[-1], params)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Tests prefetchPages: the pages it yields, where it stops, and what it leaves running when the caller stops early.
+"""
+
+# Standard Library Imports
+from contextvars import ContextVar
+from threading import Event, Thread, enumerate as enumerateThreads
+from typing import Dict, Iterator, List
+from unittest import TestCase, main
+
+# Local Imports
+from internals.helpers import prefetchPages
+
+# Constants
+caller: ContextVar[str] = ContextVar("caller", default="")
+
+
+class PrefetchTests(TestCase):
+    """
+    Walks pages from a fetch function that records the pages it was asked for.
+    """
+
+    def setUp(self) -> None:
+        """
+        Forgets the pages fetched by other tests.
+        """
+        self.fetched: List[int] = []
+
+    def fetch(
+            self,
+            page: int
+    ) -> Dict:
+        """
+        Gets a page of a list with five pages.
+
+        Args:
+            page (int): The page number.
+
+        Returns:
+            Dict: The page, with its number, whether it is the last and the caller's context.
+        """
+        self.fetched.append(page)
+        return {"page": page, "last": page >= 5, "caller": caller.get()}
+
+    def walk(
+            self,
+            page: int = 1,
+            limit: int | None = None
+    ) -> Iterator[Dict]:
+        """
+        Walks the list.
+
+        Args:
+            page (int): The first page number.
+            limit (int | None): The most pages to fetch, if any.
+
+        Returns:
+            Iterator[Dict]: The pages.
+        """
+        return prefetchPages(self.fetch, lambda data: data["last"], page, limit)
+
+    def test_pages_in_order(self) -> None:
+        """
+        Pages are yielded in order from the first page asked for, in the caller's context.
+        """
+        caller.set("walker")
+
+        self.assertEqual([data["page"] for data in self.walk(2)], [2, 3, 4, 5])
+        self.assertEqual({data["caller"] for data in self.walk()}, {"walker"})
+
+    def test_stops_at_last_page(self) -> None:
+        """
+        Nothing is fetched past the page isLast picks out.
+        """
+        self.assertEqual(len(list(self.walk())), 5)
+        self.assertEqual(self.fetched, [1, 2, 3, 4, 5])
+
+    def test_stops_at_limit(self) -> None:
+        """
+        At most limit pages are fetched, wherever the walk starts.
+        """
+        self.assertEqual([data["page"] for data in self.walk(2, limit=2)], [2, 3])
+        self.assertEqual(self.fetched, [2, 3])
+
+    def test_closed_early(self) -> None:
+        """
+        A walk closed early fetches nothing past the page it was prefetching, which is cancelled if it had not started,
+        and its thread exits.
+        """
+        before: set[Thread] = set(enumerateThreads())
+        pages: Iterator[Dict] = self.walk()
+
+        self.assertEqual(next(pages)["page"], 1)
+        threads: List[Thread] = [thread for thread in enumerateThreads() if thread not in before]
+        pages.close()
+
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertIn(self.fetched, ([1], [1, 2]))
+
+    def test_closed_while_fetching(self) -> None:
+        """
+        A page still being fetched when the walk is closed is left to finish, without another being fetched after it.
+        """
+        started: Event = Event()
+        release: Event = Event()
+
+        def slowFetch(
+                page: int
+        ) -> Dict:
+            """
+            Gets a page, holding the second until it is released.
+
+            Args:
+                page (int): The page number.
+
+            Returns:
+                Dict: The page.
+            """
+            if page == 2:
+                started.set()
+                release.wait(5)
+
+            return self.fetch(page)
+
+        pages: Iterator[Dict] = prefetchPages(slowFetch, lambda data: data["last"])
+        next(pages)
+        started.wait(5)
+        pages.close()
+        release.set()
+
+        # The walk's thread is not joined on close, so wait for it to finish the page it was fetching
+        for thread in enumerateThreads():
+            if thread.name.startswith("Prefetch"):
+                thread.join(5)
+
+        self.assertEqual(self.fetched, [1, 2])
+
+
+if __name__ == "__main__":
+    main()
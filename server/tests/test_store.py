@@ -0,0 +1,81 @@
+"""
+Tests the CatalogStore: games changing slugs, and list queries with parameters the mirror can't read.
+"""
+
+# Standard Library Imports
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+from unittest import TestCase, main
+
+# Local Imports
+from internals.catalog.store import CatalogStore
+from tests.fixtures import closeStore, createStore
+
+
+class CatalogStoreTests(TestCase):
+    """
+    Writes games to a mirror in a temporary directory.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates an empty, complete mirror for each test.
+        """
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.store: CatalogStore = createStore(self.directory.name)
+
+    def tearDown(self) -> None:
+        """
+        Closes and removes the mirror.
+        """
+        closeStore(self.store)
+        self.directory.cleanup()
+
+    def games(self) -> Dict[int, str | None]:
+        """
+        Gets the slug of every game in the mirror.
+
+        Returns:
+            Dict[int, str | None]: The slugs, by id.
+        """
+        return {row["id"]: row["slug"] for row in self.store.connection.execute("SELECT id, slug FROM games")}
+
+    def test_slug_taken_by_another_game(self) -> None:
+        """
+        A slug RAWG has given to another game moves to it, and the rest of the page is still written.
+        """
+        self.store.upsertGames([{"id": 1, "slug": "portal", "name": "Portal"}])
+        self.store.upsertGames([{"id": 3, "slug": "other", "name": "Other"}, {"id": 2, "slug": "portal", "name": "Portal"}])
+
+        self.assertEqual(self.games(), {1: None, 2: "portal", 3: "other"})
+
+        # The game that lost it gets a slug again when it is next synced
+        self.store.upsertGames([{"id": 1, "slug": "portal-2007", "name": "Portal"}], detailed=True)
+        self.assertEqual(self.games()[1], "portal-2007")
+
+    def test_unreadable_parameters_go_to_rawg(self) -> None:
+        """
+        Parameters that are not numbers, or are out of range, are left for RAWG rather than raising.
+        """
+        self.store.upsertGames([{"id": id, "slug": f"game-{id}", "name": f"Game {id}", "metacritic": 80} for id in range(1, 6)])
+
+        for parameters in (
+            {"metacritic": "abc"},
+            {"metacritic": "80,"},
+            {"platforms_count": "x"},
+            {"page": "x"},
+            {"page": "0"},
+            {"page_size": "-5"},
+            {"page_size": "²"}
+        ):
+            with self.subTest(parameters=parameters):
+                self.assertFalse(self.store.covers(parameters))
+                self.assertIsNone(self.store.query(parameters))
+
+        data: Dict = self.store.query({"metacritic": "70,90", "page": "2", "page_size": "2"})
+        results: List[int] = [game["id"] for game in data["results"]]
+        self.assertEqual((data["count"], len(results)), (5, 2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Tests the PrefixIndex used for search-as-you-type suggestions.
+"""
+
+# Standard Library Imports
+from time import sleep
+from unittest import TestCase, main
+
+# Local Imports
+from internals.catalog.suggest import PrefixIndex
+from tests.fixtures import MemoryStore, buildIndex
+
+
+class PrefixIndexTests(TestCase):
+    """
+    Suggests games from a small catalog.
+    """
+
+    def setUp(self) -> None:
+        """
+        Builds a fresh index for each test, as some change the catalog.
+        """
+        self.store: MemoryStore = MemoryStore()
+        self.store.addGames(
+            [
+                {"id": 3328, "slug": "the-witcher-3-wild-hunt", "name": "The Witcher 3: Wild Hunt", "added": 20000},
+                {"id": 11859, "slug": "the-witcher", "name": "The Witcher", "added": 8000},
+                {"id": 4200, "slug": "portal-2", "name": "Portal 2", "added": 18000},
+                {"id": 4286, "slug": "portal", "name": "Portal", "added": 15000},
+                {"id": 1, "slug": "wild-arms", "name": "Wild Arms", "added": 300}
+            ]
+        )
+        self.index: PrefixIndex = buildIndex(PrefixIndex, self.store)
+
+    def suggestedIds(
+            self,
+            prefix: str
+    ) -> list[int]:
+        """
+        Gets the ids suggested for a prefix.
+
+        Args:
+            prefix (str): What has been typed.
+
+        Returns:
+            list[int]: The ids, best first.
+        """
+        return [suggestion["id"] for suggestion in self.index.suggest(prefix)]
+
+    def test_most_popular_first(self) -> None:
+        """
+        Games matching a prefix come most popular first.
+        """
+        self.assertEqual(self.suggestedIds("por"), [4200, 4286])
+        self.assertEqual(self.suggestedIds("p"), [4200, 4286])
+
+    def test_later_words(self) -> None:
+        """
+        Games are suggested from the start of a later word of their name.
+        """
+        self.assertEqual(self.suggestedIds("wild"), [3328, 1])
+
+    def test_slug_and_case(self) -> None:
+        """
+        Slugs match, and prefixes are normalized like names.
+        """
+        self.assertEqual(self.suggestedIds("THE-WITCHER"), [3328, 11859])
+
+    def test_changed_game(self) -> None:
+        """
+        A game renamed after the index was built is suggested by its new name only, once the index is updated.
+        """
+        sleep(0.01)
+        self.store.addGames([{"id": 4286, "slug": "aperture", "name": "Aperture", "added": 15000}])
+        self.index.state = self.index.build(self.index.state)
+
+        self.assertEqual(self.suggestedIds("por"), [4200])
+        self.assertEqual(self.suggestedIds("aper"), [4286])
+
+
+if __name__ == "__main__":
+    main()
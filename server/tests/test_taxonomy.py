@@ -0,0 +1,132 @@
+"""
+Tests that workers share the taxonomy sets one of them loads, rather than each loading them from RAWG.
+"""
+
+# Standard Library Imports
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterator, List
+from unittest import TestCase, main
+
+# Local Imports
+from internals.config import Config
+from internals.wrapper.taxonomy import Taxonomy
+
+
+class StubRequester:
+    """
+    Answers list walks with two pages of items, or an error, and counts them.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes the StubRequester.
+        """
+        self.walks: List[str] = []
+        self.failing: bool = False
+
+    def pages(
+            self,
+            url: str,
+            **kwargs
+    ) -> Iterator[Dict]:
+        """
+        Walks a list.
+
+        Args:
+            url (str): The list.
+            **kwargs: The walk options, ignored.
+
+        Returns:
+            Iterator[Dict]: The pages.
+        """
+        self.walks.append(url)
+
+        if self.failing:
+            yield {"detail": "Service unavailable"}
+            return
+
+        yield {"next": "page=2", "results": [{"id": 1, "slug": "action", "name": "Action"}]}
+        yield {"next": None, "results": [{"id": 2, "slug": "puzzle", "name": "Puzzle"}]}
+
+
+class SharedTaxonomyTests(TestCase):
+    """
+    Runs several Taxonomy instances, standing in for workers, against one shared directory.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates the shared directory and a configuration that loads only the genres.
+        """
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.config: Config = Config()
+        self.config.taxonomy.path = self.directory.name
+        self.config.taxonomy.sets = ["genres"]
+        self.requester: StubRequester = StubRequester()
+
+    def tearDown(self) -> None:
+        """
+        Removes the shared directory.
+        """
+        self.directory.cleanup()
+
+    def createWorker(self) -> Taxonomy:
+        """
+        Creates a Taxonomy as a worker would, without starting its thread.
+
+        Returns:
+            Taxonomy: The taxonomy.
+        """
+        return Taxonomy(self.config, self.requester)
+
+    def test_loaded_once_for_every_worker(self) -> None:
+        """
+        The first worker loads the set from RAWG and the others read its copy.
+        """
+        workers: List[Taxonomy] = [self.createWorker() for _ in range(4)]
+
+        self.assertEqual([worker.refresh() for worker in workers], [True] * 4)
+        self.assertEqual(self.requester.walks, ["genres"])
+
+        for worker in workers:
+            self.assertEqual(worker.resolve("genres", "puzzle"), 2)
+
+    def test_failed_load_retried_by_one_worker(self) -> None:
+        """
+        A failed load is not retried by the other workers within the retry interval, and is retried once it passes.
+        """
+        self.requester.failing = True
+        workers: List[Taxonomy] = [self.createWorker() for _ in range(3)]
+
+        self.assertEqual([worker.refresh() for worker in workers], [False] * 3)
+        self.assertEqual(len(self.requester.walks), 1)
+
+        self.requester.failing = False
+        self.config.taxonomy.retryInterval = 0
+
+        self.assertTrue(workers[1].refresh())
+        self.assertTrue(workers[0].refresh())
+        self.assertEqual(len(self.requester.walks), 2)
+
+    def test_details_kept_across_reads(self) -> None:
+        """
+        Descriptions a worker fetched are kept when it reads a newer copy of the set.
+        """
+        first: Taxonomy = self.createWorker()
+        second: Taxonomy = self.createWorker()
+        first.refresh()
+        second.refresh()
+        second.remember("genres", {"id": 2, "description": "Think first"})
+
+        # Another worker reloads the set once it is due
+        self.config.taxonomy.refreshInterval = 0
+        first.refresh()
+        self.config.taxonomy.refreshInterval = 24
+        second.refresh()
+
+        self.assertEqual(len(self.requester.walks), 2)
+        self.assertEqual(second.details("genres", "puzzle")["description"], "Think first")
+
+
+if __name__ == "__main__":
+    main()